@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Action plugin for the modules of the collection.
+
+The ``meta/runtime.yml`` file redirects the action of each module to that
+plugin.
+
+When you set the ``quay_direct_execution`` variable to ``true``, and the
+task runs on the control node (``local`` connection, for example with
+``delegate_to: localhost``), the plugin imports the module and runs its
+``main()`` function in the worker process. The plugin does not build the
+AnsiballZ payload, does not write it in a temporary directory, and does not
+start a new Python interpreter. The module receives the same arguments and
+the same environment variables (``environment`` keyword), and the plugin
+returns the same result, as with the standard execution.
+
+The direct execution relies on private Ansible internals: the
+``_ANSIBLE_ARGS`` and ``_ANSIBLE_PROFILE`` attributes of
+``ansible.module_utils.basic``, and the module encoder of Ansible 2.19 and
+later. It is therefore disabled by default. When these internals are
+missing, for other connections, with privilege escalation, or for
+asynchronous tasks, the plugin uses the standard execution.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib
+import io
+import json
+import os
+import sys
+import traceback
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action.normal import ActionModule as NormalActionModule
+from ansible.utils.display import Display
+from ansible.vars.clean import remove_internal_keys
+
+display = Display()
+
+# Connection plugins that run the commands on the control node
+LOCAL_CONNECTIONS = ("local", "ansible.builtin.local", "ansible.legacy.local")
+
+
+def direct_execution_supported():
+    """Return whether Ansible provides the internals that the direct execution uses.
+
+    :return: ``True`` if the plugin can pass the arguments to the module and
+             parse its result in the worker process.
+    :rtype: bool
+    """
+    if not hasattr(basic, "_ANSIBLE_ARGS"):
+        return False
+    # Since Ansible 2.19, the parameters and the result are serialized with a
+    # profile.
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        try:
+            from ansible.module_utils.common.json import (  # noqa: F401
+                Direction,
+                get_module_encoder,
+            )
+        except ImportError:
+            return False
+        if not hasattr(Direction, "CONTROLLER_TO_MODULE"):
+            return False
+    return True
+
+
+class ActionModule(NormalActionModule):
+    """Run the modules of the collection in the worker process when possible."""
+
+    def use_direct_execution(self, task_vars):
+        """Return whether the plugin can run the module in the worker process.
+
+        :param task_vars: The task variables.
+        :type task_vars: dict
+
+        :return: ``True`` if the module can run in the worker process.
+        :rtype: bool
+        """
+        enabled = task_vars.get("quay_direct_execution", False)
+        if not boolean(self._templar.template(enabled), strict=False):
+            return False
+        if not direct_execution_supported():
+            display.vvv(
+                "The Ansible version does not support the direct execution",
+                host=self._play_context.remote_addr,
+            )
+            return False
+        if self._task.async_val or self._play_context.become:
+            return False
+        name = getattr(self._connection, "_load_name", None) or self._connection.transport
+        return name in LOCAL_CONNECTIONS
+
+    @staticmethod
+    def set_environment(environment):
+        """Set the given variables in the environment of the worker process.
+
+        :param environment: The variables to set.
+        :type environment: dict
+
+        :return: The previous values of the variables, to pass to
+                 :py:meth:``restore_environment``. ``None`` means that the
+                 variable was not set.
+        :rtype: dict
+        """
+        saved = {}
+        for name, value in environment.items():
+            name = to_text(name)
+            saved[name] = os.environ.get(name)
+            os.environ[name] = to_text(value)
+        return saved
+
+    @staticmethod
+    def restore_environment(saved):
+        """Restore the environment of the worker process.
+
+        :param saved: The previous values that :py:meth:``set_environment``
+                      returned.
+        :type saved: dict
+        """
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    def execute_module_directly(self, task_vars):
+        """Run the module in the worker process and return its result.
+
+        :param task_vars: The task variables.
+        :type task_vars: dict
+
+        :return: The module result.
+        :rtype: dict
+        """
+        module_name = self._task.action
+        context = self._shared_loader_obj.module_loader.find_plugin_with_context(
+            module_name, collection_list=self._task.collections
+        )
+        short_name = context.resolved_fqcn.rsplit(".", 1)[-1]
+        module_args = self._task.args.copy()
+        self._update_module_args(module_name, module_args, task_vars)
+
+        try:
+            module = importlib.import_module(
+                "..modules.{name}".format(name=short_name), __package__
+            )
+        except ImportError as e:
+            return {
+                "failed": True,
+                "msg": "Cannot import the module: {error}".format(error=e),
+            }
+
+        # Since Ansible 2.19, the parameters and the result are serialized
+        # with a profile.
+        profile = None
+        if hasattr(basic, "_ANSIBLE_PROFILE"):
+            profile = "legacy"
+            from ansible.module_utils.common.json import Direction, get_module_encoder
+
+            encoder = get_module_encoder(profile, Direction.CONTROLLER_TO_MODULE)
+            args = json.dumps({"ANSIBLE_MODULE_ARGS": module_args}, cls=encoder)
+        else:
+            args = json.dumps({"ANSIBLE_MODULE_ARGS": module_args})
+
+        # Environment variables from the environment keyword of the task, the
+        # block, or the play. The module reads some of them, such as QUAY_HOST
+        # or HTTPS_PROXY.
+        environment = {}
+        self._compute_environment_string(raw_environment_out=environment)
+
+        saved_args = basic._ANSIBLE_ARGS
+        saved_stdout = sys.stdout
+        saved_environ = self.set_environment(environment)
+        basic._ANSIBLE_ARGS = to_bytes(args)
+        if profile:
+            saved_profile = basic._ANSIBLE_PROFILE
+            basic._ANSIBLE_PROFILE = profile
+        sys.stdout = io.StringIO()
+        rc = 0
+        try:
+            module.main()
+        except SystemExit as e:
+            rc = e.code or 0
+        except Exception as e:
+            return {
+                "failed": True,
+                "msg": "The module failed: {error}".format(error=to_text(e)),
+                "exception": traceback.format_exc(),
+            }
+        finally:
+            output = sys.stdout.getvalue()
+            sys.stdout = saved_stdout
+            basic._ANSIBLE_ARGS = saved_args
+            self.restore_environment(saved_environ)
+            if profile:
+                basic._ANSIBLE_PROFILE = saved_profile
+
+        res = {"rc": rc, "stdout": output, "stderr": ""}
+        if profile:
+            data = self._parse_returned_data(res, profile)
+        else:
+            data = self._parse_returned_data(res)
+        remove_internal_keys(data)
+        return data
+
+    def run(self, tmp=None, task_vars=None):
+        """Run the module."""
+        if task_vars is None:
+            task_vars = {}
+        if not self.use_direct_execution(task_vars):
+            return super(ActionModule, self).run(tmp, task_vars)
+
+        display.vvv(
+            "Running the module in the worker process", host=self._play_context.remote_addr
+        )
+        # Skip the NormalActionModule.run() method, which runs the module
+        result = super(NormalActionModule, self).run(tmp, task_vars)
+        del tmp  # tmp no longer has any effect
+        result.update(self.execute_module_directly(task_vars))
+        return result
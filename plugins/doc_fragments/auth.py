@@ -66,3 +66,53 @@ options:
       - Mutually exclusive with O(quay_token).
     type: str
 """
+
+    PLUGIN = r"""
+options:
+  quay_host:
+    description:
+      - URL for accessing the API. U(https://quay.example.com:8443) for example.
+    type: str
+    default: http://127.0.0.1
+    env:
+      - name: QUAY_HOST
+  quay_token:
+    description:
+      - OAuth access token for authenticating against the API.
+      - Mutually exclusive with O(quay_username) and O(quay_password).
+    type: str
+    env:
+      - name: QUAY_TOKEN
+  quay_username:
+    description:
+      - The username to use for authenticating against the API.
+      - If you set O(quay_username), then you also need to set O(quay_password).
+      - Mutually exclusive with O(quay_token).
+    type: str
+    env:
+      - name: QUAY_USERNAME
+  quay_password:
+    description:
+      - The password to use for authenticating against the API.
+      - If you set O(quay_password), then you also need to set O(quay_username).
+      - Mutually exclusive with O(quay_token).
+    type: str
+    env:
+      - name: QUAY_PASSWORD
+  validate_certs:
+    description:
+      - Whether to allow insecure connections to the API.
+      - If V(false), then the plugin does not validate SSL certificates.
+    type: bool
+    default: true
+    aliases: [verify_ssl]
+    env:
+      - name: QUAY_VERIFY_SSL
+  timeout:
+    description:
+      - Number of seconds to wait for Quay to send data before giving up.
+    type: float
+    default: 10.0
+    env:
+      - name: QUAY_TIMEOUT
+"""
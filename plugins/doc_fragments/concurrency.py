@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Ansible Galaxy documentation fragment
+    DOCUMENTATION = r"""
+options:
+  concurrency:
+    description:
+      - Maximum number of API requests that the module sends in parallel.
+      - All the requests share the same authenticated session.
+      - Set the parameter to V(1) to send the requests one after the other.
+      - Lower the value if your Quay installation limits the request rate.
+    type: int
+    default: 8
+"""
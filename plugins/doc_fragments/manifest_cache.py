@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Ansible Galaxy documentation fragment
+    DOCUMENTATION = r"""
+options:
+  cache_dir:
+    description:
+      - Path to a directory on the managed node where the module stores the
+        data that it retrieves about the image manifests, so that the next
+        runs do not request that data again.
+      - The module creates the directory if it does not exist. Several
+        modules and several runs can share the same directory. The module
+        keeps the data of each Quay installation (O(quay_host)) in a separate
+        subdirectory.
+      - The module writes to the directory even in check mode.
+      - If you do not set the parameter, then the module does not use a
+        cache.
+    type: path
+    version_added: '2.9.0'
+"""
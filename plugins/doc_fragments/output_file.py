@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    # Ansible Galaxy documentation fragment
+    DOCUMENTATION = r"""
+options:
+  output_file:
+    description:
+      - Path to a file on the managed node where the module writes the
+        collected data in the JSON Lines format (one JSON object per line)
+        instead of returning the data.
+      - Use that parameter for large data sets. The module writes the records
+        as it retrieves them and does not keep them in memory.
+      - The module writes the data to a temporary file in the same directory
+        and then renames the file, so that readers never see a partial file.
+      - The module writes the file even in check mode.
+    type: path
+  compress:
+    description:
+      - Whether to compress the O(output_file) file with gzip.
+    type: bool
+    default: false
+"""
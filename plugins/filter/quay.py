@@ -8,10 +8,13 @@ from __future__ import annotations
 import base64
 import json
 
+from ansible.errors import AnsibleFilterError
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.module_utils.six.moves.urllib.parse import urlparse
 from ansible.parsing.ajson import AnsibleJSONEncoder
 
+from ..module_utils.quay_image import parse_image_name
+
 
 def quay_docker_config(
     name, token, url="http://127.0.0.1", email="", encoding="utf-8", *args, **kw
@@ -58,8 +61,59 @@ def quay_docker_config(
     )
 
 
+def quay_image_parse(images, namespace=None):
+    """Split image names into their components.
+
+    :param images: An image name or a list of image names, such as
+                   ``production/smallimage:v1.0.0`` or
+                   ``production/smallimage@sha256:4f6f...e797``.
+    :type images: str or list
+    :param namespace: The namespace for the image names that do not include
+                      a namespace part.
+    :type namespace: str
+
+    :raises AnsibleFilterError: An image name is invalid.
+
+    :return: A dictionary for each image name, or a single dictionary if
+             ``images`` is a string.
+    :rtype: list or dict
+    """
+    single = isinstance(images, str)
+    result = []
+    for image in [images] if single else images:
+        if not isinstance(image, str):
+            raise AnsibleFilterError(
+                "quay_image_parse expects image names (strings), got {image!r}".format(
+                    image=image
+                )
+            )
+        name, repository, tag, digest = parse_image_name(image.strip().strip("/"))
+        if not repository or not (tag or digest):
+            raise AnsibleFilterError("Invalid image name: {image}".format(image=image))
+        name = name or namespace
+        full_name = (
+            "{name}/{repository}".format(name=name, repository=repository)
+            if name
+            else repository
+        )
+        result.append(
+            {
+                "namespace": name,
+                "repository": repository,
+                "tag": tag,
+                "digest": digest,
+                "full_name": full_name,
+                "image": (full_name + "@" + digest if digest else full_name + ":" + tag),
+            }
+        )
+    return result[0] if single else result
+
+
 class FilterModule(object):
     """Quay jinja2 filter"""
 
     def filters(self):
-        return {"quay_docker_config": quay_docker_config}
+        return {
+            "quay_docker_config": quay_docker_config,
+            "quay_image_parse": quay_image_parse,
+        }
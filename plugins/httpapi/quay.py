@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: quay
+short_description: HttpApi plugin for Quay Container Registry
+description:
+  - Provide a persistent, authenticated session to the Quay API for the
+    modules of the collection.
+  - With the C(ansible.netcommon.httpapi) connection plugin, the modules do
+    not authenticate and log out for each task. The connection daemon
+    authenticates once, keeps the TCP and TLS connections open, and the
+    modules send their requests through that connection.
+  - The modules ignore their authentication and connection parameters, such
+    as C(quay_host) and C(quay_token), when they run through the
+    connection.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  token:
+    description:
+      - OAuth access token for authenticating against the API.
+      - If you do not set the token, then the plugin authenticates with the
+        C(ansible_user) and C(ansible_password) variables.
+    type: str
+    env:
+      - name: QUAY_TOKEN
+    vars:
+      - name: ansible_httpapi_quay_token
+notes:
+  - The plugin requires the C(ansible.netcommon) collection.
+  - Set the C(ansible_connection) variable to C(ansible.netcommon.httpapi),
+    and the C(ansible_network_os) variable to
+    C(infra.quay_configuration.quay).
+  - Use the C(ansible_httpapi_use_ssl), C(ansible_httpapi_port), and
+    C(ansible_httpapi_validate_certs) variables to configure the connection
+    to the Quay host (C(ansible_host)).
+  - The M(infra.quay_configuration.quay_api_token) and
+    M(infra.quay_configuration.quay_first_user) modules do not support the
+    persistent connection.
+"""
+
+EXAMPLES = r"""
+# Inventory
+# [quay]
+# quay.example.com
+#
+# [quay:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=infra.quay_configuration.quay
+# ansible_httpapi_use_ssl=true
+# ansible_httpapi_quay_token=vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Configure Quay through one persistent session
+  hosts: quay
+  gather_facts: false
+  tasks:
+    - name: Ensure the organization exists
+      infra.quay_configuration.quay_organization:
+        name: production
+        email: prodlist@example.com
+
+    - name: Ensure the robot account exists
+      infra.quay_configuration.quay_robot:
+        name: production+robotprod
+"""
+
+import json
+import re
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.module_utils.connection import ConnectionError
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.plugins.httpapi import HttpApiBase
+
+BASE_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+class HttpApi(HttpApiBase):
+    """HttpApi plugin for Quay Container Registry."""
+
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self.session_login = False
+        self.relogin_done = False
+
+    def login(self, username, password):
+        """Authenticate with a token, or with a username and a password.
+
+        For token authentication, the plugin adds the token to the headers of
+        the requests. Otherwise, the plugin retrieves a CSRF token, signs in,
+        and keeps the session cookie and the next CSRF token.
+        """
+        token = self.get_option("token")
+        if token:
+            self.connection._auth = {"Authorization": "Bearer {token}".format(token=token)}
+            return
+        if not username or not password:
+            # Anonymous access
+            return
+
+        response, data = self.connection.send(
+            "/csrf_token", None, method="GET", headers={"Accept": "*/*"}
+        )
+        try:
+            csrf = json.loads(to_text(data.getvalue()))["csrf_token"]
+        except (ValueError, KeyError):
+            response, data = self.connection.send(
+                "/", None, method="GET", headers={"Accept": "*/*"}
+            )
+            match = re.search(r"window.__token\s*=\s*'(.*?)';", to_text(data.getvalue()))
+            if not match:
+                raise ConnectionError("Cannot retrieve the CSRF token from the returned data")
+            csrf = match.group(1)
+
+        headers = dict(BASE_HEADERS)
+        headers["X-CSRF-Token"] = csrf
+        headers.update(self.cookie_header(response))
+        response, data = self.connection.send(
+            "/api/v1/signin",
+            json.dumps({"username": username, "password": password}),
+            method="POST",
+            headers=headers,
+        )
+        if response.getcode() != 200:
+            raise ConnectionError(
+                "Unable to sign in: {code}: {body}".format(
+                    code=response.getcode(), body=to_text(data.getvalue())
+                )
+            )
+        auth = self.update_auth(response, data)
+        if not auth or "X-CSRF-Token" not in auth:
+            raise ConnectionError("Cannot retrieve the authentication token")
+        self.connection._auth = auth
+        self.session_login = True
+
+    def logout(self):
+        """Sign out when the plugin has signed in with a username."""
+        if self.session_login:
+            try:
+                self.connection.send(
+                    "/api/v1/signout", None, method="POST", headers=BASE_HEADERS
+                )
+            except (ConnectionError, HTTPError):
+                pass
+            self.session_login = False
+        self.connection._auth = None
+
+    @staticmethod
+    def cookie_header(response):
+        """Return the ``Cookie`` header from the ``Set-Cookie`` response header.
+
+        :param response: The response.
+
+        :return: A dictionary with the ``Cookie`` header, or an empty
+                 dictionary.
+        :rtype: dict
+        """
+        cookies = response.info().get_all("Set-Cookie") or []
+        values = [c.split(";", 1)[0] for c in cookies]
+        return {"Cookie": "; ".join(values)} if values else {}
+
+    def update_auth(self, response, response_text):
+        """Return the authentication headers for the next requests.
+
+        Quay returns a new CSRF token and can update the session cookie in its
+        responses. The method keeps the other headers, such as the
+        ``Authorization`` header for token authentication.
+        """
+        auth = dict(self.connection._auth or {})
+        auth.update(self.cookie_header(response))
+        headers = dict((k.lower(), v) for k, v in response.info().items())
+        if headers.get("x-next-csrf-token"):
+            auth["X-CSRF-Token"] = headers["x-next-csrf-token"]
+        return auth or None
+
+    def handle_httperror(self, exc):
+        """Return the HTTP errors to the modules, which process them.
+
+        For username and password authentication, the plugin signs in again,
+        only once, when the session expires (401 error).
+        """
+        if exc.code == 401 and self.session_login and not self.relogin_done:
+            self.relogin_done = True
+            self.connection._auth = None
+            self.login(
+                self.connection.get_option("remote_user"),
+                self.connection.get_option("password"),
+            )
+            return True
+        return exc
+
+    def send_request(self, data, path, method="GET", headers=None):
+        """Send a request to the API and return the response.
+
+        The modules call that method through the persistent connection.
+
+        :param data: The data to send.
+        :type data: str
+        :param path: The path of the request, with the query string.
+        :type path: str
+        :param method: GET, PUT, POST, or DELETE.
+        :type method: str
+        :param headers: The headers of the request.
+        :type headers: dict
+
+        :return: A dictionary with the ``status_code``, ``reason``, ``body``,
+                 and ``headers`` keys.
+        :rtype: dict
+        """
+        response, response_data = self.connection.send(
+            path, data, method=method, headers=headers or BASE_HEADERS
+        )
+        self.relogin_done = False
+        return {
+            "status_code": response.getcode(),
+            "reason": getattr(response, "reason", "") or getattr(response, "msg", ""),
+            "body": to_text(response_data.getvalue()),
+            "headers": dict(response.info().items()),
+        }
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: quay
+short_description: Quay Container Registry repositories inventory source
+description:
+  - Build an inventory from the organizations and the repositories of a Quay
+    Container Registry installation.
+  - Each repository is a host, named C(organization/repository). Each
+    organization is a group that includes its repositories. All the
+    repositories are members of the C(quay_repositories) group.
+  - The plugin lists the repositories of the organizations in parallel,
+    following the pagination of the API.
+  - The plugin sets the C(ansible_connection) variable of the hosts to
+    C(local), so that the tasks that you run against the repositories run on
+    the control node.
+  - Enable the inventory cache to serve the repeated inventory requests from
+    the cache, until the cache expires, instead of querying Quay.
+  - The inventory configuration file must end with C(quay.yml) or
+    C(quay.yaml).
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  plugin:
+    description:
+      - Token that ensures this is a source file for the plugin.
+    required: true
+    type: str
+    choices: [infra.quay_configuration.quay]
+  organizations:
+    description:
+      - Organizations to include in the inventory.
+      - By default, the plugin includes all the organizations that the user
+        who owns the token, or the O(quay_username) user, is a member of.
+    type: list
+    elements: str
+  all_organizations:
+    description:
+      - Include all the organizations of the Quay installation instead of the
+        organizations that the user is a member of.
+      - Requires superuser permissions.
+      - Ignored when you set the O(organizations) parameter.
+    type: bool
+    default: false
+  include_robots:
+    description:
+      - Whether to retrieve the robot accounts of the organizations.
+      - The plugin stores the names of the robot accounts in the
+        C(quay_robots) variable of the organization groups.
+    type: bool
+    default: false
+  concurrency:
+    description:
+      - Maximum number of organizations that the plugin processes in
+        parallel.
+      - All the requests share the same authenticated session.
+    type: int
+    default: 8
+  group_prefix:
+    description:
+      - Prefix for the name of the organization groups.
+      - The plugin replaces the characters that are not valid in group names
+        by underscores.
+    type: str
+    default: quay_org_
+notes:
+  - The token must have the C(org:admin) scope to list the robot accounts.
+extends_documentation_fragment:
+  - infra.quay_configuration.auth.plugin
+  - ansible.builtin.constructed
+  - ansible.builtin.inventory_cache
+"""
+
+EXAMPLES = r"""
+# File: inventory.quay.yml
+# Include all the repositories of the organizations that the token owner is a
+# member of.
+plugin: infra.quay_configuration.quay
+quay_host: https://quay.example.com
+quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+# File: production.quay.yml
+# Include the repositories of two organizations, with the robot accounts, and
+# cache the result for one hour.
+plugin: infra.quay_configuration.quay
+quay_host: https://quay.example.com
+organizations:
+  - production
+  - development
+include_robots: true
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/quay_inventory
+cache_timeout: 3600
+# Group the public repositories
+groups:
+  public_repositories: quay_is_public
+keyed_groups:
+  - key: quay_state
+    prefix: state
+"""
+
+from ansible.errors import AnsibleError
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+from ..module_utils.api_module import APIModule, APIModuleError
+
+AUTH_OPTIONS = [
+    "quay_host",
+    "quay_token",
+    "quay_username",
+    "quay_password",
+    "validate_certs",
+    "timeout",
+]
+
+# Repository attributes that the plugin exposes as host variables, with the
+# ``quay_`` prefix
+REPOSITORY_ATTRIBUTES = ["namespace", "name", "description", "is_public", "kind", "state"]
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    """Quay Container Registry inventory plugin."""
+
+    NAME = "infra.quay_configuration.quay"
+
+    def verify_file(self, path):
+        """Return whether the file is an inventory source for the plugin."""
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(("quay.yml", "quay.yaml"))
+        return False
+
+    def get_organizations(self, module):
+        """Return the names of the organizations to include.
+
+        :param module: The API object.
+        :type module: :py:class:``APIModule``
+
+        :raises APIModuleError: An API error occurred.
+
+        :return: The organization names.
+        :rtype: list
+        """
+        organizations = self.get_option("organizations")
+        if organizations:
+            return organizations
+
+        if self.get_option("all_organizations"):
+            # GET /api/v1/superuser/organizations/
+            # {
+            #   "organizations": [
+            #     {
+            #       "name": "production",
+            #       "email": "production@example.com",
+            #       "avatar": {...},
+            #       "quotas": [...],
+            #       "quota_report": {...}
+            #     }
+            #   ]
+            # }
+            return [
+                org["name"]
+                for org in module.iter_pages(
+                    "superuser/organizations/", "organizations", exit_on_error=False
+                )
+            ]
+
+        user = module.get_object_path("user/", exit_on_error=False)
+        return [org["name"] for org in (user or {}).get("organizations", [])]
+
+    def get_namespace(self, module, organization):
+        """Retrieve the repositories and the robot accounts of an organization.
+
+        :param module: The API object.
+        :type module: :py:class:``APIModule``
+        :param organization: Name of the organization.
+        :type organization: str
+
+        :raises APIModuleError: An API error occurred.
+
+        :return: A dictionary with the ``repositories`` and ``robots`` lists.
+        :rtype: dict
+        """
+        repositories = [
+            dict((k, repo.get(k)) for k in REPOSITORY_ATTRIBUTES)
+            for repo in module.iter_pages(
+                "repository",
+                "repositories",
+                query_params={"namespace": organization},
+                exit_on_error=False,
+            )
+        ]
+        robots = []
+        if self.get_option("include_robots"):
+            resp = module.get_object_path(
+                "organization/{orgname}/robots",
+                query_params={"permissions": False, "token": False},
+                exit_on_error=False,
+                duplicate_underscore=False,
+                orgname=organization,
+            )
+            robots = [r["name"] for r in (resp or {}).get("robots", [])]
+        return {"name": organization, "repositories": repositories, "robots": robots}
+
+    def fetch(self):
+        """Retrieve the organizations, the repositories, and the robots.
+
+        :raises AnsibleError: An API error occurred.
+
+        :return: A list of dictionaries, one per organization.
+        :rtype: list
+        """
+        params = dict((option, self.get_option(option)) for option in AUTH_OPTIONS)
+        try:
+            module = APIModule(argument_spec={}, direct_params=params)
+            organizations = self.get_organizations(module)
+            namespaces = module.run_concurrently(
+                lambda organization: self.get_namespace(module, organization),
+                organizations,
+                self.get_option("concurrency"),
+            )
+            module.logout()
+        except APIModuleError as e:
+            raise AnsibleError("Cannot retrieve the Quay inventory: {error}".format(error=e))
+        for warning in module.warnings:
+            self.display.warning(warning)
+        return namespaces
+
+    def populate(self, namespaces):
+        """Add the groups and the hosts to the inventory.
+
+        :param namespaces: The organizations, as returned by :py:meth:``fetch``.
+        :type namespaces: list
+        """
+        strict = self.get_option("strict")
+        prefix = self.get_option("group_prefix") or ""
+        all_group = self.inventory.add_group("quay_repositories")
+
+        for namespace in namespaces:
+            group = self.inventory.add_group(
+                self._sanitize_group_name(prefix + namespace["name"])
+            )
+            self.inventory.set_variable(group, "quay_organization", namespace["name"])
+            if self.get_option("include_robots"):
+                self.inventory.set_variable(group, "quay_robots", namespace["robots"])
+
+            for repository in namespace["repositories"]:
+                host = "{namespace}/{name}".format(
+                    namespace=namespace["name"], name=repository["name"]
+                )
+                self.inventory.add_host(host, group=group)
+                self.inventory.add_child(all_group, host)
+                hostvars = dict(("quay_" + k, v) for k, v in repository.items())
+                hostvars["quay_namespace"] = namespace["name"]
+                hostvars["quay_full_name"] = host
+                hostvars["ansible_connection"] = "local"
+                for key, value in hostvars.items():
+                    self.inventory.set_variable(host, key, value)
+
+                self._set_composite_vars(
+                    self.get_option("compose"), hostvars, host, strict=strict
+                )
+                self._add_host_to_composed_groups(
+                    self.get_option("groups"), hostvars, host, strict=strict
+                )
+                self._add_host_to_keyed_groups(
+                    self.get_option("keyed_groups"), hostvars, host, strict=strict
+                )
+
+    def parse(self, inventory, loader, path, cache=True):
+        """Populate the inventory from the Quay API or from the cache."""
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        namespaces = None
+        if attempt_to_read_cache:
+            try:
+                namespaces = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if namespaces is None:
+            namespaces = self.fetch()
+
+        if cache_needs_update:
+            self._cache[cache_key] = namespaces
+
+        self.populate(namespaces)
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+name: quay
+short_description: Read data from the Quay Container Registry API
+description:
+  - Retrieve data from the Quay API on the control node, without running a
+    module task.
+  - Depending on the O(kind) parameter, the terms are API endpoints, image
+    names to resolve into manifest digests, robot account names, or
+    organization names.
+  - The plugin resolves all the terms of a call in parallel, with one
+    authenticated session. The plugin logs out at the end of the call.
+  - The plugin stores the results in an Ansible cache for O(cache_timeout)
+    seconds, so that the identical reads in the following tasks of the play
+    do not query Quay again. That cache is the only data that the lookups of
+    different tasks share.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  _terms:
+    description:
+      - Items to retrieve. The format depends on the O(kind) parameter.
+      - For V(api), API endpoints relative to C(/api/v1/), with an optional
+        query string. For example, C(organization/production/robots).
+      - For V(digest), image names in the C(namespace/repository:tag) format.
+        Without a tag, the plugin uses the C(latest) tag.
+      - For V(robot_token), robot account names in the
+        C(namespace+shortname) format.
+      - For V(teams), organization names.
+    required: true
+    type: list
+    elements: str
+  kind:
+    description:
+      - Type of the data to retrieve.
+      - V(api) returns the JSON response of the API endpoints.
+      - V(digest) returns the manifest digests of the images.
+      - V(robot_token) returns the tokens of the robot accounts.
+      - V(teams) returns the names of the teams of the organizations.
+    type: str
+    choices: [api, digest, robot_token, teams]
+    default: api
+  on_missing:
+    description:
+      - What to do when an item does not exist.
+      - V(error) fails the lookup.
+      - V(ignore) returns V(null) for that item.
+    type: str
+    choices: [error, ignore]
+    default: error
+  concurrency:
+    description:
+      - Maximum number of API requests that the plugin sends in parallel.
+    type: int
+    default: 8
+  cache_timeout:
+    description:
+      - Number of seconds during which the plugin reuses the results of the
+        previous identical reads.
+      - V(0) disables the cache.
+      - The plugin never stores secrets in the cache. With V(robot_token),
+        the plugin does not use the cache. With V(api), the plugin does not
+        store the responses that include secrets, such as the token of a
+        robot account or the client secret of an OAuth application.
+    type: int
+    default: 300
+    env:
+      - name: QUAY_LOOKUP_CACHE_TIMEOUT
+  cache_plugin:
+    description:
+      - Cache plugin to store the results.
+    type: str
+    default: ansible.builtin.jsonfile
+    env:
+      - name: QUAY_LOOKUP_CACHE_PLUGIN
+  cache_connection:
+    description:
+      - Cache connection data or path, read by the cache plugin.
+    type: str
+    default: ~/.ansible/tmp/quay_lookup
+    env:
+      - name: QUAY_LOOKUP_CACHE_CONNECTION
+notes:
+  - The lookup plugin runs on the control node. The API must be reachable
+    from the control node.
+  - Ansible runs each task in a separate process, so each lookup call opens
+    its own session. To resolve many items, pass them as several terms of a
+    single call, which share one session.
+  - Use a cache plugin that stores the data outside of the process, such as
+    C(ansible.builtin.jsonfile), to share the results between tasks.
+extends_documentation_fragment:
+  - infra.quay_configuration.auth.plugin
+"""
+
+EXAMPLES = r"""
+- name: Display the robot accounts of the production organization
+  ansible.builtin.debug:
+    msg: "{{ lookup('infra.quay_configuration.quay', 'organization/production/robots',
+      quay_host='https://quay.example.com', quay_token=token)['robots']
+      | map(attribute='name') }}"
+
+- name: Resolve the digests of several images in one call
+  ansible.builtin.set_fact:
+    digests: "{{ query('infra.quay_configuration.quay',
+      'production/frontend:1.4', 'production/backend:2.1', 'production/db',
+      kind='digest', quay_host='https://quay.example.com', quay_token=token) }}"
+
+- name: Create a Docker configuration for a robot account
+  ansible.builtin.set_fact:
+    docker_config: "{{ 'production+robot1'
+      | infra.quay_configuration.quay_docker_config(
+        lookup('infra.quay_configuration.quay', 'production+robot1',
+        kind='robot_token', quay_host='https://quay.example.com',
+        quay_token=token), 'https://quay.example.com') }}"
+
+- name: Display the teams of the production and development organizations
+  ansible.builtin.debug:
+    msg: "{{ query('infra.quay_configuration.quay', 'production', 'development',
+      kind='teams', quay_host='https://quay.example.com', quay_token=token) }}"
+"""
+
+RETURN = r"""
+_list:
+  description:
+    - One item per term, in the order of the terms.
+    - For V(api), the JSON response. For V(digest), the manifest digest. For
+      V(robot_token), the token. For V(teams), the list of the team names.
+    - V(null) for the missing items when O(on_missing=ignore).
+  type: list
+"""
+
+import hashlib
+import json
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl
+from ansible.plugins.loader import cache_loader
+from ansible.plugins.lookup import LookupBase
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.quay_image import QuayImage
+
+AUTH_OPTIONS = [
+    "quay_host",
+    "quay_token",
+    "quay_username",
+    "quay_password",
+    "validate_certs",
+    "timeout",
+]
+
+# Keys of the API responses that contain secrets
+SECRET_KEYS = ("token", "client_secret")
+
+
+class MissingItem(Exception):
+    """The requested item does not exist."""
+
+
+def has_secrets(data):
+    """Return whether an API response includes secrets.
+
+    :param data: The JSON response.
+
+    :return: ``True`` if the response includes one of the
+             :py:data:``SECRET_KEYS`` keys.
+    :rtype: bool
+    """
+    if isinstance(data, dict):
+        return any(k in SECRET_KEYS or has_secrets(v) for k, v in data.items())
+    if isinstance(data, list):
+        return any(has_secrets(v) for v in data)
+    return False
+
+
+def read_api(module, term):
+    """Return the JSON response of an API endpoint.
+
+    :param module: The API object.
+    :type module: :py:class:``APIModule``
+    :param term: The endpoint, with an optional query string.
+    :type term: str
+
+    :raises APIModuleError: An API error occurred.
+    :raises MissingItem: The endpoint returned a 404 error.
+
+    :return: The JSON response.
+    """
+    endpoint, _sep, query = term.partition("?")
+    response = module.get_object_path(
+        endpoint,
+        query_params=dict(parse_qsl(query)) if query else None,
+        exit_on_error=False,
+        duplicate_underscore=False,
+    )
+    if response is None:
+        raise MissingItem(
+            "The {endpoint} API endpoint does not exist.".format(endpoint=endpoint)
+        )
+    return response
+
+
+def read_digest(module, term):
+    """Return the manifest digest of an image.
+
+    :param module: The API object.
+    :type module: :py:class:``APIModule``
+    :param term: The image name.
+    :type term: str
+
+    :raises APIModuleError: An API error occurred.
+    :raises MissingItem: The image does not exist.
+
+    :return: The manifest digest.
+    :rtype: str
+    """
+    image = QuayImage(module, term)
+    if image.digest:
+        return image.digest
+    tags = module.get_tags(image.namespace, image.repository, image.tag, exit_on_error=False)
+    if not tags:
+        raise MissingItem("The {image} image does not exist.".format(image=term))
+    return tags[0].get("manifest_digest")
+
+
+def read_robot_token(module, term):
+    """Return the token of a robot account.
+
+    :param module: The API object.
+    :type module: :py:class:``APIModule``
+    :param term: The robot account name, in the ``namespace+shortname``
+                 format.
+    :type term: str
+
+    :raises APIModuleError: An API error occurred.
+    :raises MissingItem: The robot account does not exist.
+
+    :return: The token.
+    :rtype: str
+    """
+    try:
+        namespace, shortname = term.split("+", 1)
+    except ValueError:
+        raise APIModuleError(
+            "Wrong robot account name: {name}. Use the namespace+shortname format.".format(
+                name=term
+            )
+        )
+    if namespace == module.who_am_i(exit_on_error=False):
+        endpoint = "user/robots/{robot}"
+    else:
+        endpoint = "organization/{orgname}/robots/{robot}"
+    robot = module.get_object_path(
+        endpoint,
+        exit_on_error=False,
+        ok_error_codes=[400, 404],
+        orgname=namespace,
+        robot=shortname,
+    )
+    if not robot:
+        raise MissingItem("The {name} robot account does not exist.".format(name=term))
+    return robot.get("token")
+
+
+def read_teams(module, term):
+    """Return the team names of an organization.
+
+    :param module: The API object.
+    :type module: :py:class:``APIModule``
+    :param term: The organization name.
+    :type term: str
+
+    :raises APIModuleError: An API error occurred.
+    :raises MissingItem: The organization does not exist.
+
+    :return: The team names.
+    :rtype: list
+    """
+    org_details = module.get_organization(term, exit_on_error=False)
+    if not org_details:
+        raise MissingItem("The {name} organization does not exist.".format(name=term))
+    return sorted(org_details.get("teams", {}).keys())
+
+
+READ_FUNCTIONS = {
+    "api": read_api,
+    "digest": read_digest,
+    "robot_token": read_robot_token,
+    "teams": read_teams,
+}
+
+
+class LookupModule(LookupBase):
+    """Quay Container Registry lookup plugin."""
+
+    def get_cache(self, kind):
+        """Return the cache plugin, or ``None`` if the cache is disabled.
+
+        :param kind: Type of the data to retrieve.
+        :type kind: str
+
+        :return: The cache plugin object.
+        """
+        timeout = self.get_option("cache_timeout")
+        if not timeout or kind == "robot_token":
+            return None
+        cache = cache_loader.get(
+            self.get_option("cache_plugin"),
+            _uri=self.get_option("cache_connection"),
+            _timeout=timeout,
+            _prefix="quay_lookup_",
+        )
+        if cache is None:
+            raise AnsibleError(
+                "Cannot load the {name} cache plugin.".format(
+                    name=self.get_option("cache_plugin")
+                )
+            )
+        return cache
+
+    def run(self, terms, variables=None, **kwargs):
+        """Resolve the terms."""
+        self.set_options(var_options=variables, direct=kwargs)
+        kind = self.get_option("kind")
+        on_missing = self.get_option("on_missing")
+        params = dict((option, self.get_option(option)) for option in AUTH_OPTIONS)
+
+        # The cache keys identify the Quay installation, the account, and the
+        # item. The credentials are only used through their digest.
+        identity = json.dumps(
+            [params["quay_host"], params["quay_token"], params["quay_username"], kind]
+        )
+
+        def cache_key(term):
+            return hashlib.sha256((identity + term).encode("utf-8")).hexdigest()
+
+        cache = self.get_cache(kind)
+        results = {}
+        to_read = []
+        for term in terms:
+            if term in results or term in to_read:
+                continue
+            if cache is not None:
+                try:
+                    results[term] = cache.get(cache_key(term))
+                    continue
+                except KeyError:
+                    pass
+            to_read.append(term)
+
+        if to_read:
+            function = READ_FUNCTIONS[kind]
+
+            def read(term):
+                try:
+                    return (True, function(module, term))
+                except MissingItem as e:
+                    return (False, str(e))
+
+            module = None
+            try:
+                module = APIModule(argument_spec={}, direct_params=params)
+                values = module.run_concurrently(
+                    read, to_read, self.get_option("concurrency")
+                )
+            except APIModuleError as e:
+                raise AnsibleError("Cannot read from the Quay API: {error}".format(error=e))
+            finally:
+                # Sign out the session that a username and a password open
+                if module is not None:
+                    module.logout()
+            for warning in module.warnings:
+                self._display.warning(warning)
+            del module.warnings[:]
+
+            for term, (found, value) in zip(to_read, values):
+                if not found:
+                    if on_missing == "error":
+                        raise AnsibleError(value)
+                    results[term] = None
+                    continue
+                results[term] = value
+                if cache is not None and not has_secrets(value):
+                    cache.set(cache_key(term), value)
+
+        return [results[term] for term in terms]
@@ -6,16 +6,74 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import hashlib
+import os
 import socket
 import json
 import re
+import time
 
 from ansible.module_utils.basic import AnsibleModule, env_fallback
-from ansible.module_utils.common.text.converters import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+from ansible.module_utils.connection import Connection
 from ansible.module_utils.six.moves.urllib.parse import urlparse, urlencode
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 from ansible.module_utils.urls import Request, SSLValidationError
 
+try:
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    HAS_THREAD_POOL = True
+except ImportError:
+    HAS_THREAD_POOL = False
+
+
+def env_fallback_value(names):
+    """Return the value of the first environment variable that is set.
+
+    :param names: The names of the environment variables.
+    :type names: list
+
+    :return: The value, or ``None`` if no variable is set.
+    :rtype: str
+    """
+    for name in names:
+        if name in os.environ:
+            return os.environ[name]
+    return None
+
+
+class ConnectionResponse(object):
+    """Response of a request sent through the persistent connection.
+
+    The object provides the same methods as the responses that the
+    :py:class:``ansible.module_utils.urls.Request`` class returns.
+
+    :param result: The dictionary that the ``send_request`` method of the
+                   httpapi plugin returns, with the ``status_code``,
+                   ``body``, and ``headers`` keys.
+    :type result: dict
+    """
+
+    def __init__(self, result):
+        """Initialize the object."""
+        self.status = result.get("status_code", 0)
+        self.headers = result.get("headers") or {}
+        self._body = to_bytes(result.get("body") or "")
+
+    def read(self):
+        """Return the body of the response."""
+        return self._body
+
+    def getheaders(self):
+        """Return the headers as a list of tuples."""
+        return list(self.headers.items())
+
+    def close(self):
+        """Close the response. Nothing to do."""
+        pass
+
 
 class APIModuleError(Exception):
     """API request error exception.
@@ -57,9 +115,29 @@ class APIModule(AnsibleModule):
 
     REQUIRED_TOGETHER = [("quay_username", "quay_password")]
 
-    def __init__(self, argument_spec, **kwargs):
+    # Ordered list of the vulnerability levels for notifications. This list is
+    # also used to map each level name to its ID. The ID is the index the level
+    # in the list. The ID is used in the POST request.
+    VULNERABILITY_LEVELS = [
+        "critical",
+        "high",
+        "medium",
+        "low",
+        "negligible",
+        "unknown",
+    ]
+
+    def __init__(self, argument_spec, direct_params=None, **kwargs):
         """Initialize the object.
 
+        When ``direct_params`` is provided, the object does not read the
+        module arguments. Plugins that run on the control node, such as the
+        inventory and lookup plugins, use that mode to share the API code
+        with the modules. In that mode, the :py:meth:``fail_json`` method
+        raises the :py:class:``APIModuleError`` exception instead of exiting,
+        and the :py:meth:``warn`` method stores the warnings in the
+        :py:attr:``self.warnings`` list.
+
         Sets:
         * :py:attr:``self.host_url``: :py:class:``urllib.parse.ParseResult``
           object that represents the base URL of the Quay server.
@@ -68,23 +146,53 @@ class APIModule(AnsibleModule):
           anonymous.
         * :py:attr:``self.cache_org``: Dictionary that is used to cache
           organization details. Keys are organization names.
+        * :py:attr:``self.cache_tag_digest``: Dictionary that is used to
+          cache the manifest digests of tags. Keys are (namespace, repository,
+          tag) tuples.
+        * :py:attr:``self.connection``: The persistent connection when the
+          module runs with the ``ansible.netcommon.httpapi`` connection
+          plugin, or ``None``. The connection plugin authenticates once for
+          all the tasks, and the module sends its requests through that
+          connection.
         """
         self.authenticated = False
         self.token_authenticated = False
+        self.direct = direct_params is not None
+        self.connection = None
 
         full_argspec = {}
         full_argspec.update(self.AUTH_ARGSPEC)
         full_argspec.update(argument_spec)
 
-        kwargs["mutually_exclusive"] = (
-            kwargs.get("mutually_exclusive", []) + self.MUTUALLY_EXCLUSIVE
-        )
+        if self.direct:
+            self.params = {}
+            for name, spec in full_argspec.items():
+                value = direct_params.get(name)
+                if value is None and "fallback" in spec:
+                    value = env_fallback_value(spec["fallback"][1])
+                if value is None:
+                    value = spec.get("default")
+                elif spec.get("type") == "bool":
+                    value = boolean(value, strict=False)
+                elif spec.get("type") == "float":
+                    value = float(value)
+                self.params[name] = value
+            self.check_mode = False
+            self.warnings = []
+        else:
+            kwargs["mutually_exclusive"] = (
+                kwargs.get("mutually_exclusive", []) + self.MUTUALLY_EXCLUSIVE
+            )
 
-        kwargs["required_together"] = (
-            kwargs.get("required_together", []) + self.REQUIRED_TOGETHER
-        )
+            kwargs["required_together"] = (
+                kwargs.get("required_together", []) + self.REQUIRED_TOGETHER
+            )
 
-        super(APIModule, self).__init__(argument_spec=full_argspec, **kwargs)
+            super(APIModule, self).__init__(argument_spec=full_argspec, **kwargs)
+
+            # Persistent connection (ansible_connection=httpapi)
+            if self._socket_path:
+                self.connection = Connection(self._socket_path)
 
         host = self.params.get("quay_host")
 
@@ -101,6 +209,17 @@ class APIModule(AnsibleModule):
                 )
             )
 
+        # The connection plugin manages the network session and the
+        # authentication
+        if self.connection is not None:
+            self.create_session()
+            self.authenticated = True
+            self.token_authenticated = True
+            self.token = None
+            self.cache_org = {}
+            self.cache_tag_digest = {}
+            return
+
         # Try to resolve the hostname
         try:
             socket.gethostbyname(self.host_url.hostname)
@@ -131,6 +250,7 @@ class APIModule(AnsibleModule):
 
         # Cache returns from API calls that get organization details
         self.cache_org = {}
+        self.cache_tag_digest = {}
 
     def create_session(self):
         """Create a network session.
@@ -226,8 +346,14 @@ class APIModule(AnsibleModule):
         self.create_session()
 
     def fail_json(self, **kwargs):
-        """Logout and then exit with an error."""
+        """Logout and then exit with an error.
+
+        :raises APIModuleError: The object has been created with the
+                                ``direct_params`` parameter.
+        """
         self.logout()
+        if self.direct:
+            raise APIModuleError(kwargs.get("msg", "Unknown error"))
         super(APIModule, self).fail_json(**kwargs)
 
     def exit_json(self, **kwargs):
@@ -235,6 +361,17 @@ class APIModule(AnsibleModule):
         self.logout()
         super(APIModule, self).exit_json(**kwargs)
 
+    def warn(self, warning):
+        """Issue a warning.
+
+        :param warning: The warning message.
+        :type warning: str
+        """
+        if self.direct:
+            self.warnings.append(warning)
+        else:
+            super(APIModule, self).warn(warning)
+
     def build_url(self, endpoint, query_params=None):
         """Return a URL for the given endpoint.
 
@@ -295,7 +432,9 @@ class APIModule(AnsibleModule):
         follow_redirects = kwargs.get("follow_redirects")
 
         try:
-            if follow_redirects is not None:
+            if self.connection is not None:
+                response = self.send_through_connection(method, url, headers, data)
+            elif follow_redirects is not None:
                 response = self.session.open(
                     method,
                     url.geturl(),
@@ -393,6 +532,46 @@ class APIModule(AnsibleModule):
             "headers": response_headers,
         }
 
+    def send_through_connection(self, method, url, headers, data):
+        """Send a request through the persistent connection.
+
+        :param method: GET, PUT, POST, or DELETE
+        :type method: str
+        :param url: URL to the API endpoint. Only the path and the query are
+                    used. The connection plugin provides the host.
+        :type url: :py:class:``urllib.parse.ParseResult``
+        :param headers: Additional headers.
+        :type headers: dict
+        :param data: The data to send.
+        :type data: str or bytes
+
+        :raises HTTPError: The API returned an error code.
+
+        :return: The response.
+        :rtype: :py:class:``ConnectionResponse``
+        """
+        req_headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        req_headers.update(headers)
+        path = url.path
+        if url.query:
+            path = "{path}?{query}".format(path=path, query=url.query)
+        result = self.connection.send_request(
+            to_text(data) if data is not None else None,
+            path=path,
+            method=method,
+            headers=req_headers,
+        )
+        response = ConnectionResponse(result)
+        if response.status >= 400:
+            raise HTTPError(
+                url.geturl(),
+                response.status,
+                result.get("reason", ""),
+                response.headers,
+                response,
+            )
+        return response
+
     def make_json_request(self, method, url, ok_error_codes=None, **kwargs):
         """Perform an API call and return the retrieved JSON data.
 
@@ -434,6 +613,19 @@ class APIModule(AnsibleModule):
             "headers": response["headers"],
         }
 
+    @staticmethod
+    def content_hash(data):
+        """Return a hash of JSON data, independent of the order of the keys.
+
+        :param data: The data to hash.
+
+        :return: The SHA-256 digest, in hexadecimal.
+        :rtype: str
+        """
+        return hashlib.sha256(
+            to_bytes(json.dumps(data, sort_keys=True, separators=(",", ":")))
+        ).hexdigest()
+
     def get_error_message(self, response):
         """Return the error message provided in the API response.
 
@@ -577,6 +769,267 @@ class APIModule(AnsibleModule):
                 pass
         return response["json"]
 
+    def iter_pages(
+        self, endpoint, result_key, query_params=None, exit_on_error=True, **kwargs
+    ):
+        """Retrieve the items of a paginated list from GET API calls.
+
+        The method follows the ``next_page`` token that the API returns until
+        the last page. Because it is a generator, only one page is kept in
+        memory at a time.
+
+        :param endpoint: API endpoint path. You can add path parameters in that
+                         path by enclosing them in braces ``{}``.
+                         For example, ``organization/{orgname}/logs``
+        :type endpoint: str
+        :param result_key: Name of the attribute in the JSON response that
+                           stores the list of items. For example,
+                           ``repositories``.
+        :type result_key: str
+        :param query_params: The optional query to append to the URL
+        :type query_params: dict
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+        :param kwargs: Dictionary used to substitute parameters in the given
+                       ``endpoint`` string. For example ``{"orgname":"devel"}``
+        :type kwargs: dict
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
+
+        :return: The items, one at a time. Nothing if the endpoint returns a
+                 404 error.
+        :rtype: generator
+        """
+        query = dict(query_params) if query_params else {}
+        while True:
+            page = self.get_object_path(
+                endpoint,
+                query_params=query,
+                exit_on_error=exit_on_error,
+                duplicate_underscore=False,
+                **kwargs
+            )
+            if not page:
+                return
+            for item in page.get(result_key, []):
+                yield item
+            next_page = page.get("next_page")
+            if not next_page:
+                return
+            query["next_page"] = next_page
+
+    def poll_object_path(
+        self,
+        endpoint,
+        get_status,
+        is_pending,
+        timeout,
+        min_delay=1,
+        max_delay=30,
+        exit_on_error=True,
+        **kwargs
+    ):
+        """Retrieve an object until it leaves a pending state.
+
+        The delay between two requests starts at ``min_delay`` and grows by
+        half after each request that does not show a change, up to
+        ``max_delay``. The delay returns to ``min_delay`` when the status
+        changes. When the API returns an ``ETag`` header, the method sends
+        conditional requests (``If-None-Match``), so that the API can answer
+        with a short HTTP 304 response while the object does not change.
+
+        :param endpoint: API endpoint path. You can add path parameters in that
+                         path by enclosing them in braces ``{}``.
+                         For example, ``repository/{full_repo_name}/mirror``
+        :type endpoint: str
+        :param get_status: Function that receives the object and returns a
+                           dictionary that summarizes its status. The method
+                           records that dictionary in the timeline each time
+                           it changes.
+        :type get_status: callable
+        :param is_pending: Function that receives the object and returns
+                           ``True`` while the method must keep polling.
+        :type is_pending: callable
+        :param timeout: Maximum number of seconds to wait.
+        :type timeout: int
+        :param min_delay: Initial delay between two requests, in seconds.
+        :type min_delay: int
+        :param max_delay: Maximum delay between two requests, in seconds.
+        :type max_delay: int
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+        :param kwargs: Dictionary used to substitute parameters in the given
+                       ``endpoint`` string. For example ``{"orgname":"devel"}``
+        :type kwargs: dict
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
+
+        :return: A tuple with the last version of the object (``None`` if the
+                 object does not exist), the timeline, and a Boolean that
+                 indicates whether the timeout expired. Each item of the
+                 timeline is the dictionary that ``get_status`` returns, with
+                 the additional ``elapsed`` key that gives the number of
+                 seconds since the beginning of the polling.
+        :rtype: tuple
+        """
+        for k in kwargs:
+            endpoint = endpoint.replace("{" + k + "}", kwargs[k])
+        url = self.build_url(endpoint)
+
+        start = time.time()
+        delay = min_delay
+        etag = None
+        data = None
+        status = None
+        timeline = []
+        while True:
+            headers = {"If-None-Match": etag} if etag else {}
+            try:
+                response = self.make_json_request(
+                    "GET", url, ok_error_codes=[404, 304], headers=headers
+                )
+                if response["status_code"] == 404:
+                    return None, timeline, False
+                if response["status_code"] not in (200, 304):
+                    error_msg = self.get_error_message(response)
+                    raise APIModuleError(
+                        "Unable to get {path}: {code}{sep}{error}.".format(
+                            path=url.path,
+                            code=response["status_code"],
+                            sep=": " if error_msg else "",
+                            error=error_msg or "",
+                        )
+                    )
+            except APIModuleError as e:
+                if exit_on_error:
+                    self.fail_json(msg=str(e))
+                raise
+
+            elapsed = time.time() - start
+            if response["status_code"] == 200:
+                data = response["json"]
+                headers_lower = dict((k.lower(), v) for k, v in response["headers"].items())
+                etag = headers_lower.get("etag")
+                new_status = get_status(data)
+                if new_status != status:
+                    status = new_status
+                    entry = dict(status)
+                    entry["elapsed"] = round(elapsed, 1)
+                    timeline.append(entry)
+                    delay = min_delay
+                if not is_pending(data):
+                    return data, timeline, False
+
+            if elapsed >= timeout:
+                return data, timeline, True
+            time.sleep(min(delay, timeout - elapsed))
+            delay = min(delay * 1.5, max_delay)
+
+    def get_repositories(self, namespace, exit_on_error=True):
+        """Return the repositories in the given namespace.
+
+        :param namespace: The name of the organization or the personal
+                          namespace.
+        :type namespace: str
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
+
+        :return: The list of repositories. Each item is the dictionary
+                 retrieved from the API.
+        :rtype: list
+        """
+        # Get the repositories
+        #
+        # GET /api/v1/repository?namespace={namespace}&next_page={token}
+        # {
+        #   "repositories": [
+        #     {
+        #       "namespace": "production",
+        #       "name": "smallimage",
+        #       "description": "My small image",
+        #       "is_public": false,
+        #       "kind": "image",
+        #       "state": "NORMAL",
+        #       "is_starred": false
+        #     }
+        #   ],
+        #   "next_page": "gAAAAABh...Wx1a"
+        # }
+        return list(
+            self.iter_pages(
+                "repository",
+                "repositories",
+                query_params={"namespace": namespace},
+                exit_on_error=exit_on_error,
+            )
+        )
+
+    def get_repository_names(self, repositories=None, namespace=None):
+        """Return the full names of the repositories that a module processes.
+
+        The method lists the repositories of the namespace, or completes the
+        given repository names. The names without a namespace part are in the
+        user's personal namespace, which the method retrieves only once.
+
+        The method exits the module if the namespace does not exist, or if a
+        name does not include a namespace part and the user does not have a
+        personal namespace (the module uses a robot account or an application
+        token, for example).
+
+        :param repositories: The repository names, from the ``repositories``
+                             module parameter.
+        :type repositories: list
+        :param namespace: The namespace (organization or user account) from
+                          which to list all the repositories. The method
+                          ignores the ``repositories`` parameter when you set
+                          that parameter.
+        :type namespace: str
+
+        :return: The repository names in the ``namespace/repository`` format.
+        :rtype: list
+        """
+        if namespace:
+            if not self.get_namespace(namespace):
+                self.fail_json(
+                    msg="The {namespace} namespace does not exist.".format(
+                        namespace=namespace
+                    )
+                )
+            return [
+                "{namespace}/{name}".format(namespace=namespace, name=r["name"])
+                for r in self.get_repositories(namespace)
+            ]
+
+        repo_names = []
+        my_name = None
+        for repository in repositories or []:
+            repository = repository.strip("/")
+            if "/" not in repository:
+                # No namespace part in the name. Therefore, use the user's
+                # personal namespace
+                my_name = my_name or self.who_am_i()
+                if not my_name:
+                    self.fail_json(
+                        msg=(
+                            "The `repositories' parameter must include the"
+                            " organization: <organization>/{name}."
+                        ).format(name=repository)
+                    )
+                repository = "{namespace}/{name}".format(namespace=my_name, name=repository)
+            repo_names.append(repository)
+        return repo_names
+
     def delete(
         self,
         object,
@@ -1307,7 +1760,15 @@ class APIModule(AnsibleModule):
 
         return (namespace, shortname, namespace_details.get("is_organization", False))
 
-    def get_tags(self, namespace, repository, tag=None, digest=None, only_active_tags=True):
+    def get_tags(
+        self,
+        namespace,
+        repository,
+        tag=None,
+        digest=None,
+        only_active_tags=True,
+        exit_on_error=True,
+    ):
         """Return the list of tags for the given repository.
 
         :param namespace: The name of the repository's namespace.
@@ -1325,6 +1786,13 @@ class APIModule(AnsibleModule):
         :param only_active_tags: If ``True`` (the default), then only return
                                  active tags.
         :type only_active_tags: bool
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
 
         :return: The list of tags or an empty list if no tag has been retrieved.
                  Each item in the list is the dictionary retrieved from the API.
@@ -1419,10 +1887,46 @@ class APIModule(AnsibleModule):
         # "page": 1,
         # "has_additional": false
         # }
+        tags = self.iter_tags(
+            namespace, repository, tag, only_active_tags, exit_on_error=exit_on_error
+        )
+        if tag or not digest:
+            return list(tags)
+        return [t for t in tags if t.get("manifest_digest") == digest]
+
+    def iter_tags(
+        self, namespace, repository, tag=None, only_active_tags=True, exit_on_error=True
+    ):
+        """Retrieve the tags of the given repository, one page at a time.
+
+        Because the method is a generator, only one page of tags (100 tags) is
+        kept in memory at a time.
+
+        :param namespace: The name of the repository's namespace.
+        :type namespace: str
+        :param repository: The name of the repository.
+        :type repository: str
+        :param tag: The tag to retrieve. If ``None`` (the default), then all
+                    the tags for the given repository are returned.
+        :type tag: str
+        :param only_active_tags: If ``True`` (the default), then only return
+                                 active tags.
+        :type only_active_tags: bool
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
+
+        :return: The tags, one at a time. Each item is the dictionary
+                 retrieved from the API (see :py:meth:``get_tags``).
+        :rtype: generator
+        """
         query_params = {"onlyActiveTags": only_active_tags, "limit": 100}
         if tag:
             query_params["specificTag"] = tag
-        tag_list = []
         page = 1
         while True:
             query_params["page"] = page
@@ -1430,25 +1934,74 @@ class APIModule(AnsibleModule):
             tags = self.get_object_path(
                 "repository/{namespace}/{repository}/tag/",
                 query_params=query_params,
+                exit_on_error=exit_on_error,
                 namespace=namespace,
                 repository=repository,
             )
-            if tags:
-                if tag or not digest:
-                    tag_list.extend(tags.get("tags", []))
-                else:
-                    tag_list.extend(
-                        [
-                            t
-                            for t in tags.get("tags", [])
-                            if t.get("manifest_digest") == digest
-                        ]
-                    )
-                if tags.get("has_additional", False):
-                    page += 1
-                    continue
-            break
-        return tag_list
+            if not tags:
+                return
+            for t in tags.get("tags", []):
+                yield t
+            if not tags.get("has_additional", False):
+                return
+            page += 1
+
+    def get_tag_digest(self, namespace, repository, tag, exit_on_error=True):
+        """Return the manifest digest that the given tag references.
+
+        Instead of retrieving the whole history of the tag, the method only
+        requests the active entry. If the tag is not active, because it has
+        been deleted or it has expired, then the method returns the digest of
+        the most recent entry in the tag history.
+
+        The method caches the digests for the lifetime of the object.
+
+        :param namespace: The name of the repository's namespace.
+        :type namespace: str
+        :param repository: The name of the repository.
+        :type repository: str
+        :param tag: The tag to resolve.
+        :type tag: str
+        :param exit_on_error: If ``True`` (the default), exit the module on API
+                              error. Otherwise, raise the
+                              :py:class:``APIModuleError`` exception.
+        :type exit_on_error: bool
+
+        :raises APIModuleError: An API error occurred. That exception is only
+                                raised when ``exit_on_error`` is ``False``.
+
+        :return: The manifest digest, or ``None`` if the tag does not exist.
+        :rtype: str
+        """
+        key = (namespace, repository, tag)
+        if key in self.cache_tag_digest:
+            return self.cache_tag_digest[key]
+
+        # Get the active tag (see get_tags())
+        #
+        # GET /api/v1/repository/{namespace}/{repository}/tag/?specificTag={tag}
+        #         &onlyActiveTags=true&limit=1&page=1
+        digest = None
+        for only_active_tags in (True, False):
+            tags = self.get_object_path(
+                "repository/{namespace}/{repository}/tag/",
+                query_params={
+                    "specificTag": tag,
+                    "onlyActiveTags": only_active_tags,
+                    "limit": 1,
+                    "page": 1,
+                },
+                exit_on_error=exit_on_error,
+                namespace=namespace,
+                repository=repository,
+            )
+            if not tags:
+                break
+            if tags.get("tags"):
+                digest = tags["tags"][0].get("manifest_digest")
+                break
+        self.cache_tag_digest[key] = digest
+        return digest
 
     def process_prune_parameters(
         self, method, value, tag_pattern=None, tag_pattern_matches=True
@@ -1515,6 +2068,188 @@ class APIModule(AnsibleModule):
             )
         return data
 
+    def process_notification_parameters(
+        self,
+        namespace,
+        title,
+        event,
+        method,
+        config,
+        vulnerability_level=None,
+        image_expiry_days=7,
+    ):
+        """Return the notification parameters in a dictionary ready for the API.
+
+        The method verifies that the recipient of Quay notifications (user
+        account, team, or organization) exists. The method exits the module
+        on error.
+
+        :param namespace: The namespace of the repository. Teams are searched
+                          in that organization.
+        :type namespace: str
+        :param title: The notification title.
+        :type title: str
+        :param event: The event that triggers the notification.
+        :type event: str
+        :param method: The notification method (``email``, ``slack``, ...)
+        :type method: str
+        :param config: The configuration parameters for the notification
+                       method.
+        :type config: dict
+        :param vulnerability_level: The minimal vulnerability level for the
+                                    ``vulnerability_found`` event.
+        :type vulnerability_level: str
+        :param image_expiry_days: The number of days before image expiration
+                                  for the ``repo_image_expiry`` event.
+        :type image_expiry_days: int
+
+        :return: The notification parameters ready to be used for a call to
+                 the API.
+        :rtype: dict
+        """
+        new_fields = {"eventConfig": {}, "event_config": {}, "config": {}}
+        missing_parameters = []
+        if title:
+            new_fields["title"] = title
+        else:
+            missing_parameters.append("title")
+        if event:
+            new_fields["event"] = event
+        else:
+            missing_parameters.append("event")
+        if method:
+            new_fields["method"] = method
+        else:
+            missing_parameters.append("method")
+        if not config:
+            missing_parameters.append("config")
+        if missing_parameters:
+            self.fail_json(
+                msg="Some required parameters are not provided: {params}".format(
+                    params=", ".join(missing_parameters)
+                )
+            )
+
+        if method == "email":
+            email = config.get("email")
+            if email:
+                new_fields["config"]["email"] = email
+            else:
+                self.fail_json(
+                    msg=(
+                        "The email notification method requires the"
+                        " `email' configuration option."
+                    )
+                )
+        elif method == "flowdock":
+            flow_api_token = config.get("flow_api_token")
+            if flow_api_token:
+                new_fields["config"]["flow_api_token"] = flow_api_token
+            else:
+                self.fail_json(
+                    msg=(
+                        "The Flowdock notification method requires the"
+                        " `flow_api_token' configuration option."
+                    )
+                )
+        elif method == "hipchat":
+            room_id = config.get("room_id")
+            if room_id:
+                new_fields["config"]["room_id"] = room_id
+            else:
+                self.fail_json(
+                    msg=(
+                        "The HipChat notification method requires the"
+                        " `room_id' and `notification_token' configuration options."
+                    )
+                )
+            notification_token = config.get("notification_token")
+            if notification_token:
+                new_fields["config"]["notification_token"] = notification_token
+            else:
+                self.fail_json(
+                    msg=(
+                        "The HipChat notification method requires the"
+                        " `room_id' and `notification_token' configuration options."
+                    )
+                )
+        elif method == "slack":
+            url = config.get("url")
+            if url:
+                new_fields["config"]["url"] = url
+            else:
+                self.fail_json(
+                    msg=(
+                        "The Slack notification method requires the"
+                        " `url' configuration option."
+                    )
+                )
+        elif method == "webhook":
+            url = config.get("url")
+            if url:
+                new_fields["config"]["url"] = url
+            else:
+                self.fail_json(
+                    msg=(
+                        "The webhook POST notification method requires the"
+                        " `url' configuration option."
+                    )
+                )
+            template = config.get("template")
+            if template:
+                new_fields["config"]["template"] = template
+        elif method == "quay_notification":
+            name = config.get("name")
+            if not name:
+                self.fail_json(
+                    msg=(
+                        "The Quay notification method requires the"
+                        " `name' configuration option."
+                    )
+                )
+            kind = config.get("type")
+            new_fields["config"]["target"] = {"name": name, "kind": kind}
+            if kind == "user":
+                user_details = self.get_account(name)
+                if not user_details:
+                    self.fail_json(
+                        msg=(
+                            "The {user} user account in the"
+                            " `name' parameter does not exist."
+                        ).format(user=name)
+                    )
+                if user_details.get("is_robot"):
+                    self.fail_json(
+                        msg=(
+                            "{user} in the `name' parameter is a robot account."
+                            " You cannot use robot accounts for notifications."
+                        ).format(user=name)
+                    )
+            if kind == "team" and not self.get_team(namespace, name):
+                self.fail_json(
+                    msg=(
+                        "The {team} team in the `name' parameter does not"
+                        " exist in the {orgname} organization."
+                    ).format(team=name, orgname=namespace)
+                )
+            if kind == "org" and not self.get_organization(name):
+                self.fail_json(
+                    msg=(
+                        "The {orgname} organization in the `name' parameter"
+                        " does not exist."
+                    ).format(orgname=name)
+                )
+
+        if event == "vulnerability_found" and vulnerability_level is not None:
+            new_fields["eventConfig"]["level"] = new_fields["event_config"]["level"] = str(
+                self.VULNERABILITY_LEVELS.index(vulnerability_level)
+            )
+        elif event == "repo_image_expiry":
+            new_fields["eventConfig"]["days"] = new_fields["event_config"]["days"] = int(
+                image_expiry_days
+            )
+        return new_fields
+
     def str_period_to_second(self, parameter_name, value):
         """Convert a period string into seconds.
 
@@ -1560,6 +2295,171 @@ class APIModule(AnsibleModule):
             ).format(param=parameter_name, value=value)
         )
 
+    def str_size_to_bytes(self, parameter_name, value):
+        """Convert a size string into bytes.
+
+        :param parameter_name: The name of the parameter being parsed. Used
+                               only to display in the error message.
+        :type parameter_name: str
+        :param value: The value to convert into bytes. The value accepts the
+                      ``KB``, ``KiB``, ``MB``, ``MiB``, ``GB``, ``GiB``,
+                      ``TB``, and ``TiB`` suffixes, or no suffix, and can
+                      contain spaces. Parsing is case-insensitive.
+        :type value: str
+
+        :return: The size in bytes.
+        :rtype: int
+        """
+        mult = 1
+        q = value.lower()
+        for suffix, factor in (
+            ("tib", 1024 * 1024 * 1024 * 1024),
+            ("tb", 1000 * 1000 * 1000 * 1000),
+            ("gib", 1024 * 1024 * 1024),
+            ("gb", 1000 * 1000 * 1000),
+            ("mib", 1024 * 1024),
+            ("mb", 1000 * 1000),
+            ("kib", 1024),
+            ("kb", 1000),
+        ):
+            if suffix in q:
+                q = q.replace(suffix, "")
+                mult = factor
+                break
+        try:
+            return int(float(q.replace(" ", "")) * mult)
+        except ValueError:
+            msg = "Wrong format for the `{param}' parameter: {value} is not a float.".format(
+                param=parameter_name, value=value
+            )
+            self.fail_json(msg=msg)
+
+    def run_concurrently(self, function, items, workers=1):
+        """Call a function for each item in a list by using a pool of threads.
+
+        All the threads share the network session (:py:attr:``self.session``)
+        so that authentication is performed only once.
+
+        The function must not exit the module. It must call the API methods
+        with ``exit_on_error`` set to ``False``, and let the
+        :py:class:``APIModuleError`` exceptions propagate.
+
+        If the :py:mod:``concurrent.futures`` module is not available (Python
+        2), then the method processes the items sequentially.
+
+        :param function: The function to call. The function receives an item
+                         from the list as its only parameter.
+        :type function: callable
+        :param items: The items to process.
+        :type items: list
+        :param workers: Maximum number of threads that run at the same time.
+        :type workers: int
+
+        :raises APIModuleError: A call to the function raised that exception.
+                                The method waits for all the running calls to
+                                complete before raising the first error.
+
+        :return: The values returned by the function, in the same order as the
+                 given items.
+        :rtype: list
+        """
+        items = list(items)
+        if not HAS_THREAD_POOL or workers is None or workers < 2 or len(items) < 2:
+            return [function(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    def run_graph(self, function, nodes, dependencies, workers=1):
+        """Call a function for each node of a dependency graph.
+
+        A node is processed only when all the nodes it depends on have been
+        successfully processed. Independent nodes are processed in parallel,
+        by using a pool of threads that share the network session.
+
+        When the function raises the :py:class:``APIModuleError`` exception
+        for a node, the method does not process the nodes that depend on it,
+        directly or indirectly, but continues with the other nodes.
+
+        As for :py:meth:``run_concurrently``, the function must not exit the
+        module.
+
+        :param function: The function to call. The function receives a node
+                         as its only parameter.
+        :type function: callable
+        :param nodes: The nodes to process. When several nodes are ready, the
+                      method starts them in that order.
+        :type nodes: list
+        :param dependencies: Dictionary that lists, for each node, the nodes
+                             that must be processed before. Dependencies on
+                             nodes that are not in ``nodes`` are ignored.
+        :type dependencies: dict
+        :param workers: Maximum number of threads that run at the same time.
+        :type workers: int
+
+        :return: A dictionary that associates each node with a tuple. The
+                 first item of the tuple is ``ok``, ``failed``, or
+                 ``skipped``. The second item is the value that the function
+                 returns (``ok``), the error message (``failed``), or the
+                 failed node that prevented the processing (``skipped``).
+        :rtype: dict
+        """
+        nodes = list(nodes)
+        waiting = {}
+        dependents = dict((node, []) for node in nodes)
+        for node in nodes:
+            waiting[node] = set(d for d in dependencies.get(node, []) if d in dependents)
+            for dep in waiting[node]:
+                dependents[dep].append(node)
+        results = {}
+
+        def record(node, status, value):
+            results[node] = (status, value)
+            if status == "ok":
+                for child in dependents[node]:
+                    waiting[child].discard(node)
+                return
+            # Skip all the nodes that depend on the failed node
+            cause = node if status == "failed" else value
+            for child in dependents[node]:
+                if child not in results:
+                    waiting.pop(child, None)
+                    record(child, "skipped", cause)
+
+        def call(node):
+            try:
+                return ("ok", function(node))
+            except APIModuleError as e:
+                return ("failed", str(e))
+
+        def ready_nodes():
+            ready = [n for n in nodes if n in waiting and not waiting[n]]
+            for node in ready:
+                del waiting[node]
+            return ready
+
+        if not HAS_THREAD_POOL or workers is None or workers < 2:
+            ready = ready_nodes()
+            while ready:
+                for node in ready:
+                    status, value = call(node)
+                    record(node, status, value)
+                ready = ready_nodes()
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                running = dict((executor.submit(call, n), n) for n in ready_nodes())
+                while running:
+                    done, _not_used = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        status, value = future.result()
+                        record(running.pop(future), status, value)
+                    for node in ready_nodes():
+                        running[executor.submit(call, node)] = node
+
+        # Nodes that are still waiting are part of a dependency cycle
+        for node in list(waiting):
+            results[node] = ("failed", "Dependency cycle detected.")
+        return results
+
 
 class APIModuleNoAuth(APIModule):
     AUTH_ARGSPEC = dict(
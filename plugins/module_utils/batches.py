@@ -0,0 +1,76 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import heapq
+
+
+class TopItems(object):
+    """Keep the items that have the highest scores.
+
+    The object uses a heap of a fixed size so that the memory consumption
+    does not depend on the number of items that it receives. For the items
+    that have the same score, the object keeps the first ones it receives.
+    """
+
+    def __init__(self, size):
+        """Initialize the object.
+
+        :param size: Maximum number of items to keep.
+        :type size: int
+        """
+        self.size = size
+        self._heap = []
+        self._seq = 0
+
+    def add(self, score, item):
+        """Offer an item.
+
+        :param score: The score of the item.
+        :type score: int
+        :param item: The item.
+        :type item: dict
+        """
+        if self.size < 1:
+            return
+        # The sequence number prevents the comparison of the items, and
+        # favors the first items when the scores are equal
+        self._seq += 1
+        entry = (score, -self._seq, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappushpop(self._heap, entry)
+
+    def items(self):
+        """Return the kept items, the item with the highest score first.
+
+        :return: The items.
+        :rtype: list
+        """
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
+
+
+def iter_batches(items, size):
+    """Group the items that an iterator returns in lists of the given size.
+
+    :param items: The items to group.
+    :type items: iterator
+    :param size: Maximum number of items in each list.
+    :type size: int
+
+    :return: The lists of items, one at a time.
+    :rtype: generator
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,73 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import tempfile
+
+
+def save_checkpoint(module, path, state):
+    """Atomically write the checkpoint file.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param path: Path to the checkpoint file.
+    :type path: str
+    :param state: The data to write.
+    :type state: dict
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ansible_tmp", suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, sort_keys=True)
+    except (IOError, OSError) as e:
+        module.fail_json(
+            msg="Cannot write the checkpoint file {path}: {error}".format(path=path, error=e)
+        )
+    module.atomic_move(tmp_path, path)
+
+
+def read_checkpoint(module, path, scope, version):
+    """Read the checkpoint file.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param path: Path to the checkpoint file.
+    :type path: str
+    :param scope: The object that the checkpoint file must have been created
+                  for. For example, ``organization/production``.
+    :type scope: str
+    :param version: The version of the format of the file that the module
+                    supports.
+    :type version: int
+
+    :return: The data from the file, or an empty dictionary if the file does
+             not exist.
+    :rtype: dict
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (IOError, OSError, ValueError) as e:
+        module.fail_json(
+            msg="Cannot read the checkpoint file {path}: {error}".format(path=path, error=e)
+        )
+    if state.get("version") != version:
+        module.fail_json(
+            msg="Unsupported format for the checkpoint file {path}.".format(path=path)
+        )
+    if state.get("scope") != scope:
+        module.fail_json(
+            msg=(
+                "The checkpoint file {path} was created for {other}, not for {scope}."
+            ).format(path=path, other=state.get("scope"), scope=scope)
+        )
+    return state
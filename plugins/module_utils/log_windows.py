@@ -0,0 +1,68 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import datetime
+import email.utils
+import time
+
+# Format of the starttime and endtime query parameters of the log endpoints
+LOG_DATE_FORMAT = "%m/%d/%Y"
+
+
+def parse_log_datetime(value):
+    """Convert the date of a log entry into seconds since the epoch.
+
+    :param value: The date, as returned by the API. For example,
+                  ``Mon, 19 Oct 2026 13:30:03 -0000``.
+    :type value: str
+
+    :return: The number of seconds since the epoch, or ``0`` if the date
+             cannot be parsed.
+    :rtype: int
+    """
+    parsed = email.utils.parsedate_tz(value) if value else None
+    return email.utils.mktime_tz(parsed) if parsed else 0
+
+
+def utc_date(timestamp):
+    """Return the day, in UTC, of a date in seconds since the epoch.
+
+    :param timestamp: The date in seconds since the epoch.
+    :type timestamp: float
+
+    :return: The day.
+    :rtype: :py:class:``datetime.date``
+    """
+    return datetime.date(*time.gmtime(timestamp)[:3])
+
+
+def date_windows(start, end, size):
+    """Divide a period into date windows for the log endpoints.
+
+    Quay organizes the logs by days, and rejects the long periods. The
+    windows can be retrieved in parallel.
+
+    :param start: The first day of the period.
+    :type start: :py:class:``datetime.date``
+    :param end: The last day of the period.
+    :type end: :py:class:``datetime.date``
+    :param size: The number of days in each window.
+    :type size: int
+
+    :return: The windows, the most recent first. Each window is a tuple with
+             the first and the last days (both included), formatted for the
+             ``starttime`` and ``endtime`` query parameters.
+    :rtype: list
+    """
+    windows = []
+    last = end
+    while last >= start:
+        first = max(start, last - datetime.timedelta(days=size - 1))
+        windows.append((first.strftime(LOG_DATE_FORMAT), last.strftime(LOG_DATE_FORMAT)))
+        last = first - datetime.timedelta(days=1)
+    return windows
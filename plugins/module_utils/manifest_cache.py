@@ -0,0 +1,159 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import re
+import tempfile
+import time
+
+# Version of the format of the cache entries
+CACHE_VERSION = 1
+
+
+def _safe_name(name):
+    """Return a string that can be used as a file name."""
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    return "_" + name if name.startswith(".") else name
+
+
+class ManifestCache(object):
+    """Store data about image manifests in a local directory.
+
+    Manifests are immutable, and the data that the API returns about a
+    manifest, such as its layers, only changes in known circumstances. The
+    object stores that data in JSON files, one file per manifest and per kind
+    of data, under a directory specific to the Quay installation::
+
+        <directory>/<host>/<kind>/[<namespace>/<repository>/]<digest>.json
+
+    The data that Quay stores per repository, such as the labels, must be
+    stored and retrieved with the ``repository`` parameter.
+
+    The files are written atomically, so that several threads, modules, or
+    runs can share the same directory. The object does nothing if the
+    directory is ``None``.
+    """
+
+    def __init__(self, module, directory):
+        """Initialize the object.
+
+        :param module: The module object.
+        :type module: :py:class:``APIModule``
+        :param directory: Path to the cache directory. If ``None``, then the
+                          cache is disabled.
+        :type directory: str
+        """
+        self.module = module
+        self.directory = None
+        if not directory:
+            return
+        self.directory = os.path.join(directory, _safe_name(module.host_url.netloc))
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+        except OSError as e:
+            module.fail_json(
+                msg="Cannot create the cache directory {path}: {error}".format(
+                    path=self.directory, error=e
+                )
+            )
+
+    def _path(self, kind, digest, repository=None):
+        """Return the path to the file for the given entry."""
+        parts = [self.directory, kind]
+        if repository:
+            parts.extend([_safe_name(p) for p in repository.split("/", 1)])
+        parts.append(_safe_name(digest) + ".json")
+        return os.path.join(*parts)
+
+    def get(self, kind, digest, repository=None, max_age=None):
+        """Return the data stored for a manifest.
+
+        :param kind: The kind of data, such as ``layers``.
+        :type kind: str
+        :param digest: The digest of the manifest.
+        :type digest: str
+        :param repository: The full name of the repository, for the data that
+                           Quay stores per repository.
+        :type repository: str
+        :param max_age: Maximum age of the entry, in seconds. If ``None`` (the
+                        default), then the entry never expires.
+        :type max_age: int
+
+        :return: The data, or ``None`` if the cache does not have a valid
+                 entry.
+        """
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(kind, digest, repository)) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+        if max_age is not None and time.time() - entry.get("time", 0) > max_age:
+            return None
+        return entry.get("data")
+
+    def set(self, kind, digest, data, repository=None):
+        """Store the data for a manifest.
+
+        A write error does not fail the module, but issues a warning.
+
+        :param kind: The kind of data, such as ``layers``.
+        :type kind: str
+        :param digest: The digest of the manifest.
+        :type digest: str
+        :param data: The data to store. The data must be JSON serializable.
+        :param repository: The full name of the repository, for the data that
+                           Quay stores per repository.
+        :type repository: str
+        """
+        if not self.directory:
+            return
+        path = self._path(kind, digest, repository)
+        directory = os.path.dirname(path)
+        try:
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another thread or process might have created the directory
+                if not os.path.isdir(directory):
+                    raise
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".ansible_tmp", suffix=".json"
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": CACHE_VERSION, "time": time.time(), "data": data}, f)
+            os.rename(tmp_path, path)
+        except (IOError, OSError) as e:
+            self.module.warn(
+                "Cannot write the cache file {path}: {error}".format(path=path, error=e)
+            )
+
+    def invalidate(self, kind, digest, repository=None):
+        """Remove the data stored for a manifest.
+
+        :param kind: The kind of data, such as ``labels``.
+        :type kind: str
+        :param digest: The digest of the manifest.
+        :type digest: str
+        :param repository: The full name of the repository, for the data that
+                           Quay stores per repository.
+        :type repository: str
+        """
+        if not self.directory:
+            return
+        path = self._path(kind, digest, repository)
+        try:
+            os.remove(path)
+        except OSError:
+            if os.path.exists(path):
+                self.module.warn("Cannot remove the cache file {path}.".format(path=path))
@@ -0,0 +1,168 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from ansible.module_utils.common.text.converters import to_bytes
+
+
+class OutputFile(object):
+    """Write records to a JSON Lines or a CSV file, optionally compressed with gzip.
+
+    The object is a context manager. The records are written to a temporary
+    file in the destination directory, which is moved to its final location
+    when the context exits without error. If an exception occurs (including
+    the :py:class:``SystemExit`` exception that ``fail_json()`` raises), then
+    the temporary file is removed and the destination file is left untouched.
+
+    In append mode, the records are directly appended to the destination
+    file, and the records already written are kept if an exception occurs.
+    Appending to a gzip file adds a new gzip member, which the ``gzip`` and
+    ``zcat`` tools read as a single stream. The :py:meth:``flush`` method
+    ensures that the records are on disk, for example before recording the
+    progress of an export.
+
+    With the ``mode`` parameter, the temporary file gets these permissions
+    before the first record is written, and keeps them when it is moved.
+    Use that parameter for files that include sensitive data.
+
+    The :py:meth:``write`` method is not thread-safe. Only the main thread
+    must call it, or the calls must be serialized with a lock.
+    """
+
+    def __init__(
+        self, module, path, compress=False, fieldnames=None, append=False, mode=None
+    ):
+        """Initialize the object.
+
+        :param module: The module object, used for moving the temporary file.
+        :type module: :py:class:``api_module.APIModule``
+        :param path: Path to the destination file.
+        :type path: str
+        :param compress: Whether to compress the file with gzip.
+        :type compress: bool
+        :param fieldnames: The names of the CSV columns. If ``None`` (the
+                           default), then the records are written in the
+                           JSON Lines format. Otherwise, the file is a CSV
+                           file that starts with a header line.
+        :type fieldnames: list
+        :param append: Whether to append the records to the destination file
+                       instead of replacing it. The CSV header line is not
+                       written when the file already exists.
+        :type append: bool
+        :param mode: The permissions of the new file, such as ``0o600``. If
+                     ``None`` (the default), then the file gets the default
+                     permissions, or the permissions of the file it replaces.
+        :type mode: int
+        """
+        self.module = module
+        self.path = path
+        self.compress = compress
+        self.fieldnames = fieldnames
+        self.append = append
+        self.mode = mode
+        self.count = 0
+        self._tmp_path = None
+        self._fh = None
+
+    def __enter__(self):
+        if self.append:
+            exists = os.path.exists(self.path)
+            try:
+                if self.compress:
+                    self._fh = gzip.open(self.path, "ab")
+                else:
+                    self._fh = io.open(self.path, "ab")
+            except (IOError, OSError) as e:
+                self.module.fail_json(
+                    msg="Cannot open {path}: {error}".format(path=self.path, error=e)
+                )
+            if self.fieldnames and not exists:
+                self._write_row(self.fieldnames)
+            return self
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, self._tmp_path = tempfile.mkstemp(
+                dir=directory, prefix=".ansible_tmp", suffix=".jsonl"
+            )
+        except (IOError, OSError) as e:
+            self.module.fail_json(
+                msg="Cannot create a file in {dir}: {error}".format(dir=directory, error=e)
+            )
+        os.close(fd)
+        if self.mode is not None:
+            os.chmod(self._tmp_path, self.mode)
+        if self.compress:
+            self._fh = gzip.open(self._tmp_path, "wb")
+        else:
+            self._fh = io.open(self._tmp_path, "wb")
+        if self.fieldnames:
+            self._write_row(self.fieldnames)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._fh.close()
+        if self.append:
+            return False
+        if exc_type is None and self.mode is not None:
+            # atomic_move() would apply the permissions of the replaced file,
+            # or the default permissions. Renaming the file in the same
+            # directory is also atomic, and keeps the permissions.
+            try:
+                os.rename(self._tmp_path, self.path)
+            except OSError as e:
+                os.remove(self._tmp_path)
+                self.module.fail_json(
+                    msg="Cannot write {path}: {error}".format(path=self.path, error=e)
+                )
+        elif exc_type is None:
+            self.module.atomic_move(self._tmp_path, self.path)
+        else:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+        return False
+
+    def write(self, record):
+        """Append a record to the file.
+
+        :param record: The data to write as a single JSON line, or as a CSV
+                       line. For CSV files, the keys that are not in
+                       :py:attr:``fieldnames`` are ignored, and the missing
+                       keys give empty values.
+        :type record: dict
+        """
+        if self.fieldnames:
+            self._write_row([record.get(name) for name in self.fieldnames])
+        else:
+            self._fh.write(to_bytes(json.dumps(record, sort_keys=True) + "\n"))
+        self.count += 1
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        self._fh.flush()
+        if self.append:
+            os.fsync(self._fh.fileno())
+
+    def _write_row(self, values):
+        """Write a CSV line.
+
+        :param values: The values of the columns. ``None`` gives an empty
+                       value.
+        :type values: list
+        """
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow(values)
+        self._fh.write(to_bytes(buf.getvalue()))
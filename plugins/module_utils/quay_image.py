@@ -7,10 +7,71 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+def parse_image_name(image):
+    """Split an image name into its components.
+
+    The function does not send any API request. See :py:class:``QuayImage``
+    for the accepted formats.
+
+    :param image: The image name to process
+    :type image: str
+
+    :return: A tuple with the namespace, the repository, the tag, and the
+             digest. The namespace is ``None`` if the name does not include a
+             namespace part. Either the tag or the digest is ``None``.
+    :rtype: tuple
+    """
+    if "@" in image:
+        repo, digest = image.split("@", 1)
+        tag = None
+    else:
+        digest = None
+        repo, sep, tag = image.rpartition(":")
+        if not sep:
+            repo = image
+            tag = "latest"
+
+    # Get the namespace and the repository
+    namespace, sep, repo_shortname = repo.partition("/")
+    if not sep:
+        namespace = None
+        repo_shortname = repo
+    return (namespace, repo_shortname, tag, digest)
+
+
+def parse_image_names(module, images):
+    """Return the components of several image names.
+
+    The function retrieves the user's personal namespace only once, and
+    only if some image names do not include a namespace part.
+
+    :param module: An initialized :py:class:``api_module.APIModule`` object
+                   that can be used to access the API.
+    :type module: :py:class:``api_module.APIModule``
+    :param images: The image names to process
+    :type images: list
+
+    :return: The :py:class:``QuayImage`` objects, in the same order as the
+             given image names.
+    :rtype: list
+    """
+    user_namespace = None
+    resolved = False
+    result = []
+    for image in images:
+        # who_am_i() returns None for robot accounts and application tokens,
+        # so a separate flag records that the namespace has been retrieved
+        if not resolved and parse_image_name(image)[0] is None:
+            user_namespace = module.who_am_i()
+            resolved = True
+        result.append(QuayImage(module, image, user_namespace, resolved))
+    return result
+
+
 class QuayImage(object):
     """Provide access to the components of a container image."""
 
-    def __init__(self, module, image):
+    def __init__(self, module, image, user_namespace=None, namespace_resolved=False):
         """Initialize the object.
 
         The method accepts the following formats for the image name:
@@ -32,35 +93,30 @@ class QuayImage(object):
         :type module: :py:class:``api_module.APIModule``
         :param image: The image name to process
         :type image: str
+        :param user_namespace: The user's personal namespace, if already known.
+                               If ``None`` (the default) and the image name
+                               does not include a namespace part, then the
+                               method retrieves the namespace from the API.
+        :type user_namespace: str
+        :param namespace_resolved: Whether ``user_namespace`` is the namespace
+                                   already retrieved from the API, even if it
+                                   is ``None`` (anonymous access, robot
+                                   accounts, or application tokens). In that
+                                   case, the method does not query the API.
+        :type namespace_resolved: bool
         """
-        try:
-            repo, digest = image.split("@", 1)
-            self._digest = digest
-            self._tag = None
-        except ValueError:
-            try:
-                repo, tag = image.rsplit(":", 1)
-                self._digest = None
-                self._tag = tag
-            except ValueError:
-                repo = image
-                self._digest = None
-                self._tag = "latest"
-
-        # Get the namespace and the repository
-        try:
-            namespace, repo_shortname = repo.split("/", 1)
-            self._namespace = namespace
-            self._repository = repo_shortname
-        except ValueError:
+        namespace, self._repository, self._tag, self._digest = parse_image_name(image)
+        if namespace is None:
             # No namespace part in the repository name. Therefore, the
             # repository is in the user's personal namespace.
             # In case of anonymous access to the API, self.namespace is set to
             # None. That is an error that should be reported to the user
             # because when the API is anonymously accessed, the given image
             # name must include the namespace.
-            self._namespace = module.who_am_i()
-            self._repository = repo
+            if user_namespace is None and not namespace_resolved:
+                user_namespace = module.who_am_i()
+            namespace = user_namespace
+        self._namespace = namespace
 
     @property
     def namespace(self):
@@ -0,0 +1,1333 @@
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Functions that create and update the objects of an organization. The
+# modules that manage one type of object, such as quay_team, and the
+# quay_organization_apply module share them.
+#
+# The functions receive the current state of the object, which the caller
+# already retrieved, and only send the additional requests that they need.
+# They return the list of the performed operations, and raise the
+# APIModuleError exception on error.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from .api_module import APIModuleError
+
+
+def apply_user(
+    module, username, user_details, email=None, password=None, enabled=None, superuser=None
+):
+    """Create or update a user account.
+
+    The caller must ignore the superuser accounts, which the API cannot
+    update.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param username: Name of the user account.
+    :type username: str
+    :param user_details: The user account returned by the API, or ``None`` if
+                         the account does not exist.
+    :type user_details: dict
+    :param email: Email address of the account.
+    :type email: str
+    :param password: Password of the account.
+    :type password: str
+    :param enabled: Whether to enable the account.
+    :type enabled: bool
+    :param superuser: Whether to grant superuser permissions.
+    :type superuser: bool
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    actions = []
+    if user_details is None:
+        new_fields = {"username": username}
+        if email:
+            new_fields["email"] = email
+        module.create(
+            "user",
+            username,
+            "superuser/users/",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+        )
+        user_details = new_fields
+        user_details["enabled"] = True
+        actions.append("create user")
+
+    new_fields = {"superuser": superuser} if superuser is not None else {}
+    if enabled is not None:
+        new_fields["enabled"] = enabled
+    if email:
+        new_fields["email"] = email
+    if password:
+        new_fields["password"] = password
+    updated, _not_used = module.update(
+        user_details,
+        "user",
+        username,
+        "superuser/users/{username}",
+        new_fields,
+        auto_exit=False,
+        exit_on_error=False,
+        username=username,
+    )
+    if updated:
+        actions.append("update user")
+    return actions
+
+
+def apply_organization(module, name, org_details, email=None, tag_expiration_s=None):
+    """Create or update an organization.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param name: Name of the organization.
+    :type name: str
+    :param org_details: The organization returned by the API, or ``None`` if
+                        the organization does not exist.
+    :type org_details: dict
+    :param email: Email address of the organization.
+    :type email: str
+    :param tag_expiration_s: Time machine expiration, in seconds.
+    :type tag_expiration_s: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    actions = []
+    if not org_details:
+        new_fields = {"name": name}
+        if email:
+            new_fields["email"] = email
+        module.create(
+            "organization",
+            name,
+            "organization/",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+        )
+        # Forget the cached (missing) organization so that the next requests
+        # retrieve the new organization
+        if not module.check_mode:
+            module.cache_org.pop(name, None)
+        org_details = new_fields
+        actions.append("create organization")
+
+    new_fields = {}
+    if tag_expiration_s is not None:
+        new_fields["tag_expiration_s"] = tag_expiration_s
+    if email:
+        new_fields["email"] = email
+    updated, _not_used = module.update(
+        org_details,
+        "organization",
+        name,
+        "organization/{orgname}",
+        new_fields,
+        auto_exit=False,
+        exit_on_error=False,
+        orgname=name,
+    )
+    if updated:
+        actions.append("update organization")
+    return actions
+
+
+def find_prune_policy(policies, data):
+    """Return the auto-pruning policy that matches the given parameters.
+
+    :param policies: The policies returned by the API.
+    :type policies: list
+    :param data: The policy to search, as returned by
+                 :py:meth:``APIModule.process_prune_parameters``.
+    :type data: dict
+
+    :return: The matching policy, or ``None`` if no policy matches.
+    :rtype: dict
+    """
+    for policy in policies:
+        if (
+            policy.get("method") == data.get("method")
+            and policy.get("value") == data.get("value")
+            and policy.get("tagPattern") == data.get("tagPattern")
+            and policy.get("tagPatternMatches") == data.get("tagPatternMatches", True)
+        ):
+            return policy
+    return None
+
+
+def prune_policy_label(policy):
+    """Return a short description of an auto-pruning policy.
+
+    :param policy: The policy, with the ``method``, ``value``, and
+                   ``tagPattern`` keys.
+    :type policy: dict
+
+    :return: The description, such as ``number_of_tags=5 (^dev-)``.
+    :rtype: str
+    """
+    return "{method}={value}{pattern}".format(
+        method=policy.get("method"),
+        value=policy.get("value"),
+        pattern=" ({p})".format(p=policy["tagPattern"]) if policy.get("tagPattern") else "",
+    )
+
+
+def apply_prune_policies(module, endpoint, current, policies, append=True, **kwargs):
+    """Create the auto-pruning policies that do not exist.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param endpoint: The ``autoprunepolicy/`` endpoint of the organization or
+                     the repository.
+    :type endpoint: str
+    :param current: The existing policies, as returned by the API.
+    :type current: list
+    :param policies: The policies, as returned by
+                     :py:meth:``APIModule.process_prune_parameters``.
+    :type policies: list
+    :param append: Whether to keep the existing policies that are not in
+                   ``policies``.
+    :type append: bool
+    :param kwargs: Parameters to substitute in ``endpoint``.
+    :type kwargs: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: A tuple. The first item is the list of the performed operations.
+             The second item is the list of the policy identifiers, in the
+             order of ``policies``. The identifiers of the policies that check
+             mode does not create are ``None``.
+    :rtype: tuple
+    """
+    matches = [find_prune_policy(current, data) for data in policies]
+    kept = set(p.get("uuid") for p in matches if p)
+    actions = []
+    if not append:
+        for policy in current:
+            if policy.get("uuid") in kept:
+                continue
+            module.delete(
+                policy,
+                "auto-pruning policy",
+                policy.get("method"),
+                endpoint + "{uuid}",
+                auto_exit=False,
+                exit_on_error=False,
+                uuid=policy.get("uuid", ""),
+                **kwargs
+            )
+            actions.append("delete auto-pruning policy " + prune_policy_label(policy))
+
+    ids = []
+    for data, policy in zip(policies, matches):
+        if policy:
+            ids.append(policy.get("uuid"))
+            continue
+        resp = module.create(
+            "auto-pruning policy",
+            data["method"],
+            endpoint,
+            data,
+            auto_exit=False,
+            exit_on_error=False,
+            **kwargs
+        )
+        ids.append(resp.get("uuid") if resp else None)
+        actions.append("create auto-pruning policy " + prune_policy_label(data))
+    return actions, ids
+
+
+def apply_immutability_policy(
+    module, endpoint, policy_details, tag_pattern, behavior=None, **kwargs
+):
+    """Create or update a tag immutability policy.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param endpoint: The ``immutabilitypolicy/`` endpoint of the organization
+                     or the repository.
+    :type endpoint: str
+    :param policy_details: The policy returned by the API, or ``None`` to
+                           create the policy. When the tag pattern of that
+                           policy differs from ``tag_pattern``, the function
+                           renames the policy.
+    :type policy_details: dict
+    :param tag_pattern: The tag pattern of the policy.
+    :type tag_pattern: str
+    :param behavior: ``matching_immutable`` or ``not_matching_immutable``.
+                     ``None`` keeps the behavior of the existing policy.
+    :type behavior: str
+    :param kwargs: Parameters to substitute in ``endpoint``.
+    :type kwargs: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    if policy_details:
+        if behavior is not None:
+            matches = behavior == "matching_immutable"
+        else:
+            matches = policy_details.get("tagPatternMatches", True)
+        updated, _not_used = module.update(
+            policy_details,
+            "immutability policy",
+            tag_pattern,
+            endpoint + "{id}",
+            {"tagPattern": tag_pattern, "tagPatternMatches": matches},
+            auto_exit=False,
+            exit_on_error=False,
+            id=policy_details.get("uuid", ""),
+            **kwargs
+        )
+        return ["update immutability policy {p}".format(p=tag_pattern)] if updated else []
+
+    module.create(
+        "immutability policy",
+        tag_pattern,
+        endpoint,
+        {
+            "tagPattern": tag_pattern,
+            "tagPatternMatches": behavior != "not_matching_immutable",
+        },
+        auto_exit=False,
+        exit_on_error=False,
+        **kwargs
+    )
+    return ["create immutability policy {p}".format(p=tag_pattern)]
+
+
+def apply_proxy_cache(
+    module,
+    organization,
+    cache_details,
+    registry,
+    username=None,
+    password=None,
+    insecure=None,
+    expiration=None,
+):
+    """Configure the proxy cache of an organization.
+
+    The API cannot update a proxy cache configuration. The function deletes
+    and then creates the configuration.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param cache_details: The configuration returned by the API, or ``None``.
+    :type cache_details: dict
+    :param registry: The upstream registry.
+    :type registry: str
+    :param username: The user account for the upstream registry.
+    :type username: str
+    :param password: The password for the upstream registry.
+    :type password: str
+    :param insecure: Whether to skip the TLS verification of the registry.
+    :type insecure: bool
+    :param expiration: Expiration of the cached images, in seconds. ``None``
+                       keeps the existing expiration, or sets one day for a
+                       new configuration.
+    :type expiration: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    if (
+        cache_details
+        and username is None
+        and password is None
+        and registry == cache_details.get("upstream_registry")
+        and (insecure is None or insecure == cache_details.get("insecure"))
+        and (expiration is None or expiration == cache_details.get("expiration_s"))
+    ):
+        return []
+
+    actions = []
+    if cache_details and cache_details.get("upstream_registry"):
+        module.delete(
+            cache_details,
+            "proxy cache",
+            organization,
+            "organization/{orgname}/proxycache",
+            auto_exit=False,
+            exit_on_error=False,
+            orgname=organization,
+        )
+        actions.append("delete proxy cache")
+
+    new_fields = {
+        "org_name": organization,
+        "expiration_s": expiration if expiration is not None else 86400,
+        "insecure": insecure if insecure is not None else False,
+        "upstream_registry": registry,
+        "upstream_registry_username": username if username else None,
+        "upstream_registry_password": password if password else None,
+    }
+    module.create(
+        "proxy cache",
+        organization,
+        "organization/{orgname}/proxycache",
+        new_fields,
+        auto_exit=False,
+        exit_on_error=False,
+        orgname=organization,
+    )
+    actions.append("create proxy cache")
+    return actions
+
+
+def apply_robot(
+    module, name, path_url, robot_details, description=None, federations=None, append=True
+):
+    """Create a robot account and set its federations.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param name: The full name of the robot account (``namespace+shortname``).
+    :type name: str
+    :param path_url: The API endpoint of the robot account.
+    :type path_url: str
+    :param robot_details: The robot account returned by the API, or ``None``
+                          if the account does not exist.
+    :type robot_details: dict
+    :param description: Description of a new robot account.
+    :type description: str
+    :param federations: The federations, as dictionaries with the ``issuer``
+                        and ``subject`` keys. ``None`` keeps the federations
+                        of an existing robot account.
+    :type federations: list
+    :param append: Whether to keep the existing federations that are not in
+                   ``federations``.
+    :type append: bool
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: A tuple. The first item is the list of the performed operations.
+             The second item is the robot account returned by the API.
+    :rtype: tuple
+    """
+    fed_url = "{url}/federation".format(url=path_url)
+    fed_req_set = (
+        set([(f.get("issuer"), f.get("subject")) for f in federations])
+        if federations
+        else set()
+    )
+
+    actions = []
+    if robot_details:
+        if federations is None:
+            return actions, robot_details
+        fed_details = module.get_object_path(fed_url, exit_on_error=False)
+        fed_curr_set = (
+            set([(f.get("issuer"), f.get("subject")) for f in fed_details])
+            if fed_details
+            else set()
+        )
+        if fed_req_set == fed_curr_set or (append and not fed_req_set - fed_curr_set):
+            return actions, robot_details
+        if append:
+            fed_req_set |= fed_curr_set
+        robot_data = robot_details
+    else:
+        robot_data = module.unconditional_update(
+            "robot account",
+            name,
+            path_url,
+            {"description": description} if description else {},
+            exit_on_error=False,
+        )
+        actions.append("create robot account")
+        if not federations:
+            return actions, robot_data
+
+    new_fields = [
+        {"issuer": f[0], "subject": f[1], "isExpanded": False} for f in sorted(fed_req_set)
+    ]
+    module.create(
+        "robot account federation",
+        name,
+        fed_url,
+        json.dumps(new_fields).encode(),
+        auto_exit=False,
+        exit_on_error=False,
+    )
+    actions.append("set federations")
+    return actions, robot_data
+
+
+def apply_team(
+    module,
+    organization,
+    name,
+    team_details,
+    role=None,
+    description=None,
+    members=None,
+    append=True,
+    known_accounts=(),
+):
+    """Create or update a team and set its members.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param name: Name of the team.
+    :type name: str
+    :param team_details: The team returned by the API, or ``None`` if the team
+                         does not exist.
+    :type team_details: dict
+    :param role: Role of the team in the organization. ``None`` keeps the
+                 role of an existing team.
+    :type role: str
+    :param description: Description of the team.
+    :type description: str
+    :param members: The user and robot accounts to add to the team.
+    :type members: list
+    :param append: Whether to keep the existing members that are not in
+                   ``members``.
+    :type append: bool
+    :param known_accounts: Accounts to consider as existing without
+                           verifying them, such as the accounts that the
+                           caller creates.
+    :type known_accounts: set
+
+    :raises APIModuleError: An API error occurred, or an account to add does
+                            not exist.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    new_fields = {"name": name}
+    if description is not None:
+        new_fields["description"] = description
+    # The role attribute is mandatory
+    if role:
+        new_fields["role"] = role
+    elif team_details:
+        new_fields["role"] = team_details.get("role", "member")
+    else:
+        new_fields["role"] = "member"
+
+    actions = []
+    # Same PUT request for creating or updating the object
+    updated, _not_used = module.update(
+        team_details,
+        "team",
+        name,
+        "organization/{orgname}/team/{teamname}",
+        new_fields,
+        auto_exit=False,
+        exit_on_error=False,
+        orgname=organization,
+        teamname=name,
+    )
+    if updated:
+        actions.append("update team" if team_details else "create team")
+
+    team_members = module.get_object_path(
+        "organization/{orgname}/team/{teamname}/members",
+        query_params={"includePending": True},
+        exit_on_error=False,
+        orgname=organization,
+        teamname=name,
+    )
+    current_members = set(
+        [u["name"] for u in (team_members or {}).get("members", []) if "name" in u]
+    )
+    new_members = set(members or [])
+    to_add = new_members - current_members
+    to_delete = set() if append else current_members - new_members
+
+    accounts_not_found = [
+        member
+        for member in sorted(to_add)
+        if member not in known_accounts
+        and module.get_account(member, exit_on_error=False) is None
+    ]
+    if accounts_not_found:
+        raise APIModuleError(
+            "At least one user to add as team member does not exist: {users}.".format(
+                users=", ".join(accounts_not_found)
+            )
+        )
+
+    for member in sorted(to_add):
+        module.unconditional_update(
+            "team member",
+            member,
+            "organization/{orgname}/team/{teamname}/members/{member}",
+            {},
+            exit_on_error=False,
+            orgname=organization,
+            teamname=name,
+            member=member,
+        )
+        actions.append("add member {m}".format(m=member))
+    for member in sorted(to_delete):
+        module.delete(
+            True,
+            "team member",
+            member,
+            "organization/{orgname}/team/{teamname}/members/{member}",
+            auto_exit=False,
+            exit_on_error=False,
+            orgname=organization,
+            teamname=name,
+            member=member,
+        )
+        actions.append("remove member {m}".format(m=member))
+    return actions
+
+
+def find_prototype(prototypes, name, kind, creator, excluded_ids=None):
+    """Return the prototype that matches the given delegate and creator.
+
+    :param prototypes: The prototypes returned by the API.
+    :type prototypes: list
+    :param name: The name of the user, robot, or team (delegate).
+    :type name: str
+    :param kind: The type of the delegate (``user`` or ``team``).
+    :type kind: str
+    :param creator: The name of the user who creates the repositories, or
+                    ``None``.
+    :type creator: str
+    :param excluded_ids: Identifiers of the prototypes to ignore.
+    :type excluded_ids: set
+
+    :return: The matching prototype, or ``None`` if no prototype matches.
+    :rtype: dict
+    """
+    for proto in prototypes:
+        if excluded_ids and proto.get("id") in excluded_ids:
+            continue
+        # Delegate section does not match
+        if (
+            "delegate" not in proto
+            or not proto["delegate"]
+            or proto["delegate"].get("name") != name
+            or proto["delegate"].get("kind") != kind
+        ):
+            continue
+        # User provides the `creator' parameter but the prototype does not
+        # have a matching `activating_user' key, or it does not match.
+        if creator and (
+            "activating_user" not in proto
+            or not proto["activating_user"]
+            or proto["activating_user"].get("name") != creator
+        ):
+            continue
+        # User does not provide the `creator' parameter but the prototype
+        # has an `activating_user' key. No match
+        if (
+            not creator
+            and "activating_user" in proto
+            and proto["activating_user"]
+            and proto["activating_user"].get("name")
+        ):
+            continue
+        return proto
+    return None
+
+
+def describe_prototype(proto):
+    """Return a short description of a prototype returned by the API.
+
+    :param proto: The prototype returned by the API.
+    :type proto: dict
+
+    :return: A dictionary with the ``name``, ``type``, ``role``, and
+             ``creator`` keys.
+    :rtype: dict
+    """
+    delegate = proto.get("delegate") or {}
+    activating_user = proto.get("activating_user") or {}
+    return {
+        "name": delegate.get("name"),
+        "type": delegate.get("kind"),
+        "role": proto.get("role"),
+        "creator": activating_user.get("name"),
+    }
+
+
+def verify_default_perm_accounts(
+    module,
+    organization,
+    org_details,
+    permissions,
+    concurrency=1,
+    known_accounts=(),
+    known_teams=(),
+):
+    """Verify that the users, robots, and teams of new permissions exist.
+
+    The function retrieves the robot accounts and the members of the
+    organization in two requests, and then only searches individually for the
+    accounts that are not in these lists.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: The organization name.
+    :type organization: str
+    :param org_details: The organization details returned by the API. The
+                        dictionary includes the teams of the organization.
+    :type org_details: dict
+    :param permissions: The permissions to create.
+    :type permissions: list
+    :param concurrency: Maximum number of API requests to run in parallel.
+    :type concurrency: int
+    :param known_accounts: Accounts to consider as existing without
+                           verifying them.
+    :type known_accounts: set
+    :param known_teams: Teams to consider as existing without verifying
+                        them.
+    :type known_teams: set
+
+    :raises APIModuleError: An API error occurred, or an account does not
+                            exist.
+    """
+    teams = org_details.get("teams") or {}
+    users = set()
+    creators = set()
+    for perm in permissions:
+        if perm["type"] == "team":
+            if perm["name"] not in teams and perm["name"] not in known_teams:
+                raise APIModuleError(
+                    "The {team} team does not exist in the {orgname} organization.".format(
+                        team=perm["name"], orgname=organization
+                    )
+                )
+        elif perm["name"] not in known_accounts:
+            users.add(perm["name"])
+        creator = perm.get("creator")
+        if creator and creator in known_accounts and "+" in creator:
+            raise APIModuleError(
+                (
+                    "Robot accounts cannot be used for `creator':"
+                    " {user} must be a user account."
+                ).format(user=creator)
+            )
+        if creator and creator not in known_accounts:
+            creators.add(creator)
+    if not users and not creators:
+        return
+
+    try:
+        robots = module.get_object_path(
+            "organization/{orgname}/robots",
+            query_params={"permissions": False, "token": False},
+            exit_on_error=False,
+            orgname=organization,
+        )
+        members = module.get_object_path(
+            "organization/{orgname}/members", exit_on_error=False, orgname=organization
+        )
+    except APIModuleError:
+        robots = members = None
+    robot_names = set(r.get("name") for r in robots.get("robots", [])) if robots else set()
+    member_names = (
+        set(m.get("name") for m in members.get("members", []) if not m.get("is_robot"))
+        if members
+        else set()
+    )
+
+    unknown = sorted((users - robot_names - member_names) | (creators - member_names))
+
+    def get_account(name):
+        return module.get_account(name, exit_on_error=False)
+
+    accounts = dict(zip(unknown, module.run_concurrently(get_account, unknown, concurrency)))
+
+    for name in sorted(users):
+        if name not in robot_names and name not in member_names and not accounts.get(name):
+            raise APIModuleError(
+                "The {user} user or robot account does not exist.".format(user=name)
+            )
+    for name in sorted(creators):
+        if name in member_names:
+            continue
+        if name in robot_names or (accounts.get(name) or {}).get("is_robot"):
+            raise APIModuleError(
+                (
+                    "Robot accounts cannot be used for `creator':"
+                    " {user} must be a user account."
+                ).format(user=name)
+            )
+        if not accounts.get(name):
+            raise APIModuleError("The {user} user account does not exist.".format(user=name))
+
+
+def apply_default_perms(
+    module,
+    organization,
+    org_details,
+    prototypes,
+    permissions,
+    append=True,
+    concurrency=1,
+    known_accounts=(),
+    known_teams=(),
+):
+    """Create, update, and delete the default permissions of an organization.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: The organization name.
+    :type organization: str
+    :param org_details: The organization details returned by the API.
+    :type org_details: dict
+    :param prototypes: The existing default permissions (prototypes), as
+                       returned by the API.
+    :type prototypes: list
+    :param permissions: The requested default permissions, as dictionaries
+                        with the ``name``, ``type``, ``role``, and
+                        ``creator`` keys. Without a role, the function keeps
+                        the role of an existing default permission, or uses
+                        ``read`` for a new one.
+    :type permissions: list
+    :param append: Whether to keep the default permissions that are not in
+                   ``permissions``.
+    :type append: bool
+    :param concurrency: Maximum number of API requests to run in parallel.
+    :type concurrency: int
+    :param known_accounts: Accounts to consider as existing without
+                           verifying them.
+    :type known_accounts: set
+    :param known_teams: Teams to consider as existing without verifying
+                        them.
+    :type known_teams: set
+
+    :raises APIModuleError: An API error occurred, or an account does not
+                            exist.
+
+    :return: A tuple. The first item is the list of the performed operations.
+             The second item is a dictionary with the ``created``,
+             ``updated``, and ``deleted`` keys, which list the descriptions of
+             the default permissions. See :py:func:``describe_prototype``.
+    :rtype: tuple
+    """
+    requested = {}
+    for perm in permissions:
+        requested[(perm["name"], perm.get("type") or "user", perm.get("creator") or None)] = (
+            perm
+        )
+
+    matched_ids = set()
+    to_create = []
+    to_update = []
+    for (name, kind, creator), perm in requested.items():
+        proto = find_prototype(prototypes, name, kind, creator, matched_ids)
+        if proto is None:
+            to_create.append(
+                {
+                    "name": name,
+                    "type": kind,
+                    "role": perm.get("role") or "read",
+                    "creator": creator,
+                }
+            )
+            continue
+        matched_ids.add(proto.get("id"))
+        if perm.get("role") and perm["role"] != proto.get("role"):
+            to_update.append((proto, perm["role"]))
+    to_delete = []
+    if not append:
+        to_delete = [p for p in prototypes if p.get("id") not in matched_ids]
+
+    verify_default_perm_accounts(
+        module,
+        organization,
+        org_details,
+        to_create,
+        concurrency,
+        known_accounts,
+        known_teams,
+    )
+
+    def create_prototype(perm):
+        new_fields = {
+            "delegate": {"name": perm["name"], "kind": perm["type"]},
+            "role": perm["role"],
+        }
+        if perm["creator"]:
+            new_fields["activating_user"] = {"name": perm["creator"]}
+        module.create(
+            "default permission",
+            perm["name"],
+            "organization/{orgname}/prototypes",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+            orgname=organization,
+        )
+
+    def update_prototype(operation):
+        proto, role = operation
+        module.unconditional_update(
+            "default permission",
+            (proto.get("delegate") or {}).get("name"),
+            "organization/{orgname}/prototypes/{uuid}",
+            {"role": role},
+            exit_on_error=False,
+            orgname=organization,
+            uuid=proto.get("id", ""),
+        )
+
+    def delete_prototype(proto):
+        module.delete(
+            proto,
+            "default permission",
+            (proto.get("delegate") or {}).get("name"),
+            "organization/{orgname}/prototypes/{uuid}",
+            auto_exit=False,
+            exit_on_error=False,
+            orgname=organization,
+            uuid=proto.get("id", ""),
+        )
+
+    module.run_concurrently(delete_prototype, to_delete, concurrency)
+    module.run_concurrently(update_prototype, to_update, concurrency)
+    module.run_concurrently(create_prototype, to_create, concurrency)
+
+    changes = {"created": to_create, "updated": [], "deleted": []}
+    actions = []
+    for proto in to_delete:
+        desc = describe_prototype(proto)
+        changes["deleted"].append(desc)
+        actions.append("delete {type} {name}".format(**desc))
+    for proto, role in to_update:
+        desc = describe_prototype(proto)
+        desc["role"] = role
+        changes["updated"].append(desc)
+        actions.append("update {type} {name} to {role}".format(**desc))
+    for perm in to_create:
+        actions.append(
+            "create {type} {name} {role}{creator}".format(
+                type=perm["type"],
+                name=perm["name"],
+                role=perm["role"],
+                creator=" for {c}".format(c=perm["creator"]) if perm["creator"] else "",
+            )
+        )
+    return actions, changes
+
+
+def apply_application(
+    module,
+    organization,
+    name,
+    app_details,
+    description=None,
+    application_uri=None,
+    redirect_uri=None,
+    avatar_email=None,
+):
+    """Create or update an OAuth application.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param name: Name of the application.
+    :type name: str
+    :param app_details: The application returned by the API, or ``None`` to
+                        create the application. When the name of that
+                        application differs from ``name``, the function
+                        renames the application.
+    :type app_details: dict
+    :param description: Description of the application.
+    :type description: str
+    :param application_uri: URL of the application home page.
+    :type application_uri: str
+    :param redirect_uri: Prefix of the application OAuth redirection URL.
+    :type redirect_uri: str
+    :param avatar_email: Email address that represents the avatar.
+    :type avatar_email: str
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: A tuple. The first item is the list of the performed operations.
+             The second item is the application returned by the API.
+    :rtype: tuple
+    """
+    new_fields = {"name": name}
+    if description is not None:
+        new_fields["description"] = description
+    if application_uri is not None:
+        new_fields["application_uri"] = application_uri
+    elif app_details:
+        new_fields["application_uri"] = app_details.get("application_uri", "")
+    if redirect_uri is not None:
+        new_fields["redirect_uri"] = redirect_uri
+    elif app_details:
+        new_fields["redirect_uri"] = app_details.get("redirect_uri", "")
+    if avatar_email is not None:
+        new_fields["avatar_email"] = avatar_email
+    # The avatar_email attribute that the API returns might be None
+    elif app_details and app_details.get("avatar_email"):
+        new_fields["avatar_email"] = app_details["avatar_email"]
+
+    if app_details:
+        updated, data = module.update(
+            app_details,
+            "application",
+            name,
+            "organization/{orgname}/applications/{id}",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+            orgname=organization,
+            id=app_details.get("client_id", ""),
+        )
+        if not updated:
+            return [], app_details
+        return ["update application"], data
+
+    data = module.create(
+        "application",
+        name,
+        "organization/{orgname}/applications",
+        new_fields,
+        auto_exit=False,
+        exit_on_error=False,
+        orgname=organization,
+    )
+    return ["create application"], data
+
+
+def apply_repository(
+    module,
+    namespace,
+    shortname,
+    repo_details,
+    description=None,
+    visibility=None,
+    repo_state=None,
+):
+    """Create or update a repository.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param namespace: The organization or personal namespace.
+    :type namespace: str
+    :param shortname: The name of the repository, without the namespace.
+    :type shortname: str
+    :param repo_details: The repository returned by the API, or ``None`` if
+                         the repository does not exist.
+    :type repo_details: dict
+    :param description: Description of the repository.
+    :type description: str
+    :param visibility: ``public`` or ``private``.
+    :type visibility: str
+    :param repo_state: ``NORMAL``, ``READ_ONLY``, or ``MIRROR``.
+    :type repo_state: str
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    full_repo_name = "{namespace}/{repository}".format(
+        namespace=namespace, repository=shortname
+    )
+
+    actions = []
+    if not repo_details:
+        new_fields = {
+            "namespace": namespace,
+            "repository": shortname,
+            "repo_kind": "image",
+            "description": description if description else "",
+            "visibility": visibility if visibility else "private",
+        }
+        module.create(
+            "repository",
+            full_repo_name,
+            "repository",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+        )
+        actions.append("create repository")
+    else:
+        if description is not None:
+            updated, _not_used = module.update(
+                repo_details,
+                "repository",
+                full_repo_name,
+                "repository/{full_repo_name}",
+                {"description": description},
+                auto_exit=False,
+                exit_on_error=False,
+                full_repo_name=full_repo_name,
+            )
+            if updated:
+                actions.append("update description")
+        if (
+            visibility
+            and "is_public" in repo_details
+            and bool(repo_details["is_public"]) != (visibility == "public")
+        ):
+            module.create(
+                "repository",
+                full_repo_name,
+                "repository/{full_repo_name}/changevisibility",
+                {"visibility": visibility},
+                auto_exit=False,
+                exit_on_error=False,
+                full_repo_name=full_repo_name,
+            )
+            actions.append("set visibility to {v}".format(v=visibility))
+
+    if repo_state is not None and (
+        not repo_details
+        and repo_state != "NORMAL"
+        or repo_details
+        and repo_details.get("state") != repo_state
+    ):
+        module.unconditional_update(
+            "repository",
+            full_repo_name,
+            "repository/{full_repo_name}/changestate",
+            {"state": repo_state},
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+        )
+        actions.append("set state to {s}".format(s=repo_state))
+    return actions
+
+
+def apply_repository_perms(module, full_repo_name, kind, perms, append=True, known_names=()):
+    """Set the user or team permissions of a repository.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param full_repo_name: The repository name, with the namespace.
+    :type full_repo_name: str
+    :param kind: ``user`` or ``team``.
+    :type kind: str
+    :param perms: The permissions of that kind, as (name, role) tuples.
+    :type perms: set
+    :param append: Whether to keep the existing permissions that are not in
+                   ``perms``.
+    :type append: bool
+    :param known_names: Accounts or teams to consider as existing without
+                        verifying them.
+    :type known_names: set
+
+    :raises APIModuleError: An API error occurred, or an account or a team
+                            does not exist.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    if not perms and append:
+        return []
+    resp = module.get_object_path(
+        "repository/{full_repo_name}/permissions/{kind}/",
+        exit_on_error=False,
+        full_repo_name=full_repo_name,
+        kind=kind,
+    )
+    current = set(
+        [(p["name"], p["role"]) for p in (resp or {}).get("permissions", {}).values()]
+    )
+    to_add = perms - current
+    to_delete = set() if append else current - perms
+
+    names = sorted(set([p[0] for p in to_add if p[0] not in known_names]))
+    if kind == "team":
+        namespace = full_repo_name.split("/", 1)[0]
+        not_found = [
+            n for n in names if module.get_team(namespace, n, exit_on_error=False) is None
+        ]
+        msg = "At least one team to associate to the repository does not exist: {names}."
+    else:
+        not_found = [n for n in names if module.get_account(n, exit_on_error=False) is None]
+        msg = "At least one user to add as team member does not exist: {names}."
+    if not_found:
+        raise APIModuleError(msg.format(names=", ".join(not_found)))
+
+    actions = []
+    for name, role in sorted(to_delete):
+        module.delete(
+            True,
+            "{kind} repository permission".format(kind=kind),
+            name,
+            "repository/{full_repo_name}/permissions/{kind}/{name}",
+            auto_exit=False,
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            kind=kind,
+            name=name,
+        )
+        actions.append(
+            "revoke {role} from {kind} {name}".format(role=role, kind=kind, name=name)
+        )
+    for name, role in sorted(to_add):
+        module.unconditional_update(
+            "{kind} repository permission".format(kind=kind),
+            name,
+            "repository/{full_repo_name}/permissions/{kind}/{name}",
+            {"role": role},
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            kind=kind,
+            name=name,
+        )
+        actions.append(
+            "grant {role} to {kind} {name}".format(role=role, kind=kind, name=name)
+        )
+    return actions
+
+
+def apply_quota(
+    module, organization, quota_details, quota_bytes=None, warning_pct=None, reject_pct=None
+):
+    """Set the quota of an organization and its limits.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param quota_details: The quota returned by the API (the first item of
+                          the ``quotas`` list of the organization), or an
+                          empty dictionary.
+    :type quota_details: dict
+    :param quota_bytes: The quota size in bytes, or ``None`` to keep the
+                        existing quota.
+    :type quota_bytes: int
+    :param warning_pct: Warning limit as a percentage of the quota. ``0``
+                        removes the limit.
+    :type warning_pct: int
+    :param reject_pct: Reject limit as a percentage of the quota. ``0``
+                       removes the limit.
+    :type reject_pct: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    # Quay requires a quota for setting limits
+    if (
+        quota_bytes is None
+        and not quota_details
+        and (warning_pct is not None or reject_pct is not None)
+    ):
+        quota_bytes = module.str_size_to_bytes("quota", "8000000 TB")
+
+    actions = []
+    if quota_bytes is not None:
+        if quota_details:
+            updated, _not_used = module.update(
+                quota_details,
+                "quota",
+                organization,
+                "organization/{orgname}/quota/{qid}",
+                {"limit_bytes": quota_bytes},
+                auto_exit=False,
+                exit_on_error=False,
+                orgname=organization,
+                qid=str(quota_details.get("id", 0)),
+            )
+            if updated:
+                actions.append("update quota")
+        else:
+            module.create(
+                "quota",
+                organization,
+                "organization/{orgname}/quota",
+                {"limit_bytes": quota_bytes},
+                auto_exit=False,
+                exit_on_error=False,
+                orgname=organization,
+            )
+            actions.append("create quota")
+            if module.check_mode:
+                # The limits depend on the ID of the new quota, which does not
+                # exist in check mode
+                for pct, label in ((warning_pct, "warning"), (reject_pct, "reject")):
+                    if pct:
+                        actions.append(
+                            "set {label} limit to {pct}%".format(label=label, pct=pct)
+                        )
+                return actions
+            obj = module.get_object_path(
+                "organization/{orgname}/quota", exit_on_error=False, orgname=organization
+            )
+            if not obj:
+                raise APIModuleError(
+                    "Cannot retrieve the new quota for the {org} organization.".format(
+                        org=organization
+                    )
+                )
+            quota_details = obj[0]
+
+    qid = str(quota_details.get("id", 0))
+    current = {}
+    for limit in quota_details.get("limits", []):
+        current[limit.get("type")] = (str(limit.get("id")), limit.get("limit_percent"))
+
+    for pct, limit_type in ((warning_pct, "Warning"), (reject_pct, "Reject")):
+        lid, current_pct = current.get(limit_type, (None, None))
+        label = limit_type.lower()
+        if pct == 0:
+            if module.delete(
+                lid,
+                "{label} limit".format(label=label),
+                organization,
+                "organization/{orgname}/quota/{qid}/limit/{lid}",
+                auto_exit=False,
+                exit_on_error=False,
+                orgname=organization,
+                qid=qid,
+                lid=lid,
+            ):
+                actions.append("remove {label} limit".format(label=label))
+        elif pct and pct != current_pct:
+            new_fields = {"type": limit_type, "threshold_percent": pct}
+            if lid is None:
+                module.create(
+                    "{label} limit".format(label=label),
+                    organization,
+                    "organization/{orgname}/quota/{qid}/limit",
+                    new_fields,
+                    auto_exit=False,
+                    exit_on_error=False,
+                    orgname=organization,
+                    qid=qid,
+                )
+            else:
+                module.unconditional_update(
+                    "{label} limit".format(label=label),
+                    organization,
+                    "organization/{orgname}/quota/{qid}/limit/{lid}",
+                    new_fields,
+                    exit_on_error=False,
+                    orgname=organization,
+                    qid=qid,
+                    lid=lid,
+                )
+            actions.append("set {label} limit to {pct}%".format(label=label, pct=pct))
+    return actions
@@ -145,7 +145,8 @@ client_secret:
   sample: JBVXLG8XS7UCV1NFKDYPSNGJ4BUESU03GI5OXS2X
  """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_application
 
 
 def exit_module(module, changed, data):
@@ -259,102 +260,25 @@ def main():
                 id=app_details.get("client_id", "") if app_details else "",
             )
 
-    # Prepare the data that gets set for update or create
-    new_fields = {}
-    if description is not None:
-        new_fields["description"] = description
-
-    if application_uri is not None:
-        new_fields["application_uri"] = application_uri
-    elif new_app_details:
-        new_fields["application_uri"] = new_app_details.get("application_uri", "")
-    elif app_details:
-        new_fields["application_uri"] = app_details.get("application_uri", "")
-
-    if redirect_uri is not None:
-        new_fields["redirect_uri"] = redirect_uri
-    elif new_app_details:
-        new_fields["redirect_uri"] = new_app_details.get("redirect_uri", "")
-    elif app_details:
-        new_fields["redirect_uri"] = app_details.get("redirect_uri", "")
-
-    if avatar_email is not None:
-        new_fields["avatar_email"] = avatar_email
-    elif new_app_details:
-        # The avatar_email attribute that the API returns might be None
-        if "avatar_email" in new_app_details and new_app_details["avatar_email"]:
-            new_fields["avatar_email"] = new_app_details["avatar_email"]
-    elif app_details:
-        if "avatar_email" in app_details and app_details["avatar_email"]:
-            new_fields["avatar_email"] = app_details["avatar_email"]
-
-    # Renaming the application
-    if new_name:
-        new_fields["name"] = new_name
-        # The original application does not exists...
-        if not app_details:
-            # and neither the new application. Create that new application.
-            if not new_app_details:
-                data = module.create(
-                    "application",
-                    new_name,
-                    "organization/{orgname}/applications",
-                    new_fields,
-                    auto_exit=False,
-                    orgname=organization,
-                )
-                exit_module(module, True, data)
-
-            # The original application does not exists but the new one does.
-            # Update that new application.
-            updated, data = module.update(
-                new_app_details,
-                "application",
-                new_name,
-                "organization/{orgname}/applications/{id}",
-                new_fields,
-                auto_exit=False,
-                orgname=organization,
-                id=new_app_details.get("client_id", ""),
-            )
-            exit_module(module, updated, data if updated else new_app_details)
-        # The original application exists. Rename it.
-        updated, data = module.update(
+    # With new_name, rename the original application, or update the new
+    # application when the original one does not exist. Otherwise, create the
+    # application.
+    if new_name and not app_details:
+        app_details = new_app_details
+    try:
+        actions, data = apply_application(
+            module,
+            organization,
+            new_name or name,
             app_details,
-            "application",
-            new_name,
-            "organization/{orgname}/applications/{id}",
-            new_fields,
-            auto_exit=False,
-            orgname=organization,
-            id=app_details.get("client_id", ""),
+            description,
+            application_uri,
+            redirect_uri,
+            avatar_email,
         )
-        exit_module(module, updated, data if updated else app_details)
-
-    new_fields["name"] = name
-
-    if app_details:
-        updated, data = module.update(
-            app_details,
-            "application",
-            name,
-            "organization/{orgname}/applications/{id}",
-            new_fields,
-            auto_exit=False,
-            orgname=organization,
-            id=app_details.get("client_id", ""),
-        )
-        exit_module(module, updated, data if updated else app_details)
-
-    data = module.create(
-        "application",
-        name,
-        "organization/{orgname}/applications",
-        new_fields,
-        auto_exit=False,
-        orgname=organization,
-    )
-    exit_module(module, True, data)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    exit_module(module, bool(actions), data)
 
 
 if __name__ == "__main__":
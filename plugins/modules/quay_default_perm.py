@@ -44,7 +44,7 @@ options:
       - Name of the user or team that gets permission to new created
         repositories in the organization.
       - For robot accounts use the C(namespace)+C(shortrobotname) format.
-    required: true
+      - Mutually exclusive with O(permissions).
     type: str
   type:
     description:
@@ -71,6 +71,58 @@ options:
       - You cannot use robot accounts or teams for the O(creator) parameter.
         You can only use regular user accounts.
     type: str
+  permissions:
+    description:
+      - Complete list of the default permissions for the organization.
+      - The module retrieves the existing default permissions only once,
+        verifies all the user accounts, robot accounts, and teams with a few
+        requests, and then creates, updates, or deletes only the default
+        permissions that differ.
+      - The O(name), O(type), O(role), O(creator), and O(state) parameters are
+        ignored when you use O(permissions).
+      - Mutually exclusive with O(name).
+    type: list
+    elements: dict
+    version_added: '2.9.0'
+    suboptions:
+      name:
+        description:
+          - Name of the user or team that gets permission to new created
+            repositories in the organization.
+          - For robot accounts use the C(namespace)+C(shortrobotname) format.
+        required: true
+        type: str
+      type:
+        description:
+          - Type of the account defined in O(permissions[].name). Choose
+            V(user) for both user and robot accounts.
+        type: str
+        choices: [user, team]
+        default: user
+      role:
+        description:
+          - Permission that Quay automatically grants to the user or team on
+            new created repositories in the organization.
+          - If you do not provide that parameter, then the module uses V(read)
+            for new default permissions and does not change the role of
+            existing default permissions.
+        type: str
+        choices: [read, write, admin]
+      creator:
+        description:
+          - Quay applies the default permission only when repositories are
+            created by the user that you define in O(permissions[].creator).
+        type: str
+  append:
+    description:
+      - Only used with the O(permissions) parameter.
+      - If V(true), then the module keeps the existing default permissions
+        that are not listed in O(permissions).
+      - If V(false), then the module deletes the default permissions that are
+        not listed in O(permissions).
+    type: bool
+    default: true
+    version_added: '2.9.0'
   state:
     description:
       - If V(absent), then the module deletes the default permission.
@@ -96,6 +148,7 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
 """
 
 EXAMPLES = r"""
@@ -148,25 +201,111 @@ EXAMPLES = r"""
     state: absent
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Ensure the organization only has the following default permissions
+  infra.quay_configuration.quay_default_perm:
+    organization: production
+    permissions:
+      - name: lvasquez
+        role: admin
+      - name: production+automationrobot
+        role: write
+      - name: managers
+        type: team
+        role: read
+        creator: dwilde
+    append: false
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 """
 
-RETURN = r""" # """
+RETURN = r"""
+created:
+  description: Default permissions that the module created.
+  returned: when you use the O(permissions) parameter
+  type: list
+  elements: dict
+  sample: [{"name": "lvasquez", "type": "user", "role": "admin", "creator": null}]
+updated:
+  description: Default permissions for which the module changed the role.
+  returned: when you use the O(permissions) parameter
+  type: list
+  elements: dict
+  sample: [{"name": "managers", "type": "team", "role": "read", "creator": "dwilde"}]
+deleted:
+  description: Default permissions that the module deleted.
+  returned: when you use the O(permissions) parameter
+  type: list
+  elements: dict
+  sample: [{"name": "developers", "type": "team", "role": "write", "creator": null}]
+"""
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_default_perms, find_prototype
+
+
+def manage_permissions(module, organization, org_details, permissions, append, concurrency):
+    """Reconcile the default permissions of the organization and exit.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: The organization name.
+    :type organization: str
+    :param org_details: The organization details returned by the API.
+    :type org_details: dict
+    :param permissions: The requested default permissions.
+    :type permissions: list
+    :param append: Whether to keep the default permissions that are not in
+                   the ``permissions`` list.
+    :type append: bool
+    :param concurrency: Maximum number of API requests to run in parallel.
+    :type concurrency: int
+    """
+    all_prototypes_list = module.get_object_path(
+        "organization/{orgname}/prototypes", orgname=organization
+    )
+    prototypes = all_prototypes_list.get("prototypes", []) if all_prototypes_list else []
 
-from ..module_utils.api_module import APIModule
+    # The last entry of duplicated permissions wins. The delegates of the
+    # existing prototypes do not have to be verified.
+    try:
+        actions, changes = apply_default_perms(
+            module, organization, org_details, prototypes, permissions, append, concurrency
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions), **changes)
 
 
 def main():
     argument_spec = dict(
         organization=dict(required=True),
-        name=dict(required=True),
+        name=dict(),
         type=dict(choices=["user", "team"], default="user"),
         role=dict(choices=["read", "write", "admin"]),
         creator=dict(),
+        permissions=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                type=dict(choices=["user", "team"], default="user"),
+                role=dict(choices=["read", "write", "admin"]),
+                creator=dict(),
+            ),
+        ),
+        append=dict(type="bool", default=True),
         state=dict(choices=["present", "absent"], default="present"),
+        concurrency=dict(type="int", default=8),
     )
 
     # Create a module for ourselves
-    module = APIModule(argument_spec=argument_spec, supports_check_mode=True)
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[("name", "permissions")],
+        required_one_of=[("name", "permissions")],
+        supports_check_mode=True,
+    )
 
     # Extract our parameters
     organization = module.params.get("organization")
@@ -174,15 +313,24 @@ def main():
     kind = module.params.get("type")
     role = module.params.get("role")
     creator = module.params.get("creator")
+    permissions = module.params.get("permissions")
+    append = module.params.get("append")
     state = module.params.get("state")
+    concurrency = module.params.get("concurrency")
 
-    if not module.get_organization(organization):
-        if state == "absent":
+    org_details = module.get_organization(organization)
+    if not org_details:
+        if state == "absent" and permissions is None:
             module.exit_json(changed=False)
         module.fail_json(
             msg="The {orgname} organization does not exist.".format(orgname=organization)
         )
 
+    if permissions is not None:
+        manage_permissions(
+            module, organization, org_details, permissions, append, concurrency
+        )
+
     # Get the default permissions (prototypes) for the organization
     #
     # GET /api/v1/organization/{orgname}/prototypes
@@ -255,34 +403,9 @@ def main():
     # Finding a matching prototype
     prototype_details = None
     if all_prototypes_list:
-        for proto in all_prototypes_list.get("prototypes", []):
-            # Delegate section does not match
-            if (
-                "delegate" not in proto
-                or not proto["delegate"]
-                or proto["delegate"].get("name") != name
-                or proto["delegate"].get("kind") != kind
-            ):
-                continue
-            # User provides the `creator' parameter but the prototype does not
-            # have a matching `activating_user' key, or it does not match.
-            if creator and (
-                "activating_user" not in proto
-                or not proto["activating_user"]
-                or proto["activating_user"].get("name") != creator
-            ):
-                continue
-            # User does not provide the `creator' parameter but the prototype
-            # has an `activating_user' key. No match
-            if (
-                not creator
-                and "activating_user" in proto
-                and proto["activating_user"]
-                and proto["activating_user"].get("name")
-            ):
-                continue
-            prototype_details = proto
-            break
+        prototype_details = find_prototype(
+            all_prototypes_list.get("prototypes", []), name, kind, creator
+        )
 
     # Remove the prototype
     if state == "absent":
@@ -295,60 +418,19 @@ def main():
             uuid=prototype_details.get("id", "") if prototype_details else "",
         )
 
-    # Verify that the users and teams exist
-    if kind == "user":
-        if not module.get_account(name):
-            module.fail_json(
-                msg="The {user} user or robot account does not exist.".format(user=name)
-            )
-    elif not module.get_team(organization, name):
-        module.fail_json(
-            msg="The {team} team does not exist in the {orgname} organization.".format(
-                team=name, orgname=organization
-            )
+    # Verify that the user or the team exists, and then create the prototype
+    # or update its role
+    try:
+        actions, _not_used = apply_default_perms(
+            module,
+            organization,
+            org_details,
+            [prototype_details] if prototype_details else [],
+            [dict(name=name, type=kind, role=role, creator=creator)],
         )
-    if creator:
-        user_details = module.get_account(creator)
-        if not user_details:
-            module.fail_json(
-                msg="The {user} user account does not exist.".format(user=creator)
-            )
-        if user_details.get("is_robot"):
-            module.fail_json(
-                msg=(
-                    "Robot accounts cannot be used for `creator':"
-                    " {user} must be a user account."
-                ).format(user=creator)
-            )
-
-    # Create the prototype
-    if not prototype_details:
-        new_fields = {
-            "delegate": {"name": name, "kind": kind},
-            "role": role if role else "read",
-        }
-        if creator:
-            new_fields["activating_user"] = {"name": creator}
-        module.create(
-            "default permission",
-            name,
-            "organization/{orgname}/prototypes",
-            new_fields,
-            orgname=organization,
-        )
-
-    if not role:
-        module.exit_json(changed=False)
-
-    module.update(
-        prototype_details,
-        "default permission",
-        name,
-        "organization/{orgname}/prototypes/{uuid}",
-        {"role": role},
-        orgname=organization,
-        uuid=prototype_details.get("id", ""),
-    )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
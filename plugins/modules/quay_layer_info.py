@@ -40,6 +40,9 @@ options:
       - If you omit the tag and the digest part, then C(latest) is assumed.
     required: true
     type: str
+notes:
+  - When you set the O(cache_dir) parameter, the module keeps the layers of
+    each manifest in the cache indefinitely, because manifests never change.
 attributes:
   check_mode:
     support: full
@@ -52,6 +55,7 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.manifest_cache
 """
 
 EXAMPLES = r"""
@@ -60,6 +64,14 @@ EXAMPLES = r"""
     image: coreos/dpp-aws-toolkit:latest
     quay_host: quay.io
   register: layers
+
+- name: Retrieve the layers of an image and keep them in a local cache
+  infra.quay_configuration.quay_layer_info:
+    image: production/smallimage:v1.0.0
+    cache_dir: /var/cache/quay
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: layers
 """
 
 RETURN = r"""
@@ -142,17 +154,19 @@ layers:
 """
 
 from ..module_utils.api_module import APIModule
+from ..module_utils.manifest_cache import ManifestCache
 from ..module_utils.quay_image import QuayImage
 
 
 def main():
-    argument_spec = dict(image=dict(required=True))
+    argument_spec = dict(image=dict(required=True), cache_dir=dict(type="path"))
 
     # Create a module for ourselves
     module = APIModule(argument_spec=argument_spec, supports_check_mode=True)
 
     # Extract our parameters
     name = module.params.get("image").strip("/:")
+    cache = ManifestCache(module, module.params.get("cache_dir"))
 
     # Get the components of the given image (namespace, repository, tag, digest)
     img = QuayImage(module, name)
@@ -174,17 +188,9 @@ def main():
     if img.digest:
         manifest_digest = img.digest
     else:
-        tags = module.get_tags(namespace, img.repository, img.tag, only_active_tags=False)
-        if not tags:
+        manifest_digest = module.get_tag_digest(namespace, img.repository, img.tag)
+        if not manifest_digest:
             module.exit_json(changed=False, layers=[])
-        try:
-            manifest_digest = tags[0]["manifest_digest"]
-        except KeyError:
-            module.fail_json(
-                msg="Cannot retrieve the manifest digest for the {image} image.".format(
-                    image=name
-                )
-            )
 
     # Get the layers
     #
@@ -291,21 +297,22 @@ def main():
     #     }
     #   ]
     # }
-    images = module.get_object_path(
-        "repository/{namespace}/{repository}/manifest/{manifest_digest}",
-        namespace=namespace,
-        repository=img.repository,
-        manifest_digest=manifest_digest,
-    )
+    layers = cache.get("layers", manifest_digest)
+    if layers is None:
+        images = module.get_object_path(
+            "repository/{namespace}/{repository}/manifest/{manifest_digest}",
+            namespace=namespace,
+            repository=img.repository,
+            manifest_digest=manifest_digest,
+        )
+        if not images:
+            module.exit_json(changed=False, layers=[])
+        layers = images.get("layers") or []
+        cache.set("layers", manifest_digest, layers)
 
     # Sort the layers in reverse sort index
     module.exit_json(
-        changed=False,
-        layers=(
-            sorted(images.get("layers", []), key=lambda k: k["index"], reverse=True)
-            if images and images.get("layers")
-            else []
-        ),
+        changed=False, layers=sorted(layers, key=lambda k: k["index"], reverse=True)
     )
 
 
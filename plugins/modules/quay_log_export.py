@@ -0,0 +1,474 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_log_export
+short_description: Export the usage logs of organizations and repositories
+description:
+  - Export the usage logs of an organization or a repository to a JSON Lines
+    file, for example to feed a Security Information and Event Management
+    (SIEM) system.
+  - The module retrieves the log entries page by page and appends them to
+    the file as it receives them.
+  - With the O(checkpoint_file) parameter, each run only exports the entries
+    that the preceding runs have not exported yet. If a run fails, then the
+    next run resumes the export where the failed run stopped.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  organization:
+    description:
+      - Name of the organization for which to export the logs.
+      - Mutually exclusive with O(repository).
+    type: str
+  repository:
+    description:
+      - Name of the repository for which to export the logs. The format is
+        C(namespace)/C(shortname). The namespace can be an organization or a
+        personal namespace.
+      - If you omit the namespace part, then the module looks for the
+        repository in your personal namespace.
+      - Mutually exclusive with O(organization).
+    type: str
+  output_file:
+    description:
+      - Path to the file on the managed node where the module appends the log
+        entries, one JSON object per line.
+      - The module creates the file if it does not exist.
+    type: path
+    required: true
+  compress:
+    description:
+      - Whether to compress the O(output_file) file with gzip.
+      - When the file already exists, the module appends a new gzip member,
+        which the C(gzip) and C(zcat) tools read as a single stream.
+    type: bool
+    default: false
+  checkpoint_file:
+    description:
+      - Path to the file on the managed node where the module records the
+        progress of the export, in the JSON format.
+      - After a successful run, the file stores the date of the most recent
+        exported entry. The next run only exports the entries that are more
+        recent.
+      - During a run, the module updates the file after each page of
+        entries. If the run fails, then the file stores the position in each
+        date window, and the next run resumes the export from these
+        positions.
+      - Do not use the same checkpoint file for several organizations or
+        repositories. The module fails if the file was created for another
+        organization or repository.
+      - If you do not set the parameter, then the module exports all the
+        entries of the period that the O(since) parameter defines.
+    type: path
+  since:
+    description:
+      - Period to export when no checkpoint exists yet, for example for the
+        initial backfill.
+      - Accepts an integer for seconds, or an integer followed by the C(s),
+        C(m), C(h), C(d), or C(w) suffix for seconds, minutes, hours, days,
+        or weeks. For example, V(4w) for four weeks.
+      - Quay only keeps the logs for a limited time, which depends on the
+        configuration of your installation.
+    type: str
+    default: 7d
+  window_size:
+    description:
+      - Number of days in each date window.
+      - The module divides the period to export into date windows and
+        retrieves the windows in parallel. See the O(concurrency) parameter.
+      - The value must be between 1 and 30.
+    type: int
+    default: 1
+notes:
+  - The token that you use in the O(quay_token) parameter must have the
+    C(org:admin) scope for organizations, or the C(repo:admin) scope for
+    repositories.
+  - Quay organizes the logs by days, in Coordinated Universal Time (UTC).
+  - Because the module retrieves the date windows in parallel, the entries
+    in the O(output_file) file are not sorted by date.
+  - If a run fails in the middle of a page, then the next run exports the
+    entries of that page again. The module therefore exports each entry at
+    least once.
+  - In check mode, the module retrieves the entries and returns their
+    number, but does not write the O(output_file) and O(checkpoint_file)
+    files.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Export the new log entries of the production organization
+  infra.quay_configuration.quay_log_export:
+    organization: production
+    output_file: /var/log/quay/production.jsonl.gz
+    compress: true
+    checkpoint_file: /var/lib/quay-export/production.json
+    # Initial backfill of four weeks, retrieved in parallel
+    since: 4w
+    concurrency: 8
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: export
+
+- name: Export the logs of the last day for the production/smallimage repository
+  infra.quay_configuration.quay_log_export:
+    repository: production/smallimage
+    output_file: /tmp/smallimage.jsonl
+    since: 1d
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+count:
+  description: Number of log entries that the module exported during the run.
+  returned: always
+  type: int
+  sample: 1542
+output_file:
+  description: Path to the file that stores the log entries.
+  returned: always
+  type: str
+  sample: /var/log/quay/production.jsonl.gz
+windows:
+  description: Number of date windows that the module retrieved.
+  returned: always
+  type: int
+  sample: 28
+newest_timestamp:
+  description:
+    - Date and time, in seconds since the epoch, of the most recent entry
+      exported by the module during that run or a preceding run.
+    - V(null) when no entry has been exported yet.
+  returned: always
+  type: int
+  sample: 1792397403
+"""
+
+import threading
+import time
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.checkpoint import read_checkpoint, save_checkpoint
+from ..module_utils.log_windows import date_windows, parse_log_datetime, utc_date
+from ..module_utils.output_file import OutputFile
+
+# Version of the format of the checkpoint file
+CHECKPOINT_VERSION = 1
+
+
+class LogExport(object):
+    """Export the log entries of date windows and record the progress.
+
+    Several threads can process windows at the same time. The object
+    serializes the writes to the output file and to the checkpoint file.
+    """
+
+    def __init__(self, module, endpoint, endpoint_params, out, checkpoint_file, state):
+        """Initialize the object.
+
+        :param module: The module object.
+        :type module: :py:class:``APIModule``
+        :param endpoint: The API endpoint that returns the logs.
+        :type endpoint: str
+        :param endpoint_params: The parameters to substitute in the endpoint.
+        :type endpoint_params: dict
+        :param out: The object that writes the entries, or ``None`` in check
+                    mode.
+        :type out: :py:class:``OutputFile``
+        :param checkpoint_file: Path to the checkpoint file, or ``None``.
+        :type checkpoint_file: str
+        :param state: The checkpoint data, with the ``pending`` key that
+                      stores the windows of the run.
+        :type state: dict
+        """
+        self.module = module
+        self.endpoint = endpoint
+        self.endpoint_params = endpoint_params
+        self.out = out
+        self.checkpoint_file = checkpoint_file
+        self.state = state
+        self.pending = state["pending"]
+        # The entries that a preceding run already exported
+        self.newest = state.get("newest")
+        self.newest_keys = set(state.get("newest_keys", []))
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def save(self):
+        """Write the checkpoint file, if any."""
+        if self.checkpoint_file and self.out:
+            save_checkpoint(self.module, self.checkpoint_file, self.state)
+
+    def add(self, entry):
+        """Export a log entry if a preceding run did not export it already.
+
+        :param entry: The log entry, as returned by the API.
+        :type entry: dict
+        """
+        timestamp = parse_log_datetime(entry.get("datetime"))
+        key = self.module.content_hash(entry)
+        if self.newest is not None:
+            if timestamp < self.newest:
+                return
+            if timestamp == self.newest and key in self.newest_keys:
+                return
+        if self.out:
+            self.out.write(entry)
+        self.count += 1
+
+        # Keep the keys of the most recent entries, so that the next run can
+        # skip them
+        if self.pending["newest"] is None or timestamp > self.pending["newest"]:
+            self.pending["newest"] = timestamp
+            self.pending["newest_keys"] = [key]
+        elif timestamp == self.pending["newest"]:
+            self.pending["newest_keys"].append(key)
+
+    def export_window(self, window):
+        """Export the entries of a date window, page by page.
+
+        :param window: The window, with the ``start`` and ``end`` days, the
+                       ``next_page`` cursor, and the ``done`` status.
+        :type window: dict
+
+        :raises APIModuleError: An API error occurred. The checkpoint file
+                                stores the position in the window.
+        """
+        # Get the log entries
+        #
+        # GET /api/v1/organization/{orgname}/logs?starttime=10/12/2026&endtime=10/12/2026
+        # {
+        #   "start_time": "Mon, 12 Oct 2026 00:00:00 -0000",
+        #   "end_time": "Tue, 13 Oct 2026 00:00:00 -0000",
+        #   "logs": [
+        #     {
+        #       "kind": "push_repo",
+        #       "metadata": {
+        #         "repo": "smallimage",
+        #         "namespace": "production",
+        #         "tag": "latest"
+        #       },
+        #       "ip": "192.168.1.10",
+        #       "datetime": "Mon, 12 Oct 2026 13:30:03 -0000",
+        #       "performer": {
+        #         "kind": "user",
+        #         "name": "lvasquez",
+        #         "is_robot": false,
+        #         "avatar": {...}
+        #       },
+        #       "namespace": {
+        #         "kind": "org",
+        #         "name": "production",
+        #         "avatar": {...}
+        #       }
+        #     }
+        #   ],
+        #   "next_page": "gAAAAABh...Wx1a"
+        # }
+        query = {"starttime": window["start"], "endtime": window["end"]}
+        while not window["done"]:
+            if window["next_page"]:
+                query["next_page"] = window["next_page"]
+            page = self.module.get_object_path(
+                self.endpoint,
+                query_params=query,
+                exit_on_error=False,
+                duplicate_underscore=False,
+                **self.endpoint_params
+            )
+            page = page or {}
+            with self.lock:
+                for entry in page.get("logs", []):
+                    self.add(entry)
+                if self.out:
+                    self.out.flush()
+                window["next_page"] = page.get("next_page")
+                window["done"] = not window["next_page"]
+                self.save()
+
+
+def export_windows(module, export, windows, concurrency):
+    """Export the date windows in parallel.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param export: The object that exports the windows.
+    :type export: :py:class:``LogExport``
+    :param windows: The windows to export.
+    :type windows: list
+    :param concurrency: Maximum number of API requests to send in parallel.
+    :type concurrency: int
+    """
+    try:
+        module.run_concurrently(export.export_window, windows, concurrency)
+    except APIModuleError as e:
+        msg = str(e)
+        if export.checkpoint_file and export.out:
+            msg += " The next run resumes the export from the checkpoint file."
+        module.fail_json(msg=msg, count=export.count)
+
+
+def main():
+    argument_spec = dict(
+        organization=dict(),
+        repository=dict(),
+        output_file=dict(type="path", required=True),
+        compress=dict(type="bool", default=False),
+        checkpoint_file=dict(type="path"),
+        since=dict(default="7d"),
+        window_size=dict(type="int", default=1),
+        concurrency=dict(type="int", default=8),
+    )
+
+    mutually_exclusive = [("organization", "repository")]
+    required_one_of = [("organization", "repository")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    organization = module.params.get("organization")
+    repository = module.params.get("repository")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+    checkpoint_file = module.params.get("checkpoint_file")
+    since = module.params.get("since")
+    window_size = module.params.get("window_size")
+    concurrency = module.params.get("concurrency")
+
+    if window_size < 1 or window_size > 30:
+        module.fail_json(msg="The `window_size' parameter must be between 1 and 30.")
+    since_s = module.str_period_to_second("since", since)
+
+    if organization:
+        org_details = module.get_object_path(
+            "organization/{orgname}", duplicate_underscore=False, orgname=organization
+        )
+        if not org_details:
+            module.fail_json(
+                msg="The {orgname} organization does not exist.".format(orgname=organization)
+            )
+        scope = "organization/{orgname}".format(orgname=organization)
+        endpoint = "organization/{orgname}/logs"
+        endpoint_params = {"orgname": organization}
+    else:
+        repository = repository.strip("/")
+        if "/" in repository:
+            namespace, repo_shortname = repository.split("/", 1)
+        else:
+            # No namespace part in the name. Therefore, use the user's
+            # personal namespace
+            namespace = module.who_am_i()
+            repo_shortname = repository
+            if not namespace:
+                module.fail_json(
+                    msg=(
+                        "The `repository' parameter must include the"
+                        " organization: <organization>/{name}."
+                    ).format(name=repository)
+                )
+        full_repo_name = "{namespace}/{repository}".format(
+            namespace=namespace, repository=repo_shortname
+        )
+        repo_details = module.get_object_path(
+            "repository/{full_repo_name}",
+            query_params={"includeTags": False},
+            duplicate_underscore=False,
+            full_repo_name=full_repo_name,
+        )
+        if not repo_details:
+            module.fail_json(
+                msg="The {repo} repository does not exist.".format(repo=full_repo_name)
+            )
+        scope = "repository/{full_repo_name}".format(full_repo_name=full_repo_name)
+        endpoint = "repository/{full_repo_name}/logs"
+        endpoint_params = {"full_repo_name": full_repo_name}
+
+    state = read_checkpoint(module, checkpoint_file, scope, CHECKPOINT_VERSION)
+    if not state:
+        state = {"version": CHECKPOINT_VERSION, "scope": scope, "newest": None}
+
+    if not state.get("pending"):
+        # Start a new run. The export starts at the day of the most recent
+        # exported entry, or at the beginning of the backfill period.
+        now = time.time()
+        today = utc_date(now)
+        if state.get("newest") is not None:
+            start = utc_date(state["newest"])
+        else:
+            start = utc_date(now - since_s)
+        state["pending"] = {
+            "windows": [
+                {"start": first, "end": last, "next_page": None, "done": False}
+                for first, last in date_windows(start, today, window_size)
+            ],
+            "newest": state.get("newest"),
+            "newest_keys": list(state.get("newest_keys", [])),
+        }
+    windows = [w for w in state["pending"]["windows"] if not w["done"]]
+
+    if module.check_mode:
+        export = LogExport(module, endpoint, endpoint_params, None, checkpoint_file, state)
+        export_windows(module, export, windows, concurrency)
+    else:
+        with OutputFile(module, output_file, compress, append=True) as out:
+            export = LogExport(module, endpoint, endpoint_params, out, checkpoint_file, state)
+            export.save()
+            export_windows(module, export, windows, concurrency)
+
+    # The run is complete
+    pending = state.pop("pending")
+    state["newest"] = pending["newest"]
+    state["newest_keys"] = pending["newest_keys"]
+    export.save()
+
+    module.exit_json(
+        changed=export.count > 0,
+        count=export.count,
+        output_file=output_file,
+        windows=len(windows),
+        newest_timestamp=state["newest"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_log_stat_info
+short_description: Return daily usage statistics from the Quay logs
+description:
+  - Return the number of log entries per day and per kind of action (push,
+    pull, tag deletion, and so on) for an organization or for repositories.
+  - The module uses the aggregated logs that Quay computes, and does not
+    retrieve the log entries.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  organization:
+    description:
+      - Name of the organization.
+      - Mutually exclusive with O(repositories).
+    type: str
+  repositories:
+    description:
+      - Names of the repositories. The format for each name is
+        C(namespace)/C(shortname). The namespace can be an organization or a
+        personal namespace.
+      - If you omit the namespace part in the name, then the module looks for
+        the repository in your personal namespace.
+      - Mutually exclusive with O(organization).
+    type: list
+    elements: str
+  per_repository:
+    description:
+      - Whether to also return the statistics of each repository of the
+        organization in the RV(repositories) list.
+      - The module sends one request per repository and per date window.
+      - Only used with the O(organization) parameter. With the
+        O(repositories) parameter, the module always returns the statistics
+        of each repository.
+    type: bool
+    default: false
+  kinds:
+    description:
+      - Only return the statistics for those kinds of actions, such as
+        V(push_repo), V(pull_repo), or V(delete_tag).
+      - By default, the module returns the statistics for all the kinds of
+        actions.
+    type: list
+    elements: str
+  since:
+    description:
+      - Period of time for which to return the statistics, up to the current
+        day.
+      - Accepts an integer for seconds, or an integer followed by the C(s),
+        C(m), C(h), C(d), or C(w) suffix for seconds, minutes, hours, days,
+        or weeks. For example, V(4w) for four weeks.
+    type: str
+    default: 7d
+  window_size:
+    description:
+      - Number of days in each date window.
+      - The module divides the period into date windows and retrieves the
+        windows in parallel. See the O(concurrency) parameter.
+      - The value must be between 1 and 30.
+    type: int
+    default: 7
+notes:
+  - The token that you use in the O(quay_token) parameter must have the
+    C(org:admin) scope for organizations, or the C(repo:admin) scope for
+    repositories.
+  - Quay aggregates the logs by days, in Coordinated Universal Time (UTC).
+  - The module returns the statistics in a columnar format. The
+    RV(counts) list has one item per day in the RV(dates) list. Each item is
+    a list with one number per kind of action in the RV(kinds) list.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Retrieve the daily pushes, pulls, and deletions for the last 90 days
+  infra.quay_configuration.quay_log_stat_info:
+    organization: production
+    per_repository: true
+    kinds:
+      - push_repo
+      - pull_repo
+      - delete_tag
+    since: 90d
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: stats
+
+- name: Display the number of pulls per day
+  ansible.builtin.debug:
+    msg: "{{ item.0 }}: {{ item.1[stats['kinds'].index('pull_repo')] }}"
+  loop: "{{ stats['dates'] | zip(stats['counts']) }}"
+"""
+
+RETURN = r"""
+dates:
+  description: The days of the period, in the YYYY-MM-DD format, oldest first.
+  returned: always
+  type: list
+  elements: str
+  sample: ["2026-10-17", "2026-10-18", "2026-10-19"]
+kinds:
+  description:
+    - The kinds of actions, in alphabetical order.
+    - Only the kinds that have at least one log entry are listed.
+  returned: always
+  type: list
+  elements: str
+  sample: ["pull_repo", "push_repo"]
+counts:
+  description:
+    - Number of log entries for the organization or for all the given
+      repositories.
+    - One item per day in RV(dates). Each item is a list with one number per
+      kind of action in RV(kinds).
+  returned: always
+  type: list
+  elements: list
+  sample: [[12, 1], [0, 0], [42, 3]]
+totals:
+  description: Total number of log entries for each kind of action.
+  returned: always
+  type: dict
+  sample: {"pull_repo": 54, "push_repo": 4}
+repositories:
+  description:
+    - Statistics for each repository.
+    - The RV(repositories[].counts) lists use the same RV(dates) and
+      RV(kinds) lists.
+  returned: when you set the O(repositories) parameter, or the
+    O(per_repository) parameter to V(true)
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Name of the repository, including its namespace.
+      type: str
+      sample: production/smallimage
+    counts:
+      description: Number of log entries for each day and kind of action.
+      type: list
+      elements: list
+      sample: [[10, 1], [0, 0], [40, 2]]
+    totals:
+      description: Total number of log entries for each kind of action.
+      type: dict
+      sample: {"pull_repo": 50, "push_repo": 3}
+"""
+
+import datetime
+import time
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.log_windows import date_windows, parse_log_datetime, utc_date
+
+
+def get_buckets(module, endpoint, endpoint_params, window, kinds):
+    """Retrieve the aggregated logs of a date window.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param endpoint: The API endpoint that returns the aggregated logs.
+    :type endpoint: str
+    :param endpoint_params: The parameters to substitute in the endpoint.
+    :type endpoint_params: dict
+    :param window: The first and last days of the window, formatted for the
+                   API (see :py:func:``date_windows``).
+    :type window: tuple
+    :param kinds: The kinds of actions to keep, or ``None`` for all.
+    :type kinds: list
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The number of log entries, indexed by (day, kind) tuples. The
+             days use the YYYY-MM-DD format.
+    :rtype: dict
+    """
+    # Get the aggregated logs
+    #
+    # GET /api/v1/organization/{orgname}/aggregatelogs?starttime=10/13/2026&endtime=10/19/2026
+    # {
+    #   "aggregated": [
+    #     {
+    #       "kind": "push_repo",
+    #       "count": 3,
+    #       "datetime": "Mon, 19 Oct 2026 00:00:00 -0000"
+    #     },
+    #     {
+    #       "kind": "pull_repo",
+    #       "count": 42,
+    #       "datetime": "Mon, 19 Oct 2026 00:00:00 -0000"
+    #     }
+    #   ]
+    # }
+    resp = module.get_object_path(
+        endpoint,
+        query_params={"starttime": window[0], "endtime": window[1]},
+        exit_on_error=False,
+        duplicate_underscore=False,
+        **endpoint_params
+    )
+    buckets = {}
+    for item in resp.get("aggregated", []) if resp else []:
+        kind = item.get("kind")
+        if kinds and kind not in kinds:
+            continue
+        day = utc_date(parse_log_datetime(item.get("datetime"))).isoformat()
+        buckets[(day, kind)] = buckets.get((day, kind), 0) + item.get("count", 0)
+    return buckets
+
+
+def to_columns(buckets, dates, kinds):
+    """Convert the buckets into the columnar format.
+
+    :param buckets: The number of log entries, indexed by (day, kind) tuples.
+    :type buckets: dict
+    :param dates: The days, in the YYYY-MM-DD format.
+    :type dates: list
+    :param kinds: The kinds of actions.
+    :type kinds: list
+
+    :return: A tuple with the counts (one list per day, with one number per
+             kind), and the totals per kind.
+    :rtype: tuple
+    """
+    counts = [[buckets.get((day, kind), 0) for kind in kinds] for day in dates]
+    totals = dict((kind, 0) for kind in kinds)
+    for (day, kind), count in buckets.items():
+        if kind in totals:
+            totals[kind] += count
+    return counts, totals
+
+
+def main():
+    argument_spec = dict(
+        organization=dict(),
+        repositories=dict(type="list", elements="str"),
+        per_repository=dict(type="bool", default=False),
+        kinds=dict(type="list", elements="str"),
+        since=dict(default="7d"),
+        window_size=dict(type="int", default=7),
+        concurrency=dict(type="int", default=8),
+    )
+
+    mutually_exclusive = [("organization", "repositories")]
+    required_one_of = [("organization", "repositories")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    organization = module.params.get("organization")
+    repositories = module.params.get("repositories")
+    per_repository = module.params.get("per_repository")
+    kinds = module.params.get("kinds")
+    since = module.params.get("since")
+    window_size = module.params.get("window_size")
+    concurrency = module.params.get("concurrency")
+
+    if window_size < 1 or window_size > 30:
+        module.fail_json(msg="The `window_size' parameter must be between 1 and 30.")
+    since_s = module.str_period_to_second("since", since)
+
+    # Scopes to query: None for the organization, or the repository names
+    repo_names = []
+    if organization:
+        if not module.get_organization(organization):
+            module.fail_json(
+                msg="The {orgname} organization does not exist.".format(orgname=organization)
+            )
+        if per_repository:
+            repo_names = module.get_repository_names(namespace=organization)
+    else:
+        repo_names = module.get_repository_names(repositories)
+
+    now = time.time()
+    start = utc_date(now - since_s)
+    end = utc_date(now)
+    windows = date_windows(start, end, window_size)
+    dates = [
+        (start + datetime.timedelta(days=i)).isoformat()
+        for i in range((end - start).days + 1)
+    ]
+
+    # One job per scope and per window
+    jobs = []
+    if organization:
+        jobs.extend(
+            (None, "organization/{orgname}/aggregatelogs", {"orgname": organization}, w)
+            for w in windows
+        )
+    for name in repo_names:
+        jobs.extend(
+            (name, "repository/{full_repo_name}/aggregatelogs", {"full_repo_name": name}, w)
+            for w in windows
+        )
+
+    try:
+        results = module.run_concurrently(
+            lambda job: get_buckets(module, job[1], job[2], job[3], kinds),
+            jobs,
+            concurrency,
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    # Merge the buckets of the windows
+    scope_buckets = dict((name, {}) for name in [None] + repo_names)
+    for job, buckets in zip(jobs, results):
+        merged = scope_buckets[job[0]]
+        for key, count in buckets.items():
+            merged[key] = merged.get(key, 0) + count
+
+    if not organization:
+        # The global statistics are the sum of the repository statistics
+        merged = scope_buckets[None]
+        for name in repo_names:
+            for key, count in scope_buckets[name].items():
+                merged[key] = merged.get(key, 0) + count
+
+    all_kinds = sorted(set(kind for (day, kind) in scope_buckets[None]))
+    counts, totals = to_columns(scope_buckets[None], dates, all_kinds)
+    result = {
+        "changed": False,
+        "dates": dates,
+        "kinds": all_kinds,
+        "counts": counts,
+        "totals": totals,
+    }
+    if repo_names:
+        result["repositories"] = []
+        for name in repo_names:
+            repo_counts, repo_totals = to_columns(scope_buckets[name], dates, all_kinds)
+            result["repositories"].append(
+                {"repository": name, "counts": repo_counts, "totals": repo_totals}
+            )
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
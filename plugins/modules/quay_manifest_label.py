@@ -38,17 +38,53 @@ options:
       - If you omit the namespace part, then the module looks for the
         repository in your personal namespace.
       - If you omit the tag and the digest part, then C(latest) is assumed.
-    required: true
+      - Mutually exclusive with O(images).
     type: str
+  images:
+    description:
+      - List of manifests to update. The format of each item is the same as
+        for the O(image) parameter.
+      - If you omit the namespace part of an item, then the module looks for
+        the repository in your personal namespace, as for O(image). The module
+        retrieves your personal namespace only once for all the items.
+      - The module resolves the tags into manifest digests and reads the
+        existing labels of all the manifests in parallel, and then only
+        creates or deletes the labels that differ.
+      - When several tags point to the same manifest, the module updates that
+        manifest only once.
+      - Mutually exclusive with O(image).
+    type: list
+    elements: str
+    version_added: '2.9.0'
   key:
     description:
       - Label's key.
-    required: true
+      - Mutually exclusive with O(labels).
     type: str
   value:
     description:
-      - Label's value. Required when O(state=present).
+      - Label's value. Required when O(state=present) and you set O(key).
+      - Mutually exclusive with O(labels).
     type: str
+  labels:
+    description:
+      - List of labels to add or to remove.
+      - Mutually exclusive with O(key) and O(value).
+    type: list
+    elements: dict
+    version_added: '2.9.0'
+    suboptions:
+      key:
+        description:
+          - Label's key.
+        required: true
+        type: str
+      value:
+        description:
+          - Label's value. Required when O(state=present).
+          - When O(state=absent) and you do not provide the value, then the
+            module deletes all the labels with that key.
+        type: str
   replace:
     description:
       - Only used when O(state=present).
@@ -57,6 +93,8 @@ options:
       - If V(false), then the module adds the new label even if existing labels
         already use the key you define in the O(key) parameter. Quay supports
         multiple labels with the same key.
+      - When you use the O(labels) parameter and several labels share the same
+        key, then the module keeps all these labels.
     type: bool
     default: true
   state:
@@ -68,6 +106,16 @@ options:
     type: str
     default: present
     choices: [absent, present]
+  cache_dir:
+    description:
+      - Path to the cache directory that the
+        M(infra.quay_configuration.quay_manifest_label_info) module uses.
+      - The module removes the labels of the manifests that it updates from
+        that cache, so that the next runs of the
+        M(infra.quay_configuration.quay_manifest_label_info) module retrieve
+        the new labels.
+    type: path
+    version_added: '2.9.0'
 notes:
   - Labels defined in the Containerfile/Dockerfile cannot be deleted or
     updated. They are read-only.
@@ -85,6 +133,7 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
 """
 
 EXAMPLES = r"""
@@ -123,22 +172,38 @@ EXAMPLES = r"""
     state: absent
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Ensure the release images have the build labels set
+  infra.quay_configuration.quay_manifest_label:
+    images:
+      - production/smallimage:v1.0.0
+      - production/frontend:v1.0.0
+      - production/backend@sha256:4f6f...e797
+    labels:
+      - key: build-id
+        value: "1342"
+      - key: git-commit
+        value: 9c1a4e2
+    state: present
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 """
 
 RETURN = r"""
 id:
   description: Internal identifier of the label.
-  returned: always
+  returned: when you use the O(image) and O(key) parameters
   type: str
   sample: 155f20b3-7ebf-4796-9d18-eb5c54bf7364
 key:
   description: Label's key.
-  returned: always
+  returned: when you use the O(image) and O(key) parameters
   type: str
   sample: architecture
 value:
   description: Label's value.
-  returned: always
+  returned: when you use the O(image) and O(key) parameters
   type: str
   sample: x86_64
 source_type:
@@ -146,45 +211,374 @@ source_type:
     - Whether the label has been set by the Containerfile/Dockerfile manifest
       (V(manifest)), or by an API call or from the web UI (V(api)).
     - Labels set in Containerfile/Dockerfile manifests are read-only.
-  returned: always
+  returned: when you use the O(image) and O(key) parameters
   type: str
   sample: api
 media_type:
   description: Format of the label (V(text/plain) or V(application/json)).
-  returned: always
+  returned: when you use the O(image) and O(key) parameters
   type: str
   sample: text/plain
+manifests:
+  description:
+    - Labels that the module created or deleted for each manifest.
+    - The module only returns the manifests that it updates.
+  returned: when you use the O(images) or the O(labels) parameters
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Full name of the repository that contains the manifest.
+      type: str
+      returned: always
+      sample: production/smallimage
+    manifest_digest:
+      description: Digest of the manifest.
+      type: str
+      returned: always
+      sample: sha256:4f6f...e797
+    images:
+      description: Images, from the O(images) parameter, that use the manifest.
+      type: list
+      elements: str
+      returned: always
+      sample: ["production/smallimage:v1.0.0", "production/smallimage:latest"]
+    created:
+      description: Labels that the module created.
+      type: list
+      elements: dict
+      returned: always
+      sample: [{"key": "build-id", "value": "1342"}]
+    deleted:
+      description: Labels that the module deleted.
+      type: list
+      elements: dict
+      returned: always
+      sample: [{"id": "155f...7364", "key": "build-id", "value": "1341"}]
+  sample: [
+    {
+      "repository": "production/smallimage",
+      "manifest_digest": "sha256:4f6f...e797",
+      "images": ["production/smallimage:v1.0.0"],
+      "created": [{"key": "build-id", "value": "1342"}],
+      "deleted": [{"id": "155f...7364", "key": "build-id", "value": "1341"}]
+    }
+  ]
 """
 
 
-from ..module_utils.api_module import APIModule
-from ..module_utils.quay_image import QuayImage
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.manifest_cache import ManifestCache
+from ..module_utils.quay_image import QuayImage, parse_image_names
+
+
+def forget_labels(module, manifests):
+    """Remove the labels of the given manifests from the cache.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param manifests: The manifests to remove. Each item is a tuple (full
+                      repository name, manifest digest).
+    :type manifests: list
+    """
+    if module.check_mode:
+        return
+    cache = ManifestCache(module, module.params.get("cache_dir"))
+    for full_repo_name, manifest_digest in manifests:
+        cache.invalidate("labels", manifest_digest, full_repo_name)
+
+
+def get_manifests(module, images, state, concurrency):
+    """Resolve the given images into manifests.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param images: The image names to resolve.
+    :type images: list
+    :param state: The ``state`` module parameter. When ``absent``, the images
+                  in namespaces that do not exist are ignored.
+    :type state: str
+    :param concurrency: Maximum number of API requests to run in parallel.
+    :type concurrency: int
+
+    :return: A dictionary. The keys are tuples (full repository name, manifest
+             digest) and the values are the lists of the image names that
+             reference the manifest.
+    :rtype: dict
+    """
+    # Parse the image names and verify the namespaces once per namespace
+    parsed_images = []
+    namespaces = {}
+    images = [image.strip("/") for image in images]
+    for image, img in zip(images, parse_image_names(module, images)):
+        if img.namespace is None:
+            module.fail_json(
+                msg=(
+                    "The `images' parameter must include the"
+                    " organization: <organization>/{name}."
+                ).format(name=image)
+            )
+        if img.namespace not in namespaces:
+            namespaces[img.namespace] = module.get_namespace(img.namespace)
+        if not namespaces[img.namespace]:
+            if state == "absent":
+                continue
+            module.fail_json(
+                msg="The {namespace} namespace does not exist.".format(
+                    namespace=img.namespace
+                )
+            )
+        parsed_images.append((image, img))
+
+    # Resolve the tags into manifest digests. Each tag is only resolved once,
+    # even if the same image is listed several times.
+    tag_refs = []
+    for image, img in parsed_images:
+        if not img.digest:
+            ref = (img.namespace, img.repository, img.tag)
+            if ref not in tag_refs:
+                tag_refs.append(ref)
+
+    def resolve(ref):
+        namespace, repository, tag = ref
+        return module.get_tag_digest(namespace, repository, tag, exit_on_error=False)
+
+    try:
+        digests = dict(zip(tag_refs, module.run_concurrently(resolve, tag_refs, concurrency)))
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    manifests = {}
+    for image, img in parsed_images:
+        if img.digest:
+            manifest_digest = img.digest
+        else:
+            manifest_digest = digests.get((img.namespace, img.repository, img.tag))
+            if not manifest_digest:
+                module.fail_json(msg="The {image} image does not exist.".format(image=image))
+        full_repo_name = "{namespace}/{repository}".format(
+            namespace=img.namespace, repository=img.repository
+        )
+        manifests.setdefault((full_repo_name, manifest_digest), []).append(image)
+    return manifests
+
+
+def compute_label_changes(current_labels, labels, replace, state):
+    """Return the labels to create and the labels to delete for a manifest.
+
+    :param current_labels: The labels that the manifest currently has.
+    :type current_labels: list
+    :param labels: The labels to add or to remove. Each item is a dictionary
+                   with the ``key`` and ``value`` keys.
+    :type labels: list
+    :param replace: The ``replace`` module parameter.
+    :type replace: bool
+    :param state: The ``state`` module parameter.
+    :type state: str
+
+    :return: A list. The first item is the list of the labels to create, and
+             the second item is the list of the labels to delete.
+    :rtype: list
+    """
+    # Labels set in the Containerfile/Dockerfile are read-only
+    mutable_labels = [
+        lbl
+        for lbl in current_labels
+        if lbl.get("source_type") != "manifest" and lbl.get("id")
+    ]
+    to_create = []
+    to_delete = []
+    deleted_ids = set()
+
+    if state == "absent":
+        for label in labels:
+            for lbl in mutable_labels:
+                if (
+                    lbl["id"] not in deleted_ids
+                    and lbl.get("key") == label["key"]
+                    and (label.get("value") is None or lbl.get("value") == label["value"])
+                ):
+                    to_delete.append(lbl)
+                    deleted_ids.add(lbl["id"])
+        return (to_create, to_delete)
+
+    # Group the requested values by key. Several labels can share the same key.
+    requested = {}
+    for label in labels:
+        values = requested.setdefault(label["key"], [])
+        if label["value"] not in values:
+            values.append(label["value"])
+
+    for key, values in requested.items():
+        current_values = [lbl.get("value") for lbl in current_labels if lbl.get("key") == key]
+        for value in values:
+            if value not in current_values:
+                to_create.append({"key": key, "value": value})
+        if replace:
+            for lbl in mutable_labels:
+                if lbl.get("key") == key and lbl.get("value") not in values:
+                    to_delete.append(lbl)
+    return (to_create, to_delete)
+
+
+def manage_labels(module, images, labels, replace, state, concurrency):
+    """Create or delete several labels on several manifests and exit.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param images: The image names.
+    :type images: list
+    :param labels: The labels to add or to remove. Each item is a dictionary
+                   with the ``key`` and ``value`` keys.
+    :type labels: list
+    :param replace: The ``replace`` module parameter.
+    :type replace: bool
+    :param state: The ``state`` module parameter.
+    :type state: str
+    :param concurrency: Maximum number of API requests to run in parallel.
+    :type concurrency: int
+    """
+    if state == "present":
+        for label in labels:
+            if label.get("value") is None:
+                module.fail_json(
+                    msg="The {key} label requires a value when state is present.".format(
+                        key=label["key"]
+                    )
+                )
+
+    manifests = get_manifests(module, images, state, concurrency)
+    manifest_keys = list(manifests.keys())
+
+    # Get the labels of all the manifests
+    def get_labels(manifest_key):
+        full_repo_name, manifest_digest = manifest_key
+        res = module.get_object_path(
+            "repository/{full_repo_name}/manifest/{digest}/labels",
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            digest=manifest_digest,
+        )
+        return res.get("labels", []) if res else []
+
+    try:
+        current_labels = module.run_concurrently(get_labels, manifest_keys, concurrency)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    # Compute the changes
+    results = []
+    deletions = []
+    creations = []
+    for manifest_key, manifest_labels in zip(manifest_keys, current_labels):
+        to_create, to_delete = compute_label_changes(manifest_labels, labels, replace, state)
+        if not to_create and not to_delete:
+            continue
+        results.append(
+            {
+                "repository": manifest_key[0],
+                "manifest_digest": manifest_key[1],
+                "images": manifests[manifest_key],
+                "created": to_create,
+                "deleted": [
+                    {"id": lbl["id"], "key": lbl.get("key"), "value": lbl.get("value")}
+                    for lbl in to_delete
+                ],
+            }
+        )
+        deletions.extend([(manifest_key, lbl) for lbl in to_delete])
+        creations.extend([(manifest_key, lbl) for lbl in to_create])
+
+    # Apply the changes. The labels are deleted first so that replaced labels
+    # do not coexist with their new values.
+    def delete_label(operation):
+        (full_repo_name, manifest_digest), lbl = operation
+        module.delete(
+            True,
+            "label",
+            lbl.get("key"),
+            "repository/{full_repo_name}/manifest/{digest}/labels/{id}",
+            auto_exit=False,
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            digest=manifest_digest,
+            id=lbl["id"],
+        )
+
+    def create_label(operation):
+        (full_repo_name, manifest_digest), lbl = operation
+        module.create(
+            "label",
+            lbl["key"] + "=" + lbl["value"],
+            "repository/{full_repo_name}/manifest/{digest}/labels",
+            {"key": lbl["key"], "value": lbl["value"], "media_type": "text/plain"},
+            auto_exit=False,
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            digest=manifest_digest,
+        )
+
+    try:
+        module.run_concurrently(delete_label, deletions, concurrency)
+        module.run_concurrently(create_label, creations, concurrency)
+    except APIModuleError as e:
+        forget_labels(module, [(r["repository"], r["manifest_digest"]) for r in results])
+        module.fail_json(msg=str(e))
+    forget_labels(module, [(r["repository"], r["manifest_digest"]) for r in results])
+
+    module.exit_json(changed=len(results) > 0, manifests=results)
 
 
 def main():
     argument_spec = dict(
-        image=dict(required=True),
-        key=dict(required=True, no_log=True),
+        image=dict(),
+        images=dict(type="list", elements="str"),
+        key=dict(no_log=True),
         value=dict(),
+        labels=dict(
+            type="list",
+            elements="dict",
+            options=dict(key=dict(required=True, no_log=False), value=dict()),
+        ),
         replace=dict(type="bool", default=True),
         state=dict(choices=["present", "absent"], default="present"),
+        concurrency=dict(type="int", default=8),
+        cache_dir=dict(type="path"),
     )
 
     # Create a module for ourselves
     module = APIModule(
         argument_spec=argument_spec,
+        mutually_exclusive=[("image", "images"), ("key", "labels"), ("value", "labels")],
+        required_one_of=[("image", "images"), ("key", "labels")],
         required_if=[
-            ("state", "present", ["value"]),
+            ("state", "present", ["value", "labels"], True),
         ],
         supports_check_mode=True,
     )
 
     # Extract our parameters
-    image = module.params.get("image").strip("/")
+    image = module.params.get("image")
+    images = module.params.get("images")
     key = module.params.get("key")
     value = module.params.get("value")
+    labels = module.params.get("labels")
     replace = module.params.get("replace")
     state = module.params.get("state")
+    concurrency = module.params.get("concurrency")
+
+    # Process several images or several labels at once
+    if images is not None or labels is not None:
+        manage_labels(
+            module,
+            images if images is not None else [image],
+            labels if labels is not None else [{"key": key, "value": value}],
+            replace,
+            state,
+            concurrency,
+        )
+
+    image = image.strip("/")
 
     # Get the components of the given image (namespace, repository, tag, digest)
     img = QuayImage(module, image)
@@ -210,17 +604,9 @@ def main():
     if img.digest:
         manifest_digest = img.digest
     else:
-        tags = module.get_tags(namespace, img.repository, img.tag, only_active_tags=False)
-        if not tags:
+        manifest_digest = module.get_tag_digest(namespace, img.repository, img.tag)
+        if not manifest_digest:
             module.fail_json(msg="The {image} image does not exist.".format(image=image))
-        try:
-            manifest_digest = tags[0]["manifest_digest"]
-        except KeyError:
-            module.fail_json(
-                msg="Cannot retrieve the manifest digest for the {image} image.".format(
-                    image=image
-                )
-            )
 
     full_repo_name = "{namespace}/{repository}".format(
         namespace=namespace, repository=img.repository
@@ -285,6 +671,8 @@ def main():
                     id=lbl.get("id"),
                 )
                 changed = True
+        if changed:
+            forget_labels(module, [(full_repo_name, manifest_digest)])
         module.exit_json(changed=changed)
 
     # Retrieve the labels that might already exist with the given key
@@ -309,6 +697,8 @@ def main():
                 )
                 changed = True
 
+    if changed:
+        forget_labels(module, [(full_repo_name, manifest_digest)])
     if matching_label:
         result = {"changed": changed}
         result.update(matching_label)
@@ -324,6 +714,7 @@ def main():
         full_repo_name=full_repo_name,
         digest=manifest_digest,
     )
+    forget_labels(module, [(full_repo_name, manifest_digest)])
     result = {"changed": True}
     result.update(data.get("label"))
     module.exit_json(**result)
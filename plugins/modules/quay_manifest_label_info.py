@@ -46,6 +46,23 @@ options:
       - Gather information on the labels with that specific key instead of
         returning data on all the labels in the manifest.
     type: str
+  cache_ttl:
+    description:
+      - Number of seconds during which the module uses the labels in the
+        O(cache_dir) cache. After that period, the module retrieves the
+        labels again, because the labels can change.
+      - You can also use C(s), C(m), C(h), C(d), and C(w) suffixes, such as
+        V(30m).
+    type: str
+    default: 1h
+    version_added: '2.9.0'
+notes:
+  - When you set the O(cache_dir) parameter, the module keeps the labels of
+    each manifest in the cache for O(cache_ttl) seconds. The
+    M(infra.quay_configuration.quay_manifest_label) module removes the labels
+    that it updates from the cache when it uses the same cache directory.
+    The module detects the labels that other tools, or the web UI, update
+    only when the cache entry expires.
 attributes:
   check_mode:
     support: full
@@ -58,6 +75,7 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.manifest_cache
 """
 
 EXAMPLES = r"""
@@ -159,6 +177,7 @@ labels:
 
 
 from ..module_utils.api_module import APIModule
+from ..module_utils.manifest_cache import ManifestCache
 from ..module_utils.quay_image import QuayImage
 
 
@@ -166,6 +185,8 @@ def main():
     argument_spec = dict(
         image=dict(required=True),
         key=dict(no_log=True),
+        cache_dir=dict(type="path"),
+        cache_ttl=dict(default="1h"),
     )
 
     # Create a module for ourselves
@@ -174,6 +195,8 @@ def main():
     # Extract our parameters
     image = module.params.get("image").strip("/")
     key = module.params.get("key")
+    cache_ttl = module.str_period_to_second("cache_ttl", module.params.get("cache_ttl"))
+    cache = ManifestCache(module, module.params.get("cache_dir"))
 
     # Get the components of the given image (namespace, repository, tag, digest)
     img = QuayImage(module, image)
@@ -195,17 +218,9 @@ def main():
     if img.digest:
         manifest_digest = img.digest
     else:
-        tags = module.get_tags(namespace, img.repository, img.tag, only_active_tags=False)
-        if not tags:
+        manifest_digest = module.get_tag_digest(namespace, img.repository, img.tag)
+        if not manifest_digest:
             module.exit_json(changed=False, labels=[])
-        try:
-            manifest_digest = tags[0]["manifest_digest"]
-        except KeyError:
-            module.fail_json(
-                msg="Cannot retrieve the manifest digest for the {image} image.".format(
-                    image=image
-                )
-            )
 
     full_repo_name = "{namespace}/{repository}".format(
         namespace=namespace, repository=img.repository
@@ -237,15 +252,19 @@ def main():
     # comes from the Containerfile/Dockerfile.
     # When `source_type' is `api', then the label is mutable (it has been set
     # by using the web UI or from a previous call to the API)
-    res = module.get_object_path(
-        "repository/{full_repo_name}/manifest/{digest}/labels",
-        full_repo_name=full_repo_name,
-        digest=manifest_digest,
-    )
-    if key:
-        labels = [lbl for lbl in res.get("labels", []) if lbl.get("key") == key]
-    else:
+    labels = cache.get("labels", manifest_digest, full_repo_name, cache_ttl)
+    if labels is None:
+        res = module.get_object_path(
+            "repository/{full_repo_name}/manifest/{digest}/labels",
+            full_repo_name=full_repo_name,
+            digest=manifest_digest,
+        )
+        if not res:
+            module.exit_json(changed=False, labels=[])
         labels = res.get("labels", [])
+        cache.set("labels", manifest_digest, labels, full_repo_name)
+    if key:
+        labels = [lbl for lbl in labels if lbl.get("key") == key]
 
     module.exit_json(changed=False, labels=labels)
 
@@ -0,0 +1,430 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_mirror_status
+short_description: Monitor the synchronization of mirrored repositories
+description:
+  - Retrieve the mirror status of all the mirrored repositories of
+    organizations, and report the failed, the stale, and the disabled
+    mirrors.
+  - Optionally trigger an immediate synchronization of the stale mirrors.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  organizations:
+    description:
+      - Names of the organizations or personal namespaces that contain the
+        mirrored repositories.
+      - If you do not set the parameter, then the module processes all the
+        organizations of the Quay installation. In that case, the token that
+        you use in the O(quay_token) parameter must have the C(super:user)
+        scope.
+    type: list
+    elements: str
+  stale_factor:
+    description:
+      - A mirror is stale when its last synchronization is older than that
+        number of times its synchronization interval.
+    type: float
+    default: 2
+  sync_stale:
+    description:
+      - Whether to trigger an immediate synchronization of the stale mirrors.
+      - The module does not trigger a synchronization for the disabled
+        mirrors, and for the mirrors that are already synchronizing.
+    type: bool
+    default: false
+notes:
+  - The module processes the repositories in the C(MIRROR) state.
+  - The user account associated with the token that you provide in
+    O(quay_token) must have administrator access to the repositories.
+  - The API does not return the date of the last synchronization. The module
+    estimates that date as the date of the next scheduled synchronization
+    (C(sync_start_date)) minus the synchronization interval
+    (C(sync_interval)).
+  - The module retrieves the mirror configurations, and triggers the
+    synchronizations, in parallel. See the O(concurrency) parameter.
+  - Your Quay administrator must enable the mirroring capability of your Quay
+    installation (C(FEATURE_REPO_MIRROR) in C(config.yaml)) to use this module.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Report the state of the mirrors of two organizations
+  infra.quay_configuration.quay_mirror_status:
+    organizations:
+      - mirrors
+      - thirdparty
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: mirrors
+
+- name: Display the failed mirrors
+  ansible.builtin.debug:
+    msg: "{{ mirrors['repositories'] | selectattr('failed') | map(attribute='repository') }}"
+
+- name: Resynchronize the mirrors that did not run for three intervals
+  infra.quay_configuration.quay_mirror_status:
+    stale_factor: 3
+    sync_stale: true
+    concurrency: 4
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+summary:
+  description: Summary for all the mirrored repositories.
+  returned: always
+  type: dict
+  contains:
+    repositories:
+      description: Number of mirrored repositories.
+      type: int
+      sample: 600
+    disabled:
+      description: Number of disabled mirrors.
+      type: int
+      sample: 4
+    statuses:
+      description: Number of mirrors for each synchronization status.
+      type: dict
+      sample: {"SUCCESS": 571, "FAIL": 9, "SYNCING": 12, "NEVER_RUN": 8}
+    failed:
+      description: Number of mirrors in the C(FAIL) status.
+      type: int
+      sample: 9
+    stale:
+      description: Number of enabled mirrors that are stale.
+      type: int
+      sample: 14
+    retries_exhausted:
+      description: Number of mirrors that have no synchronization retry left.
+      type: int
+      sample: 3
+    synced:
+      description: Number of mirrors for which the module triggered a
+        synchronization.
+      type: int
+      sample: 14
+    unavailable:
+      description:
+        - Number of mirrored repositories for which the module cannot
+          retrieve the mirror configuration, because of missing permissions
+          for example.
+      type: int
+      sample: 0
+repositories:
+  description:
+    - The mirrors that need attention, which are the failed, the stale, the
+      disabled, and the unavailable mirrors, and the mirrors that have no
+      synchronization retry left.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Name of the repository, including its namespace.
+      type: str
+      sample: mirrors/ubi9
+    is_enabled:
+      description: Whether the mirror is enabled.
+      type: bool
+      sample: true
+    external_reference:
+      description: The remote repository.
+      type: str
+      sample: registry.access.redhat.com/ubi9/ubi
+    sync_status:
+      description:
+        - Status of the synchronization.
+        - V(null) if the mirror configuration is unavailable.
+      type: str
+      sample: FAIL
+    sync_interval:
+      description: Synchronization interval, in seconds.
+      type: int
+      sample: 86400
+    sync_start_date:
+      description: Date of the next scheduled synchronization.
+      type: str
+      sample: "2026-10-12T06:00:00Z"
+    sync_retries_remaining:
+      description: Number of synchronization retries left.
+      type: int
+      sample: 0
+    failed:
+      description: Whether the mirror is in the C(FAIL) status.
+      type: bool
+      sample: true
+    stale:
+      description: Whether the enabled mirror is stale.
+      type: bool
+      sample: true
+    synced:
+      description: Whether the module triggered a synchronization.
+      type: bool
+      sample: true
+"""
+
+import calendar
+import time
+
+from ..module_utils.api_module import APIModule, APIModuleError
+
+# Synchronization statuses of the mirrors that are synchronizing
+PENDING_STATUSES = ("SYNC_NOW", "SYNCING")
+
+
+def parse_date(value):
+    """Convert an ISO 8601 UTC date into seconds since the epoch.
+
+    :param value: The date, such as ``2026-10-12T06:00:00Z``.
+    :type value: str
+
+    :return: The number of seconds, or ``None`` if the date is invalid.
+    :rtype: int
+    """
+    if not value:
+        return None
+    try:
+        return calendar.timegm(time.strptime(value[:19], "%Y-%m-%dT%H:%M:%S"))
+    except ValueError:
+        return None
+
+
+def get_mirror(module, repository, stale_factor, now):
+    """Retrieve the mirror configuration of a repository.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param repository: The name of the repository, including its namespace.
+    :type repository: str
+    :param stale_factor: The number of intervals after which a mirror is
+                         stale.
+    :type stale_factor: float
+    :param now: The reference time, in seconds since the epoch.
+    :type now: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The status of the mirror.
+    :rtype: dict
+    """
+    # Get the repository mirror configuration details
+    #
+    # GET /api/v1/repository/{namespace}/{repository}/mirror
+    # {
+    #     "is_enabled": true,
+    #     "external_reference": "quay.io/projectquay/quay",
+    #     "sync_interval": 86400,
+    #     "sync_start_date": "2021-01-01T12:00:00Z",
+    #     "sync_expiration_date": null,
+    #     "sync_retries_remaining": 3,
+    #     "sync_status": "NEVER_RUN",
+    #     ...
+    # }
+    mirror = module.get_object_path(
+        "repository/{full_repo_name}/mirror",
+        exit_on_error=False,
+        ok_error_codes=[404, 403],
+        duplicate_underscore=False,
+        full_repo_name=repository,
+    )
+    record = {
+        "repository": repository,
+        "is_enabled": None,
+        "external_reference": None,
+        "sync_status": None,
+        "sync_interval": None,
+        "sync_start_date": None,
+        "sync_retries_remaining": None,
+        "failed": False,
+        "stale": False,
+        "synced": False,
+    }
+    if not mirror:
+        return record
+    for key in (
+        "is_enabled",
+        "external_reference",
+        "sync_status",
+        "sync_interval",
+        "sync_start_date",
+        "sync_retries_remaining",
+    ):
+        record[key] = mirror.get(key)
+    record["failed"] = record["sync_status"] == "FAIL"
+
+    # The next synchronization is scheduled one interval after the last one
+    interval = record["sync_interval"]
+    next_sync = parse_date(record["sync_start_date"])
+    if record["is_enabled"] and interval and next_sync is not None:
+        record["stale"] = now - (next_sync - interval) > stale_factor * interval
+    return record
+
+
+def sync_now(module, record):
+    """Trigger an immediate synchronization of a mirror.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param record: The status of the mirror (see :py:func:``get_mirror``).
+    :type record: dict
+
+    :raises APIModuleError: An API error occurred.
+    """
+    module.create(
+        "repository",
+        record["repository"],
+        "repository/{full_repo_name}/mirror/sync-now",
+        {},
+        auto_exit=False,
+        exit_on_error=False,
+        full_repo_name=record["repository"],
+    )
+    record["synced"] = True
+
+
+def main():
+    argument_spec = dict(
+        organizations=dict(type="list", elements="str"),
+        stale_factor=dict(type="float", default=2),
+        sync_stale=dict(type="bool", default=False),
+        concurrency=dict(type="int", default=8),
+    )
+
+    # Create a module for ourselves
+    module = APIModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    # Extract our parameters
+    organizations = module.params.get("organizations")
+    stale_factor = module.params.get("stale_factor")
+    sync_stale = module.params.get("sync_stale")
+    concurrency = module.params.get("concurrency")
+
+    if stale_factor <= 0:
+        module.fail_json(msg="The `stale_factor' parameter must be a positive number.")
+
+    if organizations is None:
+        # Get the organizations
+        #
+        # GET /api/v1/superuser/organizations/
+        # {
+        #   "organizations": [
+        #     {
+        #       "name": "mirrors",
+        #       ...
+        #     }
+        #   ],
+        #   "next_page": "gAAAAABh...Wx1a"
+        # }
+        organizations = [
+            org["name"]
+            for org in module.iter_pages("superuser/organizations/", "organizations")
+        ]
+    else:
+        for organization in organizations:
+            if not module.get_namespace(organization):
+                module.fail_json(
+                    msg="The {namespace} namespace does not exist.".format(
+                        namespace=organization
+                    )
+                )
+
+    repositories = []
+    for organization in organizations:
+        for repo in module.iter_pages(
+            "repository", "repositories", query_params={"namespace": organization}
+        ):
+            if repo.get("state") == "MIRROR":
+                repositories.append(
+                    "{namespace}/{name}".format(namespace=organization, name=repo["name"])
+                )
+
+    now = int(time.time())
+    try:
+        records = module.run_concurrently(
+            lambda repository: get_mirror(module, repository, stale_factor, now),
+            repositories,
+            concurrency,
+        )
+        if sync_stale:
+            module.run_concurrently(
+                lambda record: sync_now(module, record),
+                [
+                    r
+                    for r in records
+                    if r["stale"] and r["sync_status"] not in PENDING_STATUSES
+                ],
+                concurrency,
+            )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    summary = {
+        "repositories": len(records),
+        "disabled": 0,
+        "statuses": {},
+        "failed": 0,
+        "stale": 0,
+        "retries_exhausted": 0,
+        "synced": 0,
+        "unavailable": 0,
+    }
+    attention = []
+    for record in records:
+        status = record["sync_status"]
+        if status is None:
+            summary["unavailable"] += 1
+            attention.append(record)
+            continue
+        summary["statuses"][status] = summary["statuses"].get(status, 0) + 1
+        exhausted = record["sync_retries_remaining"] == 0
+        summary["disabled"] += 0 if record["is_enabled"] else 1
+        summary["failed"] += 1 if record["failed"] else 0
+        summary["stale"] += 1 if record["stale"] else 0
+        summary["retries_exhausted"] += 1 if exhausted else 0
+        summary["synced"] += 1 if record["synced"] else 0
+        if not record["is_enabled"] or record["failed"] or record["stale"] or exhausted:
+            attention.append(record)
+
+    module.exit_json(changed=summary["synced"] > 0, summary=summary, repositories=attention)
+
+
+if __name__ == "__main__":
+    main()
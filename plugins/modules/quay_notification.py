@@ -319,18 +319,6 @@ from ..module_utils.api_module import APIModule
 
 
 def main():
-    # Ordered list of the vulnerability levels. This list is also used to map
-    # each level name to its ID. The ID is the index the level in the list.
-    # The ID is used in the POST request.
-    vulnerability_level_names = [
-        "critical",
-        "high",
-        "medium",
-        "low",
-        "negligible",
-        "unknown",
-    ]
-
     argument_spec = dict(
         repository=dict(required=True),
         title=dict(),
@@ -359,7 +347,7 @@ def main():
                 "webhook",
             ]
         ),
-        vulnerability_level=dict(choices=vulnerability_level_names),
+        vulnerability_level=dict(choices=APIModule.VULNERABILITY_LEVELS),
         image_expiry_days=dict(type="int", default=7),
         config=dict(
             type="dict",
@@ -561,147 +549,15 @@ def main():
             )
 
         # Gather and verify the parameters
-        new_fields = {"eventConfig": {}, "event_config": {}, "config": {}}
-        missing_parameters = []
-        if title:
-            new_fields["title"] = title
-        else:
-            missing_parameters.append("title")
-        if event:
-            new_fields["event"] = event
-        else:
-            missing_parameters.append("event")
-        if method:
-            new_fields["method"] = method
-        else:
-            missing_parameters.append("method")
-        if not config:
-            missing_parameters.append("config")
-        if missing_parameters:
-            module.fail_json(
-                msg="Some required parameters are not provided: {params}".format(
-                    params=", ".join(missing_parameters)
-                )
-            )
-
-        if method == "email":
-            email = config.get("email")
-            if email:
-                new_fields["config"]["email"] = email
-            else:
-                module.fail_json(
-                    msg=(
-                        "The email notification method requires the"
-                        " `email' configuration option."
-                    )
-                )
-        elif method == "flowdock":
-            flow_api_token = config.get("flow_api_token")
-            if flow_api_token:
-                new_fields["config"]["flow_api_token"] = flow_api_token
-            else:
-                module.fail_json(
-                    msg=(
-                        "The Flowdock notification method requires the"
-                        " `flow_api_token' configuration option."
-                    )
-                )
-        elif method == "hipchat":
-            room_id = config.get("room_id")
-            if room_id:
-                new_fields["config"]["room_id"] = room_id
-            else:
-                module.fail_json(
-                    msg=(
-                        "The HipChat notification method requires the"
-                        " `room_id' and `notification_token' configuration options."
-                    )
-                )
-            notification_token = config.get("notification_token")
-            if notification_token:
-                new_fields["config"]["notification_token"] = notification_token
-            else:
-                module.fail_json(
-                    msg=(
-                        "The HipChat notification method requires the"
-                        " `room_id' and `notification_token' configuration options."
-                    )
-                )
-        elif method == "slack":
-            url = config.get("url")
-            if url:
-                new_fields["config"]["url"] = url
-            else:
-                module.fail_json(
-                    msg=(
-                        "The Slack notification method requires the"
-                        " `url' configuration option."
-                    )
-                )
-        elif method == "webhook":
-            url = config.get("url")
-            if url:
-                new_fields["config"]["url"] = url
-            else:
-                module.fail_json(
-                    msg=(
-                        "The webhook POST notification method requires the"
-                        " `url' configuration option."
-                    )
-                )
-            template = config.get("template")
-            if template:
-                new_fields["config"]["template"] = template
-        elif method == "quay_notification":
-            name = config.get("name")
-            if not name:
-                module.fail_json(
-                    msg=(
-                        "The Quay notification method requires the"
-                        " `name' configuration option."
-                    )
-                )
-            kind = config.get("type")
-            new_fields["config"]["target"] = {"name": name, "kind": kind}
-            if kind == "user":
-                user_details = module.get_account(name)
-                if not user_details:
-                    module.fail_json(
-                        msg=(
-                            "The {user} user account in the"
-                            " `name' parameter does not exist."
-                        ).format(user=name)
-                    )
-                if user_details.get("is_robot"):
-                    module.fail_json(
-                        msg=(
-                            "{user} in the `name' parameter is a robot account."
-                            " You cannot use robot accounts for notifications."
-                        ).format(user=name)
-                    )
-            if kind == "team" and not module.get_team(namespace, name):
-                module.fail_json(
-                    msg=(
-                        "The {team} team in the `name' parameter does not"
-                        " exist in the {orgname} organization."
-                    ).format(team=name, orgname=namespace)
-                )
-            if kind == "org" and not module.get_organization(name):
-                module.fail_json(
-                    msg=(
-                        "The {orgname} organization in the `name' parameter"
-                        " does not exist."
-                    ).format(orgname=name)
-                )
-
-        if event == "vulnerability_found" and vulnerability_level is not None:
-            new_fields["eventConfig"]["level"] = new_fields["event_config"]["level"] = str(
-                vulnerability_level_names.index(vulnerability_level)
-            )
-        elif event == "repo_image_expiry":
-            new_fields["eventConfig"]["days"] = new_fields["event_config"]["days"] = int(
-                image_expiry_days
-            )
+        new_fields = module.process_notification_parameters(
+            namespace,
+            title,
+            event,
+            method,
+            config,
+            vulnerability_level,
+            image_expiry_days,
+        )
 
         match_notifications.append(
             module.create(
@@ -130,7 +130,8 @@ RETURN = r""" # """
 
 import re
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_organization
 
 
 def main():
@@ -243,28 +244,10 @@ def main():
     # Renaming the organization (requires superuser permissions)
     created = False
     if new_name:
-        # The original organization does not exists...
+        # The original organization does not exists. Use the new organization
+        # in the rest of the module, and create it if it does not exist either.
         if not org_details:
-            # and neither the new organization. Create that new organization.
-            if not new_org_details:
-                new_fields = {"name": new_name}
-                if email:
-                    new_fields["email"] = email
-                module.create(
-                    "organization",
-                    new_name,
-                    "organization/",
-                    new_fields,
-                    auto_exit=False,
-                )
-                created = True
-            else:
-                # The original organization does not exists but the new one
-                # does. Use that new organization in the rest of the module.
-                org_details = new_org_details
-            # Use the new organization name in the rest of the module
-            name = new_name
-            new_name = None
+            org_details = new_org_details
         else:
             # The original organization exists. Rename it.
             # Requires superuser permissions.
@@ -278,38 +261,21 @@ def main():
                 orgname=name,
             )
             created = True
-            name = new_name
-            new_name = None
-    elif not org_details:
-        new_fields = {"name": name}
-        if email:
-            new_fields["email"] = email
-        module.create(
-            "organization",
+        # Use the new organization name in the rest of the module
+        name = new_name
+
+    # Create or update the organization
+    try:
+        actions = apply_organization(
+            module,
             name,
-            "organization/",
-            new_fields,
-            auto_exit=False,
+            org_details,
+            email,
+            tag_expiration_s if tm_expiration else None,
         )
-        created = True
-
-    # Prepare the data that gets set for update
-    new_fields = {}
-    if tm_expiration:
-        new_fields["tag_expiration_s"] = tag_expiration_s
-    if email:
-        new_fields["email"] = email
-
-    # Update the organization
-    updated, _not_used = module.update(
-        org_details,
-        "organization",
-        name,
-        "organization/{orgname}",
-        new_fields,
-        auto_exit=False,
-        orgname=name,
-    )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    updated = bool(actions)
 
     #
     # Process the auto-pruning tags policy configuration
@@ -0,0 +1,1430 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_organization_apply
+short_description: Apply a complete organization configuration in one task
+description:
+  - Create and configure an organization, with its user accounts, auto-pruning
+    and tag immutability policies, proxy cache, robot accounts, teams, default
+    permissions, OAuth applications, repositories, and quota, in a single
+    task.
+  - The module accepts the same data model as the
+    R(infra.quay_configuration.quay_org,ansible_collections.infra.quay_configuration.quay_org_role)
+    role, without the C(quay_org_) prefix, and applies the configuration the
+    same way the role does.
+  - The module builds a dependency graph between the objects. For example,
+    the teams are processed after the user and robot accounts that they
+    include, and the repositories are processed after the teams and the
+    accounts that their permissions reference, and after the default
+    permissions. The objects that do not depend on each other are processed
+    in parallel, and all the API requests share the same authenticated
+    session.
+  - When the processing of an object fails, the module skips the objects
+    that depend on it, continues with the other objects, and then reports
+    the failure.
+  - In check mode, the module reports the operations it would perform for
+    each object (the plan). With the O(plan_file) parameter, the module also
+    saves that plan in a file, so that a later run can report the objects
+    that changed since the review, and skip the objects that did not change
+    and need no operation.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  name:
+    description:
+      - Name of the organization to create and configure.
+    required: true
+    type: str
+    aliases: [organization]
+  email:
+    description:
+      - Email address to associate with the organization.
+    type: str
+  users:
+    description:
+      - User accounts to create. See the M(infra.quay_configuration.quay_user)
+        module.
+    type: list
+    elements: dict
+    suboptions:
+      username:
+        description:
+          - Name of the user account.
+        required: true
+        type: str
+      email:
+        description:
+          - User's email address.
+        type: str
+      password:
+        description:
+          - User's password as a clear string.
+        type: str
+  prune:
+    description:
+      - Auto-pruning policies for the organization. The module does not
+        remove the existing policies that are not in the list.
+    type: list
+    elements: dict
+    suboptions:
+      method:
+        description:
+          - Method to use for the auto-pruning tags policy.
+        required: true
+        type: str
+        choices: [tags, date]
+      value:
+        description:
+          - Number of tags to keep when O(prune[].method=tags), or period of
+            time when O(prune[].method=date).
+        required: true
+        type: str
+      tag_pattern:
+        description:
+          - Regular expression to select the tags to process.
+        type: str
+      tag_pattern_matches:
+        description:
+          - Whether to process the tags that match O(prune[].tag_pattern), or
+            the tags that do not match.
+        type: bool
+        default: true
+  immutability:
+    description:
+      - Tag immutability policies for the organization.
+      - The tag immutability feature requires Quay version 3.17 or later.
+    type: list
+    elements: dict
+    suboptions:
+      tag_pattern:
+        description:
+          - Regular expression to select the tags to protect.
+        required: true
+        type: str
+      behavior:
+        description:
+          - Whether the tags that match the pattern are immutable, or the tags
+            that do not match.
+          - V(matching_immutable) for new policies by default.
+        type: str
+        choices: [matching_immutable, not_matching_immutable]
+  cache_registry:
+    description:
+      - Name of the remote registry to use for the proxy cache configuration.
+        See the M(infra.quay_configuration.quay_proxy_cache) module.
+    type: str
+  cache_username:
+    description:
+      - Name of the user account for authenticating with the remote registry.
+    type: str
+  cache_password:
+    description:
+      - Password for authenticating with the remote registry.
+    type: str
+  cache_insecure:
+    description:
+      - Whether to allow insecure connections to the remote registry.
+    type: bool
+  cache_expiration:
+    description:
+      - Tag expiration for cached images. Accepts the C(s), C(m), C(h), C(d),
+        and C(w) suffixes. 86400 (one day) by default.
+    type: str
+  robots:
+    description:
+      - Robot accounts to create in the organization.
+      - The module sets the federations of the robot accounts to the given
+        list.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the robot account, with or without the C(organization)+
+            prefix.
+        required: true
+        type: str
+      description:
+        description:
+          - Description of the robot account. You cannot update the
+            description of existing robot accounts.
+        type: str
+      federations:
+        description:
+          - Federation configurations of the robot account.
+        type: list
+        elements: dict
+        suboptions:
+          issuer:
+            description:
+              - OpenID Connect (OIDC) issuer URL.
+            required: true
+            type: str
+          subject:
+            description:
+              - OpenID Connect (OIDC) subject.
+            required: true
+            type: str
+  teams:
+    description:
+      - Teams to create in the organization.
+      - The module sets the members of the teams to the given lists.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the team.
+        required: true
+        type: str
+      role:
+        description:
+          - Role of the team within the organization. V(member) for new
+            teams by default.
+        type: str
+        choices: [member, creator, admin]
+      description:
+        description:
+          - Text in Markdown format that describes the team.
+        type: str
+      members:
+        description:
+          - User and robot accounts in the team. Use the syntax
+            C(organization)+C(robotshortname) for robot accounts.
+        type: list
+        elements: str
+  default_perms:
+    description:
+      - Default repository permissions for the organization. The module
+        does not remove the existing default permissions that are not in the
+        list.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the user, robot, or team that gets permission to new
+            repositories. For robot accounts use the
+            C(organization)+C(shortrobotname) format.
+        required: true
+        type: str
+      type:
+        description:
+          - Type of the account. Choose V(user) for both user and robot
+            accounts.
+        type: str
+        choices: [user, team]
+        default: user
+      role:
+        description:
+          - Permission that Quay grants on new repositories.
+          - When the module creates the default permission, V(read) by
+            default. When the default permission already exists and you do
+            not set the parameter, the module does not change its role.
+        type: str
+        choices: [read, write, admin]
+      creator:
+        description:
+          - Only apply the default permission to the repositories that this
+            user creates.
+        type: str
+  applications:
+    description:
+      - OAuth applications to create in the organization.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the application.
+        required: true
+        type: str
+      description:
+        description:
+          - Description for the application.
+        type: str
+      application_uri:
+        description:
+          - URL to the application home page.
+        type: str
+      redirect_uri:
+        description:
+          - Prefix of the application's OAuth redirection/callback URLs.
+        type: str
+      avatar_email:
+        description:
+          - Email address that represents the avatar for the application.
+        type: str
+  repositories:
+    description:
+      - Repositories to create in the organization.
+      - The module adds the given permissions, auto-pruning policies, and
+        tag immutability policies, but does not remove the existing ones.
+    type: list
+    elements: dict
+    suboptions:
+      name:
+        description:
+          - Name of the repository, without the organization part.
+        required: true
+        type: str
+      visibility:
+        description:
+          - Visibility of the repository. V(private) for new repositories by
+            default.
+        type: str
+        choices: [public, private]
+      description:
+        description:
+          - Text in Markdown format that describes the repository.
+        type: str
+      perms:
+        description:
+          - User, robot, and team permissions to associate with the
+            repository.
+        type: list
+        elements: dict
+        suboptions:
+          type:
+            description:
+              - Type of the account. Choose V(user) for both user and robot
+                accounts.
+            type: str
+            choices: [user, team]
+            default: user
+          name:
+            description:
+              - Name of the account. The format for robot accounts is
+                C(organization)+C(shortrobotname).
+            required: true
+            type: str
+          role:
+            description:
+              - Type of permission to grant.
+            type: str
+            choices: [read, write, admin]
+            default: read
+      repo_state:
+        description:
+          - State of the repository.
+        type: str
+        choices: [NORMAL, READ_ONLY, MIRROR]
+      prune:
+        description:
+          - Auto-pruning policies for the repository.
+        type: list
+        elements: dict
+        suboptions:
+          method:
+            description:
+              - Method to use for the auto-pruning tags policy.
+            required: true
+            type: str
+            choices: [tags, date]
+          value:
+            description:
+              - Number of tags to keep, or period of time.
+            required: true
+            type: str
+          tag_pattern:
+            description:
+              - Regular expression to select the tags to process.
+            type: str
+          tag_pattern_matches:
+            description:
+              - Whether to process the tags that match the pattern, or the
+                tags that do not match.
+            type: bool
+            default: true
+      immutability:
+        description:
+          - Tag immutability policies for the repository.
+        type: list
+        elements: dict
+        suboptions:
+          tag_pattern:
+            description:
+              - Regular expression to select the tags to protect.
+            required: true
+            type: str
+          behavior:
+            description:
+              - Whether the tags that match the pattern are immutable, or the
+                tags that do not match.
+            type: str
+            choices: [matching_immutable, not_matching_immutable]
+  quota:
+    description:
+      - Quota for the organization. You can use the K[i]B, M[i]B, G[i]B, or
+        T[i]B suffixes.
+    type: str
+  warning_pct:
+    description:
+      - Warning (soft) limit as a percentage of the quota. V(0) removes the
+        limit.
+    type: int
+  reject_pct:
+    description:
+      - Reject (hard) limit as a percentage of the quota. V(0) removes the
+        limit.
+    type: int
+  plan_file:
+    description:
+      - Path to a plan file on the managed node.
+      - In check mode, the module writes the plan to that file. For each
+        object, the plan includes the operations that the module would
+        perform, and a validator for each API object that the module read.
+        The validator is the C(ETag) header when Quay returns one, or a hash
+        of the returned content.
+      - Otherwise, the module reads the plan from that file. The module
+        verifies the validators by reading the API objects once, in
+        parallel. The module skips the objects that did not change and for
+        which the plan includes no operation. For the other objects, the
+        module computes and performs the operations from the parameters, as
+        without a plan file.
+      - The plan does not include any API request, only the operations to
+        review. The module never sends requests that it reads from the plan
+        file, and the plan does not include the values of the secret
+        parameters, such as O(users[].password) or O(cache_password).
+      - The module fails if the plan was created with different parameters.
+    type: path
+notes:
+  - The module does not support the deprecated C(auto_prune_method) and
+    C(auto_prune_value) parameters of the role. Use the O(prune) and
+    O(repositories[].prune) parameters instead.
+  - Creating user accounts requires superuser permissions.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Ensure the production organization is configured
+  infra.quay_configuration.quay_organization_apply:
+    name: production
+    email: production@example.com
+    users:
+      - username: lvasquez
+        email: lvasquez@example.com
+      - username: dwilde
+        email: dwilde@example.com
+    robots:
+      - name: robotprod
+        description: Robot account for production
+    teams:
+      - name: ops
+        role: creator
+        members:
+          - dwilde
+          - production+robotprod
+    default_perms:
+      - name: ops
+        type: team
+        role: write
+    repositories:
+      - name: small_image
+        visibility: public
+        perms:
+          - name: ops
+            type: team
+            role: admin
+        prune:
+          - method: tags
+            value: 5
+    quota: 1.5 TiB
+    warning_pct: 90
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Apply the variables of the quay_org role in one task
+  infra.quay_configuration.quay_organization_apply:
+    name: "{{ quay_org_name }}"
+    email: "{{ quay_org_email | default(omit) }}"
+    users: "{{ quay_org_users | default(omit) }}"
+    robots: "{{ quay_org_robots | default(omit) }}"
+    teams: "{{ quay_org_teams | default(omit) }}"
+    default_perms: "{{ quay_org_default_perms | default(omit) }}"
+    repositories: "{{ quay_org_repositories | default(omit) }}"
+    quay_host: "{{ quay_org_host }}"
+    quay_token: "{{ quay_org_token }}"
+  check_mode: true
+  register: plan
+
+- name: Save the plan for the review
+  infra.quay_configuration.quay_organization_apply:
+    name: production
+    email: production@example.com
+    robots:
+      - name: robotprod
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+    plan_file: /var/tmp/production.plan
+  check_mode: true
+
+- name: Apply the reviewed plan
+  infra.quay_configuration.quay_organization_apply:
+    name: production
+    email: production@example.com
+    robots:
+      - name: robotprod
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+    plan_file: /var/tmp/production.plan
+"""
+
+RETURN = r"""
+results:
+  description:
+    - Result for each object, in the order of the dependency graph.
+    - In check mode, RV(results[].actions) lists the operations that the
+      module would perform (the plan).
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    kind:
+      description:
+        - Type of the object (C(user), C(organization), C(prune),
+          C(immutability), C(proxy_cache), C(robot), C(team),
+          C(default_perms), C(application), C(repository), or C(quota)).
+      type: str
+      returned: always
+      sample: team
+    name:
+      description: Name of the object.
+      type: str
+      returned: always
+      sample: ops
+    status:
+      description:
+        - V(changed), V(unchanged), V(failed), or V(skipped). The module
+          skips the objects that depend on a failed object.
+      type: str
+      returned: always
+      sample: changed
+    actions:
+      description: Operations performed, or to perform in check mode.
+      type: list
+      elements: str
+      returned: always
+      sample: ["create team", "add member dwilde"]
+    msg:
+      description: Error message, or reason for skipping the object.
+      type: str
+      returned: when RV(results[].status) is V(failed) or V(skipped)
+      sample: "Skipped because team ops failed."
+    plan:
+      description:
+        - V(replayed) when the object did not change since the creation of
+          the plan, and the module performed the operations of the plan.
+        - V(recomputed) when the object changed since the creation of the
+          plan. The operations that the module performed might differ from
+          the plan.
+      type: str
+      returned: when the module applies a plan file
+      sample: replayed
+  sample: [
+      {
+        "kind": "organization",
+        "name": "production",
+        "status": "unchanged",
+        "actions": []
+      },
+      {
+        "kind": "team",
+        "name": "ops",
+        "status": "changed",
+        "actions": ["create team", "add member dwilde"]
+      }
+    ]
+plan_file:
+  description: Path to the plan file.
+  returned: when you set the O(plan_file) parameter
+  type: str
+  sample: /var/tmp/production.plan
+"""
+
+import io
+import json
+import threading
+
+from ..module_utils import reconcile
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.output_file import OutputFile
+
+# Order in which the objects are reported. The order is the same as the
+# order in which the quay_org role processes the objects.
+KINDS = [
+    "user",
+    "organization",
+    "prune",
+    "immutability",
+    "proxy_cache",
+    "robot",
+    "team",
+    "default_perms",
+    "application",
+    "repository",
+    "quota",
+]
+
+
+def robot_full_name(organization, name):
+    """Return the robot account name with the organization prefix.
+
+    :param organization: Name of the organization.
+    :type organization: str
+    :param name: Short or full name of the robot account.
+    :type name: str
+
+    :return: The name in the ``organization+shortname`` format.
+    :rtype: str
+    """
+    return name if "+" in name else "{org}+{name}".format(org=organization, name=name)
+
+
+# The following functions retrieve the current state of an object and then
+# call the function that the standalone module of that object also uses.
+# They receive the execution context and the definition of the object.
+
+
+def apply_user(ctx, user):
+    """Create or update a user account."""
+    module = ctx["module"]
+    username = user["username"]
+    user_details = module.get_object_path(
+        "superuser/users/{username}", exit_on_error=False, username=username
+    )
+    if user_details and user_details.get("super_user"):
+        module.warn(
+            "The {name} user is a superuser. You cannot delete or update superusers.".format(
+                name=username
+            )
+        )
+        return []
+    return reconcile.apply_user(
+        module, username, user_details, user.get("email"), user.get("password")
+    )
+
+
+def apply_organization(ctx, _not_used):
+    """Create or update the organization."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    return reconcile.apply_organization(
+        module,
+        organization,
+        module.get_organization(organization, exit_on_error=False),
+        ctx["params"].get("email"),
+    )
+
+
+def apply_org_prune(ctx, _not_used):
+    """Create the auto-pruning policies of the organization."""
+    module = ctx["module"]
+    endpoint = "organization/{orgname}/autoprunepolicy/"
+    resp = module.get_object_path(endpoint, exit_on_error=False, orgname=ctx["organization"])
+    actions, _not_used = reconcile.apply_prune_policies(
+        module,
+        endpoint,
+        resp.get("policies", []) if resp else [],
+        ctx["prune"],
+        orgname=ctx["organization"],
+    )
+    return actions
+
+
+def apply_immutability(module, endpoint, policies, **kwargs):
+    """Create or update tag immutability policies.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param endpoint: The ``immutabilitypolicy/`` endpoint of the organization
+                     or the repository.
+    :type endpoint: str
+    :param policies: The policies (``tag_pattern`` and ``behavior`` keys).
+    :type policies: list
+    :param kwargs: Parameters to substitute in ``endpoint``.
+    :type kwargs: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The performed operations.
+    :rtype: list
+    """
+    resp = module.get_object_path(endpoint, exit_on_error=False, **kwargs)
+    current = dict((p.get("tagPattern", ""), p) for p in (resp or {}).get("policies", []))
+    actions = []
+    for policy in policies:
+        actions.extend(
+            reconcile.apply_immutability_policy(
+                module,
+                endpoint,
+                current.get(policy["tag_pattern"]),
+                policy["tag_pattern"],
+                policy.get("behavior"),
+                **kwargs
+            )
+        )
+    return actions
+
+
+def apply_org_immutability(ctx, _not_used):
+    """Create or update the tag immutability policies of the organization."""
+    return apply_immutability(
+        ctx["module"],
+        "organization/{orgname}/immutabilitypolicy/",
+        ctx["params"]["immutability"],
+        orgname=ctx["organization"],
+    )
+
+
+def apply_proxy_cache(ctx, _not_used):
+    """Configure the proxy cache of the organization."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    params = ctx["params"]
+    return reconcile.apply_proxy_cache(
+        module,
+        organization,
+        module.get_object_path(
+            "organization/{orgname}/proxycache", exit_on_error=False, orgname=organization
+        ),
+        params.get("cache_registry"),
+        params.get("cache_username"),
+        params.get("cache_password"),
+        params.get("cache_insecure"),
+        ctx["cache_expiration"],
+    )
+
+
+def apply_robot(ctx, robot):
+    """Create a robot account and set its federations."""
+    module = ctx["module"]
+    name = robot_full_name(ctx["organization"], robot["name"])
+    namespace, shortname = name.split("+", 1)
+    path_url = "organization/{orgname}/robots/{robot_shortname}".format(
+        orgname=namespace, robot_shortname=shortname
+    )
+    actions, _not_used = reconcile.apply_robot(
+        module,
+        name,
+        path_url,
+        module.get_object_path(path_url, ok_error_codes=[400, 404], exit_on_error=False),
+        robot.get("description"),
+        robot.get("federations"),
+        append=False,
+    )
+    return actions
+
+
+def apply_team(ctx, team):
+    """Create or update a team and set its members."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    org_details = module.get_organization(organization, exit_on_error=False) or {}
+    return reconcile.apply_team(
+        module,
+        organization,
+        team["name"],
+        org_details.get("teams", {}).get(team["name"]),
+        team.get("role"),
+        team.get("description"),
+        team.get("members"),
+        append=False,
+        known_accounts=ctx["accounts"],
+    )
+
+
+def apply_default_perms(ctx, _not_used):
+    """Create or update the default permissions of the organization."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    resp = module.get_object_path(
+        "organization/{orgname}/prototypes", exit_on_error=False, orgname=organization
+    )
+    actions, _not_used = reconcile.apply_default_perms(
+        module,
+        organization,
+        module.get_organization(organization, exit_on_error=False) or {},
+        resp.get("prototypes", []) if resp else [],
+        ctx["params"]["default_perms"],
+        known_accounts=ctx["accounts"],
+        known_teams=ctx["teams"],
+    )
+    return actions
+
+
+def apply_application(ctx, application):
+    """Create or update an OAuth application."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    name = application["name"]
+    resp = module.get_object_path(
+        "organization/{orgname}/applications", exit_on_error=False, orgname=organization
+    )
+    app_details = None
+    for app in (resp or {}).get("applications", []):
+        if app.get("name") == name:
+            app_details = app
+            break
+    actions, _not_used = reconcile.apply_application(
+        module,
+        organization,
+        name,
+        app_details,
+        application.get("description"),
+        application.get("application_uri"),
+        application.get("redirect_uri"),
+        application.get("avatar_email"),
+    )
+    return actions
+
+
+def apply_repository(ctx, repository):
+    """Create or update a repository, its permissions, and its policies."""
+    module = ctx["module"]
+    namespace = ctx["organization"]
+    shortname = repository["name"]
+    full_repo_name = "{namespace}/{repository}".format(
+        namespace=namespace, repository=shortname
+    )
+    actions = reconcile.apply_repository(
+        module,
+        namespace,
+        shortname,
+        module.get_object_path(
+            "repository/{full_repo_name}", exit_on_error=False, full_repo_name=full_repo_name
+        ),
+        repository.get("description"),
+        repository.get("visibility"),
+        repository.get("repo_state"),
+    )
+
+    perms = repository.get("perms") or []
+    for kind, known_names in (("team", ctx["teams"]), ("user", ctx["accounts"])):
+        actions.extend(
+            reconcile.apply_repository_perms(
+                module,
+                full_repo_name,
+                kind,
+                set(
+                    [(p["name"], p.get("role") or "read") for p in perms if p["type"] == kind]
+                ),
+                known_names=known_names,
+            )
+        )
+
+    if repository.get("prune"):
+        endpoint = "repository/{full_repo_name}/autoprunepolicy/"
+        resp = module.get_object_path(
+            endpoint, exit_on_error=False, full_repo_name=full_repo_name
+        )
+        prune_actions, _not_used = reconcile.apply_prune_policies(
+            module,
+            endpoint,
+            resp.get("policies", []) if resp else [],
+            ctx["repo_prune"][shortname],
+            full_repo_name=full_repo_name,
+        )
+        actions.extend(prune_actions)
+    if repository.get("immutability"):
+        actions.extend(
+            apply_immutability(
+                module,
+                "repository/{full_repo_name}/immutabilitypolicy/",
+                repository["immutability"],
+                full_repo_name=full_repo_name,
+            )
+        )
+    return actions
+
+
+def apply_quota(ctx, _not_used):
+    """Set the quota of the organization and its limits."""
+    module = ctx["module"]
+    organization = ctx["organization"]
+    org_details = module.get_organization(organization, exit_on_error=False) or {}
+    quotas = org_details.get("quotas") or []
+    return reconcile.apply_quota(
+        module,
+        organization,
+        quotas[0] if quotas else {},
+        ctx["quota"],
+        ctx["params"].get("warning_pct"),
+        ctx["params"].get("reject_pct"),
+    )
+
+
+APPLY_FUNCTIONS = {
+    "user": apply_user,
+    "organization": apply_organization,
+    "prune": apply_org_prune,
+    "immutability": apply_org_immutability,
+    "proxy_cache": apply_proxy_cache,
+    "robot": apply_robot,
+    "team": apply_team,
+    "default_perms": apply_default_perms,
+    "application": apply_application,
+    "repository": apply_repository,
+    "quota": apply_quota,
+}
+
+
+PLAN_VERSION = 1
+
+# Parameters that do not change the plan
+PLAN_IGNORED_PARAMS = [
+    "quay_token",
+    "quay_username",
+    "quay_password",
+    "validate_certs",
+    "timeout",
+    "concurrency",
+    "plan_file",
+]
+
+
+class PlanAPIModule(APIModule):
+    """API module that records the GET requests of each object for the plan.
+
+    The module processes the objects in parallel, one object per thread, and
+    the recording uses thread-local storage to associate the requests with
+    the object that the thread processes.
+    """
+
+    def __init__(self, argument_spec, **kwargs):
+        self.plan_local = threading.local()
+        super(PlanAPIModule, self).__init__(argument_spec, **kwargs)
+
+    def start_recording(self):
+        """Start recording the GET requests of an object."""
+        self.plan_local.reads = []
+
+    def stop_recording(self):
+        """Stop recording and return the GET requests of the object.
+
+        :return: The read requests, with their validators.
+        :rtype: list
+        """
+        reads = self.plan_local.reads
+        self.plan_local.reads = None
+        return reads
+
+    def make_json_request(self, method, url, ok_error_codes=None, **kwargs):
+        response = super(PlanAPIModule, self).make_json_request(
+            method, url, ok_error_codes, **kwargs
+        )
+        reads = getattr(self.plan_local, "reads", None)
+        if (
+            reads is None
+            or method != "GET"
+            or any(r["path"] == url.path and r["query"] == url.query for r in reads)
+        ):
+            return response
+        headers_lower = dict((k.lower(), v) for k, v in response["headers"].items())
+        reads.append(
+            {
+                "path": url.path,
+                "query": url.query,
+                "status": response["status_code"],
+                "etag": headers_lower.get("etag"),
+                "sha256": self.content_hash(response["json"]),
+            }
+        )
+        return response
+
+
+def params_digest(module, argument_spec):
+    """Return a digest of the parameters that define the plan.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param argument_spec: The argument specification of the module.
+    :type argument_spec: dict
+
+    :return: The SHA-256 digest.
+    :rtype: str
+    """
+    params = dict(
+        (k, module.params.get(k))
+        for k in list(argument_spec) + ["quay_host"]
+        if k not in PLAN_IGNORED_PARAMS
+    )
+    return module.content_hash(params)
+
+
+def read_plan(module, path, digest):
+    """Read and verify a plan file.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param path: Path to the plan file.
+    :type path: str
+    :param digest: Digest of the current parameters.
+    :type digest: str
+
+    :return: A dictionary that associates the ``(kind, name)`` nodes with their
+             plan entries.
+    :rtype: dict
+    """
+    try:
+        with io.open(path, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+    except (IOError, OSError, ValueError) as e:
+        module.fail_json(
+            msg="Cannot read the plan file {path}: {error}".format(path=path, error=e)
+        )
+    if not lines or lines[0].get("version") != PLAN_VERSION:
+        module.fail_json(msg="The {path} file is not a valid plan file.".format(path=path))
+    if lines[0].get("params_sha256") != digest:
+        module.fail_json(
+            msg=(
+                "The {path} plan file was created with different parameters."
+                " Run the module in check mode again to create a new plan."
+            ).format(path=path)
+        )
+    return dict(((entry["kind"], entry["name"]), entry) for entry in lines[1:])
+
+
+def write_plan(module, path, digest, nodes, entries):
+    """Write the plan file.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param path: Path to the plan file.
+    :type path: str
+    :param digest: Digest of the parameters.
+    :type digest: str
+    :param nodes: The nodes, in the processing order.
+    :type nodes: list
+    :param entries: A dictionary that associates the nodes with their
+                    operations and recorded read requests.
+    :type entries: dict
+    """
+    with OutputFile(module, path, mode=0o600) as out:
+        out.write(
+            {
+                "version": PLAN_VERSION,
+                "organization": module.params.get("name"),
+                "params_sha256": digest,
+            }
+        )
+        for node in nodes:
+            entry = dict(entries[node])
+            entry["kind"] = node[0]
+            entry["name"] = node[1]
+            out.write(entry)
+
+
+def read_changed(module, read):
+    """Return whether an API object changed since the creation of the plan.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param read: The read request, with its validators, from the plan.
+    :type read: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: ``True`` if the object changed.
+    :rtype: bool
+    """
+    url = module.host_url._replace(path=read["path"], query=read.get("query") or "")
+    headers = {"If-None-Match": read["etag"]} if read.get("etag") else {}
+    response = module.make_json_request(
+        "GET", url, ok_error_codes=[304, 404], headers=headers
+    )
+    if response["status_code"] == 304:
+        return False
+    return response["status_code"] != read["status"] or (
+        module.content_hash(response["json"]) != read["sha256"]
+    )
+
+
+def build_graph(organization, params):
+    """Build the dependency graph of the objects to apply.
+
+    A node is a ``(kind, name)`` tuple.
+
+    :param organization: Name of the organization.
+    :type organization: str
+    :param params: The module parameters.
+    :type params: dict
+
+    :return: A tuple with the list of the nodes, in the processing order of
+             the quay_org role, a dictionary that associates the nodes with
+             the nodes they depend on, and a dictionary that associates the
+             nodes with their definitions.
+    :rtype: tuple
+    """
+    org_node = ("organization", organization)
+    nodes = []
+    items = {}
+    for user in params.get("users") or []:
+        nodes.append(("user", user["username"]))
+        items[nodes[-1]] = user
+    nodes.append(org_node)
+    for kind in ("prune", "immutability"):
+        if params.get(kind):
+            nodes.append((kind, organization))
+    if params.get("cache_registry"):
+        nodes.append(("proxy_cache", organization))
+    for robot in params.get("robots") or []:
+        nodes.append(("robot", robot_full_name(organization, robot["name"])))
+        items[nodes[-1]] = robot
+    for team in params.get("teams") or []:
+        nodes.append(("team", team["name"]))
+        items[nodes[-1]] = team
+    if params.get("default_perms"):
+        nodes.append(("default_perms", organization))
+    for app in params.get("applications") or []:
+        nodes.append(("application", app["name"]))
+        items[nodes[-1]] = app
+    for repo in params.get("repositories") or []:
+        nodes.append(("repository", repo["name"]))
+        items[nodes[-1]] = repo
+    if (
+        params.get("quota") is not None
+        or params.get("warning_pct") is not None
+        or params.get("reject_pct") is not None
+    ):
+        nodes.append(("quota", organization))
+
+    def account_nodes(names):
+        deps = []
+        for name in names:
+            if name and "+" in name:
+                deps.append(("robot", name))
+            elif name:
+                deps.append(("user", name))
+        return deps
+
+    dependencies = {}
+    for node in nodes:
+        kind = node[0]
+        if kind in ("user", "organization"):
+            continue
+        deps = [org_node]
+        if kind == "team":
+            deps.extend(account_nodes(items[node].get("members") or []))
+        elif kind == "default_perms":
+            for perm in params["default_perms"]:
+                if perm.get("type") == "team":
+                    deps.append(("team", perm["name"]))
+                else:
+                    deps.extend(account_nodes([perm["name"]]))
+                deps.extend(account_nodes([perm.get("creator")]))
+        elif kind == "repository":
+            # Default permissions apply to the repositories when they are
+            # created
+            deps.append(("default_perms", organization))
+            for perm in items[node].get("perms") or []:
+                if perm.get("type") == "team":
+                    deps.append(("team", perm["name"]))
+                else:
+                    deps.extend(account_nodes([perm["name"]]))
+        dependencies[node] = deps
+    return nodes, dependencies, items
+
+
+def main():
+    prune_spec = dict(
+        method=dict(choices=["tags", "date"], required=True),
+        value=dict(required=True),
+        tag_pattern=dict(),
+        tag_pattern_matches=dict(type="bool", default=True),
+    )
+    immutability_spec = dict(
+        tag_pattern=dict(required=True),
+        behavior=dict(choices=["matching_immutable", "not_matching_immutable"]),
+    )
+    argument_spec = dict(
+        name=dict(required=True, aliases=["organization"]),
+        email=dict(),
+        users=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                username=dict(required=True),
+                email=dict(),
+                password=dict(no_log=True),
+            ),
+        ),
+        prune=dict(type="list", elements="dict", options=prune_spec),
+        immutability=dict(type="list", elements="dict", options=immutability_spec),
+        cache_registry=dict(),
+        cache_username=dict(),
+        cache_password=dict(no_log=True),
+        cache_insecure=dict(type="bool"),
+        cache_expiration=dict(),
+        robots=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                description=dict(),
+                federations=dict(
+                    type="list",
+                    elements="dict",
+                    options=dict(
+                        issuer=dict(required=True),
+                        subject=dict(required=True),
+                    ),
+                ),
+            ),
+        ),
+        teams=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                role=dict(choices=["member", "creator", "admin"]),
+                description=dict(),
+                members=dict(type="list", elements="str"),
+            ),
+        ),
+        default_perms=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                type=dict(choices=["user", "team"], default="user"),
+                role=dict(choices=["read", "write", "admin"]),
+                creator=dict(),
+            ),
+        ),
+        applications=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                description=dict(),
+                application_uri=dict(),
+                redirect_uri=dict(),
+                avatar_email=dict(),
+            ),
+        ),
+        repositories=dict(
+            type="list",
+            elements="dict",
+            options=dict(
+                name=dict(required=True),
+                visibility=dict(choices=["public", "private"]),
+                description=dict(),
+                perms=dict(
+                    type="list",
+                    elements="dict",
+                    options=dict(
+                        type=dict(choices=["user", "team"], default="user"),
+                        name=dict(required=True),
+                        role=dict(choices=["read", "write", "admin"], default="read"),
+                    ),
+                ),
+                repo_state=dict(choices=["NORMAL", "READ_ONLY", "MIRROR"]),
+                prune=dict(type="list", elements="dict", options=prune_spec),
+                immutability=dict(type="list", elements="dict", options=immutability_spec),
+            ),
+        ),
+        quota=dict(),
+        warning_pct=dict(type="int"),
+        reject_pct=dict(type="int"),
+        concurrency=dict(type="int", default=8),
+        plan_file=dict(type="path"),
+    )
+
+    # Create a module for ourselves
+    module = PlanAPIModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    # Extract our parameters
+    organization = module.params.get("name")
+    concurrency = module.params.get("concurrency")
+    plan_file = module.params.get("plan_file")
+
+    # Validate and convert the parameters before any API call
+    ctx = {
+        "module": module,
+        "organization": organization,
+        "params": module.params,
+        "prune": [
+            module.process_prune_parameters(
+                p["method"], p["value"], p.get("tag_pattern"), p.get("tag_pattern_matches")
+            )
+            for p in module.params.get("prune") or []
+        ],
+        "repo_prune": dict(
+            (
+                r["name"],
+                [
+                    module.process_prune_parameters(
+                        p["method"],
+                        p["value"],
+                        p.get("tag_pattern"),
+                        p.get("tag_pattern_matches"),
+                    )
+                    for p in r.get("prune") or []
+                ],
+            )
+            for r in module.params.get("repositories") or []
+        ),
+        "cache_expiration": (
+            module.str_period_to_second(
+                "cache_expiration", module.params.get("cache_expiration")
+            )
+            if module.params.get("cache_expiration") is not None
+            else 86400
+        ),
+        "quota": (
+            module.str_size_to_bytes("quota", module.params.get("quota"))
+            if module.params.get("quota") is not None
+            else None
+        ),
+        # Accounts and teams that the module manages. The dependency graph
+        # ensures that they exist before they are referenced.
+        "accounts": set(
+            [u["username"] for u in module.params.get("users") or []]
+            + [
+                robot_full_name(organization, r["name"])
+                for r in module.params.get("robots") or []
+            ]
+        ),
+        "teams": set([t["name"] for t in module.params.get("teams") or []]),
+    }
+
+    nodes, dependencies, items = build_graph(organization, module.params)
+
+    # In check mode, record the read requests of each object for the plan
+    # file. Otherwise, read the plan file and verify which API objects changed
+    # since the creation of the plan.
+    plan = None
+    stale_reads = set()
+    entries = {}
+    plan_status = {}
+    if plan_file:
+        digest = params_digest(module, argument_spec)
+        if not module.check_mode:
+            plan = read_plan(module, plan_file, digest)
+            reads = {}
+            for entry in plan.values():
+                for read in entry.get("reads", []):
+                    reads.setdefault((read["path"], read.get("query")), read)
+            keys = list(reads)
+            try:
+                changed_reads = module.run_concurrently(
+                    lambda key: read_changed(module, reads[key]), keys, concurrency
+                )
+            except APIModuleError as e:
+                module.fail_json(msg=str(e))
+            stale_reads = set(k for k, c in zip(keys, changed_reads) if c)
+
+    # The module caches the organization for all the objects, so that the
+    # organization read is only recorded in one entry of the plan
+    org_path = module.build_url("organization/{org}".format(org=organization)).path
+    org_changed = any(path == org_path for path, _q in stale_reads)
+
+    def unchanged_entry(node):
+        entry = plan.get(node)
+        if not entry or org_changed and node[0] != "user":
+            return None
+        for read in entry.get("reads", []):
+            if (read["path"], read.get("query")) in stale_reads:
+                return None
+        return entry
+
+    def apply_node(node):
+        if plan is not None:
+            entry = unchanged_entry(node)
+            plan_status[node] = "replayed" if entry else "recomputed"
+            # The API objects are in the state of the plan, which does not
+            # include any operation for the object
+            if entry and not entry.get("actions"):
+                return []
+            # The plan only provides the validators and the reviewed
+            # operations. The operations are always computed from the
+            # parameters, which the digest ties to the plan.
+            return APPLY_FUNCTIONS[node[0]](ctx, items.get(node))
+        if not plan_file:
+            return APPLY_FUNCTIONS[node[0]](ctx, items.get(node))
+        module.start_recording()
+        try:
+            actions = APPLY_FUNCTIONS[node[0]](ctx, items.get(node))
+        finally:
+            reads = module.stop_recording()
+        entries[node] = {"reads": reads, "actions": actions}
+        return actions
+
+    outcome = module.run_graph(apply_node, nodes, dependencies, concurrency)
+
+    results = []
+    failures = []
+    for node in nodes:
+        status, value = outcome[node]
+        result = {"kind": node[0], "name": node[1], "actions": []}
+        if node in plan_status:
+            result["plan"] = plan_status[node]
+        if status == "ok":
+            result["actions"] = value
+            result["status"] = "changed" if value else "unchanged"
+        elif status == "failed":
+            result["status"] = "failed"
+            result["msg"] = value
+            failures.append(
+                "{kind} {name}: {msg}".format(kind=node[0], name=node[1], msg=value)
+            )
+        else:
+            result["status"] = "skipped"
+            result["msg"] = "Skipped because {kind} {name} failed.".format(
+                kind=value[0], name=value[1]
+            )
+        results.append(result)
+
+    changed = any(r["status"] == "changed" for r in results)
+    if failures:
+        module.fail_json(
+            msg="Cannot apply {count} object(s): {errors}".format(
+                count=len(failures), errors=" ".join(failures)
+            ),
+            changed=changed,
+            results=results,
+        )
+    if plan_file:
+        if module.check_mode:
+            write_plan(module, plan_file, digest, nodes, entries)
+        module.exit_json(changed=changed, results=results, plan_file=plan_file)
+    module.exit_json(changed=changed, results=results)
+
+
+if __name__ == "__main__":
+    main()
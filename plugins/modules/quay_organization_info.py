@@ -0,0 +1,749 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_organization_info
+short_description: Gather the configuration of a Quay Container Registry organization
+description:
+  - Collect a snapshot of the configuration of an organization in a single
+    task. The snapshot includes the organization details, the teams and their
+    members, the robot accounts and their federations, the repositories and
+    their permissions, the default permissions, the auto-pruning and
+    immutability policies, the quota, the proxy cache configuration, and the
+    OAuth applications.
+  - The module sends the API requests in parallel and follows the pagination
+    of the repository list.
+  - For large organizations, the module can write the snapshot to a file on
+    the managed node instead of returning the data.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  organization:
+    description:
+      - Name of the organization to inspect.
+      - See O(on_missing) for the behavior when the organization does not
+        exist.
+    required: true
+    type: str
+    aliases: [name]
+  include:
+    description:
+      - Sections of the configuration to collect. The module always
+        collects the organization details.
+      - By default, the module collects all the sections.
+    type: list
+    elements: str
+    choices:
+      - teams
+      - robots
+      - repositories
+      - default_permissions
+      - prune_policies
+      - immutability_policies
+      - quota
+      - proxy_cache
+      - applications
+  fingerprint:
+    description:
+      - Return a fingerprint of each collected section instead of the
+        section data.
+      - To compute the fingerprints, the module only sends the API requests
+        that list the items of each section. It does not retrieve the team
+        members, the federations of the robot accounts, nor the permissions
+        of the repositories. The fingerprints therefore change when items
+        are added or removed, or when a listed attribute changes, such as the
+        number of members of a team.
+      - The
+        R(infra.quay_configuration.quay_org,ansible_collections.infra.quay_configuration.quay_org_role)
+        role uses the fingerprints for its incremental mode.
+      - Mutually exclusive with O(output_file).
+    type: bool
+    default: false
+  on_missing:
+    description:
+      - What to do when the organization does not exist.
+      - V(error) fails the module.
+      - V(ignore) returns the RV(exists) key set to V(false), without any
+        other data.
+    type: str
+    choices: [error, ignore]
+    default: error
+notes:
+  - The token that you use in the O(quay_token) parameter must have the
+    C(org:admin) and C(repo:admin) scopes. You must be an administrator of
+    the organization.
+  - The module does not return the client secrets of the OAuth applications
+    nor the tokens of the robot accounts.
+  - When you set the O(output_file) parameter, the module writes one JSON
+    object per line. Each object has a C(kind) key that identifies the
+    section (C(organization), C(team), C(robot), C(repository),
+    C(default_permission), C(prune_policy), C(immutability_policy),
+    C(quota), C(proxy_cache), or C(application)) and a C(data) key that
+    stores the item.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+  - infra.quay_configuration.output_file
+"""
+
+EXAMPLES = r"""
+- name: Collect the configuration of the production organization
+  infra.quay_configuration.quay_organization_info:
+    organization: production
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: org_snapshot
+
+- name: Only collect the teams and the default permissions
+  infra.quay_configuration.quay_organization_info:
+    organization: production
+    include:
+      - teams
+      - default_permissions
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: org_snapshot
+
+- name: Write the snapshot of a large organization to a compressed file
+  infra.quay_configuration.quay_organization_info:
+    organization: production
+    output_file: /var/tmp/production.jsonl.gz
+    compress: true
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+exists:
+  description:
+    - Whether the organization exists. The module only returns V(false) when
+      O(on_missing=ignore).
+  returned: always
+  type: bool
+  sample: true
+organization:
+  description:
+    - Organization details, without the teams.
+  returned: always
+  type: dict
+  sample: {
+      "name": "production",
+      "email": "prodteam@example.com",
+      "is_admin": true,
+      "tag_expiration_s": 1209600
+    }
+teams:
+  description:
+    - Teams of the organization. Each team includes the C(members) list.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+  sample: [
+      {
+        "name": "owners",
+        "role": "admin",
+        "description": "",
+        "members": [
+          {
+            "name": "admin",
+            "kind": "user",
+            "is_robot": false,
+            "invited": false
+          }
+        ]
+      }
+    ]
+robots:
+  description:
+    - Robot accounts of the organization, with their permissions and
+      federations (C(federations) list).
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+  sample: [
+      {
+        "name": "production+robot1",
+        "description": "Robot for the production environment",
+        "created": "Sun, 26 Sep 2021 14:22:14 -0000",
+        "last_accessed": null,
+        "teams": [],
+        "repositories": ["smallimage"],
+        "federations": []
+      }
+    ]
+repositories:
+  description:
+    - Repositories of the organization. Each repository includes the
+      C(permissions) dictionary, with the C(users) and C(teams) keys.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+  sample: [
+      {
+        "namespace": "production",
+        "name": "smallimage",
+        "description": "My small image",
+        "is_public": false,
+        "kind": "image",
+        "state": "NORMAL",
+        "permissions": {
+          "users": {
+            "production+robot1": {
+              "role": "write",
+              "name": "production+robot1",
+              "is_robot": true,
+              "is_org_member": true
+            }
+          },
+          "teams": {
+            "developers": {
+              "role": "write",
+              "name": "developers"
+            }
+          }
+        }
+      }
+    ]
+default_permissions:
+  description:
+    - Default permissions (prototypes) of the organization.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+prune_policies:
+  description:
+    - Auto-pruning policies of the organization.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+immutability_policies:
+  description:
+    - Tag immutability policies of the organization. Empty with Quay versions
+      earlier than 3.17.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+quota:
+  description:
+    - Quota definitions of the organization, with their limits.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+proxy_cache:
+  description:
+    - Proxy cache configuration of the organization. Empty when the
+      organization is not a proxy cache.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: dict
+applications:
+  description:
+    - OAuth applications of the organization, without the client secrets.
+    - Not returned when you set the O(output_file) parameter.
+  returned: when the section is collected
+  type: list
+  elements: dict
+fingerprints:
+  description:
+    - SHA-256 fingerprint of each collected section, and of the organization
+      details (C(organization) key).
+  returned: when O(fingerprint=true)
+  type: dict
+  sample: {
+      "organization": "5b0ea2d7...bd5e",
+      "teams": "0c5a9b3a...06f1",
+      "repositories": "e3b0c442...b855"
+    }
+counts:
+  description: Number of items collected for each section.
+  returned: always
+  type: dict
+  sample: {
+      "teams": 3,
+      "robots": 2,
+      "repositories": 154,
+      "default_permissions": 1
+    }
+output_file:
+  description: Path to the file that stores the snapshot.
+  returned: when you set the O(output_file) parameter
+  type: str
+  sample: /var/tmp/production.jsonl.gz
+"""
+
+import hashlib
+import json
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.batches import iter_batches
+from ..module_utils.output_file import OutputFile
+
+SECTIONS = [
+    "teams",
+    "robots",
+    "repositories",
+    "default_permissions",
+    "prune_policies",
+    "immutability_policies",
+    "quota",
+    "proxy_cache",
+    "applications",
+]
+
+# Record kind, in the output file, for the items of each section
+RECORD_KINDS = {
+    "teams": "team",
+    "robots": "robot",
+    "repositories": "repository",
+    "default_permissions": "default_permission",
+    "prune_policies": "prune_policy",
+    "immutability_policies": "immutability_policy",
+    "quota": "quota",
+    "proxy_cache": "proxy_cache",
+    "applications": "application",
+}
+
+# Number of repositories that the module processes at a time when it writes
+# the snapshot to a file
+REPOSITORY_BATCH_SIZE = 100
+
+# Attributes that change without any configuration change, and that the
+# fingerprints ignore
+VOLATILE_ATTRIBUTES = ["avatar", "last_accessed", "last_modified", "popularity", "is_starred"]
+
+
+def get_list(module, endpoint, key, organization, query_params=None, **kwargs):
+    """Return a list of objects from an organization endpoint.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param endpoint: API endpoint. The ``{orgname}`` parameter is replaced
+                     by the organization name.
+    :type endpoint: str
+    :param key: Name of the attribute in the response that stores the list.
+                If ``None``, then the response is the list.
+    :type key: str
+    :param organization: Name of the organization.
+    :type organization: str
+    :param query_params: The optional query to append to the URL.
+    :type query_params: dict
+    :param kwargs: Additional parameters to substitute in ``endpoint``.
+    :type kwargs: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The list of objects. An empty list if the endpoint does not
+             exist in this version of Quay.
+    :rtype: list
+    """
+    response = module.get_object_path(
+        endpoint,
+        query_params=query_params,
+        exit_on_error=False,
+        duplicate_underscore=False,
+        orgname=organization,
+        **kwargs
+    )
+    if not response:
+        return []
+    if key is None:
+        return response if isinstance(response, list) else []
+    return response.get(key, [])
+
+
+def collect_section(module, organization, org_details, section):
+    """Collect the items of an organization-level section.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param org_details: Organization details, which include the teams.
+    :type org_details: dict
+    :param section: Name of the section to collect.
+    :type section: str
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The items of the section.
+    :rtype: list
+    """
+    if section == "teams":
+        # The members are collected later, one request per team
+        return [dict(team) for team in org_details.get("teams", {}).values()]
+
+    if section == "robots":
+        # GET /api/v1/organization/{orgname}/robots?permissions=True&token=False
+        # {
+        #   "robots": [
+        #     {
+        #       "name": "production+robot1",
+        #       "created": "Sun, 26 Sep 2021 14:22:14 -0000",
+        #       "last_accessed": null,
+        #       "description": "Robot for the production environment",
+        #       "unstructured_metadata": {},
+        #       "teams": [],
+        #       "repositories": ["smallimage"]
+        #     }
+        #   ]
+        # }
+        return get_list(
+            module,
+            "organization/{orgname}/robots",
+            "robots",
+            organization,
+            query_params={"permissions": True, "token": False},
+        )
+
+    if section == "default_permissions":
+        return get_list(
+            module, "organization/{orgname}/prototypes", "prototypes", organization
+        )
+
+    if section == "prune_policies":
+        return get_list(
+            module, "organization/{orgname}/autoprunepolicy/", "policies", organization
+        )
+
+    if section == "immutability_policies":
+        return get_list(
+            module, "organization/{orgname}/immutabilitypolicy/", "policies", organization
+        )
+
+    if section == "quota":
+        return get_list(module, "organization/{orgname}/quota", None, organization)
+
+    if section == "proxy_cache":
+        # GET /api/v1/organization/{orgname}/proxycache
+        # {
+        #   "upstream_registry": "quay.io",
+        #   "expiration_s": 86400,
+        #   "insecure": false
+        # }
+        cache = module.get_object_path(
+            "organization/{orgname}/proxycache",
+            exit_on_error=False,
+            duplicate_underscore=False,
+            orgname=organization,
+        )
+        return [cache] if cache and cache.get("upstream_registry") else []
+
+    if section == "applications":
+        applications = get_list(
+            module, "organization/{orgname}/applications", "applications", organization
+        )
+        for app in applications:
+            app.pop("client_secret", None)
+        return applications
+
+    return []
+
+
+def add_team_members(module, organization, team):
+    """Add the ``members`` list to the given team.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param team: Team description. The method updates that dictionary.
+    :type team: dict
+
+    :raises APIModuleError: An API error occurred.
+    """
+    team["members"] = get_list(
+        module,
+        "organization/{orgname}/team/{teamname}/members",
+        "members",
+        organization,
+        query_params={"includePending": True},
+        teamname=team["name"],
+    )
+
+
+def add_robot_federations(module, organization, robot):
+    """Add the ``federations`` list to the given robot account.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: Name of the organization.
+    :type organization: str
+    :param robot: Robot account description. The method updates that
+                  dictionary.
+    :type robot: dict
+
+    :raises APIModuleError: An API error occurred.
+    """
+    # GET /api/v1/organization/{orgname}/robots/{robot_shortname}/federation
+    # [
+    #   {
+    #     "issuer": "https://keycloak-realm.quayadmin.org/realms/quayrealm",
+    #     "subject": "449e14f8-9eb5-4d59-a63e-b7a77c75f770"
+    #   }
+    # ]
+    #
+    # Quay versions earlier than 3.13 do not support federations and return
+    # a 404 or a 400 error.
+    federations = module.get_object_path(
+        "organization/{orgname}/robots/{robot}/federation",
+        exit_on_error=False,
+        ok_error_codes=[400, 404],
+        duplicate_underscore=False,
+        orgname=organization,
+        robot=robot["name"].split("+", 1)[-1],
+    )
+    robot["federations"] = federations if isinstance(federations, list) else []
+
+
+def add_repository_permissions(module, repository):
+    """Add the ``permissions`` dictionary to the given repository.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param repository: Repository description. The method updates that
+                       dictionary.
+    :type repository: dict
+
+    :raises APIModuleError: An API error occurred.
+    """
+    full_repo_name = "{namespace}/{name}".format(
+        namespace=repository["namespace"], name=repository["name"]
+    )
+    permissions = {}
+    for kind, key in (("user", "users"), ("team", "teams")):
+        # GET /api/v1/repository/{namespace}/{repository}/permissions/team/
+        # {
+        #   "permissions": {
+        #     "developers": {
+        #       "role": "write",
+        #       "name": "developers",
+        #       "avatar": {...}
+        #     }
+        #   }
+        # }
+        perms = module.get_object_path(
+            "repository/{full_repo_name}/permissions/{kind}/",
+            exit_on_error=False,
+            duplicate_underscore=False,
+            full_repo_name=full_repo_name,
+            kind=kind,
+        )
+        permissions[key] = perms.get("permissions", {}) if perms else {}
+    repository["permissions"] = permissions
+
+
+def section_fingerprint(items):
+    """Compute the fingerprint of a list of items.
+
+    The fingerprint does not depend on the order of the items.
+
+    :param items: The items of the section.
+    :type items: iterator
+
+    :return: A tuple with the SHA-256 hexadecimal digest and the number of
+             items.
+    :rtype: tuple
+    """
+    digests = []
+    for item in items:
+        data = dict((k, v) for k, v in item.items() if k not in VOLATILE_ATTRIBUTES)
+        digests.append(
+            hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        )
+    digests.sort()
+    return (hashlib.sha256("".join(digests).encode("utf-8")).hexdigest(), len(digests))
+
+
+def main():
+    argument_spec = dict(
+        organization=dict(required=True, aliases=["name"]),
+        include=dict(type="list", elements="str", choices=SECTIONS),
+        concurrency=dict(type="int", default=8),
+        output_file=dict(type="path"),
+        compress=dict(type="bool", default=False),
+        fingerprint=dict(type="bool", default=False),
+        on_missing=dict(choices=["error", "ignore"], default="error"),
+    )
+
+    mutually_exclusive = [("fingerprint", "output_file")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    organization = module.params.get("organization")
+    include = module.params.get("include")
+    concurrency = module.params.get("concurrency")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+    fingerprint = module.params.get("fingerprint")
+    on_missing = module.params.get("on_missing")
+
+    sections = [s for s in SECTIONS if include is None or s in include]
+
+    org_details = module.get_object_path(
+        "organization/{orgname}", duplicate_underscore=False, orgname=organization
+    )
+    if not org_details:
+        if on_missing == "ignore":
+            module.exit_json(changed=False, exists=False)
+        module.fail_json(
+            msg="The {orgname} organization does not exist.".format(orgname=organization)
+        )
+
+    # Collect the organization-level sections in parallel. The repositories
+    # are collected afterward, one page at a time.
+    org_sections = [s for s in sections if s != "repositories"]
+    try:
+        results = module.run_concurrently(
+            lambda section: collect_section(module, organization, org_details, section),
+            org_sections,
+            concurrency,
+        )
+        snapshot = dict(zip(org_sections, results))
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    if fingerprint:
+        # The teams section covers the teams
+        org_details.pop("teams", None)
+        org_details.pop("ordered_teams", None)
+        if "repositories" in sections:
+            snapshot["repositories"] = module.iter_pages(
+                "repository", "repositories", query_params={"namespace": organization}
+            )
+        fingerprints = {}
+        counts = {}
+        for section in sections:
+            fingerprints[section], counts[section] = section_fingerprint(snapshot[section])
+        fingerprints["organization"] = section_fingerprint([org_details])[0]
+        module.exit_json(
+            changed=False,
+            exists=True,
+            organization=org_details,
+            counts=counts,
+            fingerprints=fingerprints,
+        )
+
+    try:
+        # Collect the details of the items (team members and robot
+        # federations) in parallel
+        jobs = []
+        for team in snapshot.get("teams", []):
+            jobs.append((add_team_members, team))
+        for robot in snapshot.get("robots", []):
+            jobs.append((add_robot_federations, robot))
+        module.run_concurrently(
+            lambda job: job[0](module, organization, job[1]), jobs, concurrency
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    org_details.pop("teams", None)
+    org_details.pop("ordered_teams", None)
+    counts = dict((s, len(snapshot[s])) for s in org_sections)
+
+    repositories = (
+        module.iter_pages(
+            "repository",
+            "repositories",
+            query_params={"namespace": organization},
+        )
+        if "repositories" in sections
+        else iter([])
+    )
+
+    def add_permissions(repository):
+        add_repository_permissions(module, repository)
+
+    if output_file:
+        with OutputFile(module, output_file, compress) as out:
+            out.write({"kind": "organization", "data": org_details})
+            for section in org_sections:
+                for item in snapshot[section]:
+                    out.write({"kind": RECORD_KINDS[section], "data": item})
+                # Release the memory as soon as the section is written
+                snapshot[section] = None
+
+            repo_count = 0
+            for batch in iter_batches(repositories, REPOSITORY_BATCH_SIZE):
+                try:
+                    module.run_concurrently(add_permissions, batch, concurrency)
+                except APIModuleError as e:
+                    module.fail_json(msg=str(e))
+                for repository in batch:
+                    out.write({"kind": "repository", "data": repository})
+                repo_count += len(batch)
+        if "repositories" in sections:
+            counts["repositories"] = repo_count
+        module.exit_json(
+            changed=False,
+            exists=True,
+            organization=org_details,
+            counts=counts,
+            output_file=output_file,
+        )
+
+    if "repositories" in sections:
+        repo_list = list(repositories)
+        try:
+            module.run_concurrently(add_permissions, repo_list, concurrency)
+        except APIModuleError as e:
+            module.fail_json(msg=str(e))
+        snapshot["repositories"] = repo_list
+        counts["repositories"] = len(repo_list)
+
+    if "proxy_cache" in snapshot:
+        snapshot["proxy_cache"] = (
+            snapshot["proxy_cache"][0] if snapshot["proxy_cache"] else {}
+        )
+    module.exit_json(
+        changed=False, exists=True, organization=org_details, counts=counts, **snapshot
+    )
+
+
+if __name__ == "__main__":
+    main()
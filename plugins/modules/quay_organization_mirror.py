@@ -166,6 +166,28 @@ options:
       - Triggers an immediate synchronization of all repositories in the mirror.
     type: bool
     default: false
+  wait:
+    description:
+      - Whether to wait for the synchronization to complete before returning.
+      - The module waits while the synchronization status of the
+        organization is C(SYNC_NOW) or C(SYNCING), and while repositories of
+        the organization are in the C(SYNC_NOW) or C(SYNCING) status. Use the
+        parameter with the O(force_sync) parameter to trigger a
+        synchronization and wait for its result.
+      - The module does not fail when the synchronization fails. Use the
+        RV(sync_status) and RV(repo_sync_status_counts) return values to
+        verify the result.
+    type: bool
+    default: false
+    version_added: '2.9.0'
+  wait_timeout:
+    description:
+      - Maximum number of seconds to wait for the synchronization to
+        complete. The module fails when the timeout expires.
+      - Only used when O(wait=true).
+    type: int
+    default: 1800
+    version_added: '2.9.0'
 notes:
   - The module requires Quay version 3.17 or later.
   - Your Quay administrator must enable the organization mirroring capability
@@ -183,6 +205,11 @@ notes:
     the mirror configuration.
   - See the M(infra.quay_configuration.quay_repository_mirror) module
     to mirror a single repository.
+  - When O(wait=true), the module retrieves the mirror status in the same
+    process, first every second and then less and less often, up to every
+    30 seconds, while the status does not change. Quay can then answer with
+    short C(Not Modified) responses.
+  - In check mode, the module does not wait.
 attributes:
   check_mode:
     support: full
@@ -238,6 +265,20 @@ EXAMPLES = r"""
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 
+- name: Synchronize all the repositories and wait for at most an hour
+  infra.quay_configuration.quay_organization_mirror:
+    organization: mirror-org
+    force_sync: true
+    wait: true
+    wait_timeout: 3600
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: mirror
+
+- name: Ensure that no repository failed to synchronize
+  ansible.builtin.assert:
+    that: mirror['repo_sync_status_counts']['FAIL'] == 0
+
 - name: Ensure the organization mirror configuration is removed
   infra.quay_configuration.quay_organization_mirror:
     organization: mirror-org
@@ -246,13 +287,120 @@ EXAMPLES = r"""
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 """
 
-RETURN = r""" # """
+RETURN = r"""
+sync_status:
+  description:
+    - Status of the synchronization of the organization when the module
+      returns, such as C(SUCCESS), C(FAIL), or C(CANCEL).
+  returned: when O(wait=true), except in check mode
+  type: str
+  sample: SUCCESS
+repo_sync_status_counts:
+  description:
+    - Number of repositories in the organization for each synchronization
+      status, when the module returns.
+  returned: when O(wait=true), except in check mode
+  type: dict
+  sample: {
+      "CANCEL": 0,
+      "FAIL": 1,
+      "NEVER_RUN": 0,
+      "SUCCESS": 11,
+      "SYNCING": 0,
+      "SYNC_NOW": 0,
+      "SKIP": 0
+    }
+timeline:
+  description:
+    - The successive statuses of the synchronization while the module was
+      waiting, oldest first.
+    - The module adds an item each time the status of the organization or
+      the number of repositories in a status changes.
+  returned: when O(wait=true), except in check mode
+  type: list
+  elements: dict
+  contains:
+    sync_status:
+      description: Status of the synchronization of the organization.
+      type: str
+      sample: SUCCESS
+    repo_sync_status_counts:
+      description: Number of repositories for each synchronization status.
+      type: dict
+      sample: {"SUCCESS": 4, "SYNCING": 8, "SYNC_NOW": 0}
+    elapsed:
+      description:
+        - Number of seconds between the beginning of the wait and the
+          moment the module observed the status.
+      type: float
+      sample: 4.5
+"""
 
 import copy
 from datetime import datetime
 
 from ..module_utils.api_module import APIModule
 
+# Synchronization statuses for which the module keeps waiting
+PENDING_STATUSES = ("SYNC_NOW", "SYNCING")
+
+
+def sync_pending(mirror):
+    """Return whether the organization or one of its repositories is syncing.
+
+    :param mirror: The mirror configuration, as returned by the API.
+    :type mirror: dict
+
+    :return: ``True`` if the synchronization is not complete.
+    :rtype: bool
+    """
+    if mirror.get("sync_status") in PENDING_STATUSES:
+        return True
+    counts = mirror.get("repo_sync_status_counts") or {}
+    return any(counts.get(status) for status in PENDING_STATUSES)
+
+
+def exit_module(module, changed, organization):
+    """Wait for the synchronization to complete if requested, and exit.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param changed: Whether the module changed the configuration.
+    :type changed: bool
+    :param organization: The name of the organization.
+    :type organization: str
+    """
+    if not module.params.get("wait") or module.check_mode:
+        module.exit_json(changed=changed)
+
+    timeout = module.params.get("wait_timeout")
+    mirror_details, timeline, timed_out = module.poll_object_path(
+        "organization/{organization}/mirror",
+        lambda mirror: {
+            "sync_status": mirror.get("sync_status"),
+            "repo_sync_status_counts": mirror.get("repo_sync_status_counts"),
+        },
+        sync_pending,
+        timeout,
+        organization=organization,
+    )
+    mirror_details = mirror_details or {}
+    result = {
+        "changed": changed,
+        "sync_status": mirror_details.get("sync_status"),
+        "repo_sync_status_counts": mirror_details.get("repo_sync_status_counts"),
+        "timeline": timeline,
+    }
+    if timed_out:
+        module.fail_json(
+            msg=(
+                "The synchronization of the {orgname} organization did not complete"
+                " within {timeout} seconds."
+            ).format(orgname=organization, timeout=timeout),
+            **result
+        )
+    module.exit_json(**result)
+
 
 def main():
     argument_spec = dict(
@@ -275,6 +423,8 @@ def main():
         https_proxy=dict(),
         no_proxy=dict(),
         force_sync=dict(type="bool", default=False),
+        wait=dict(type="bool", default=False),
+        wait_timeout=dict(type="int", default=1800),
     )
 
     # Create a module for ourselves
@@ -459,7 +609,7 @@ def main():
                 organization=organization,
             )
 
-        module.exit_json(changed=True)
+        exit_module(module, True, organization)
 
     # Update the organization mirror configuration
     new_fields = {}
@@ -538,7 +688,7 @@ def main():
         )
         changed = True
 
-    module.exit_json(changed=changed)
+    exit_module(module, changed, organization)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,563 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_organization_notification
+short_description: Manage notifications for all the repositories of an organization
+description:
+  - Apply a set of repository notifications to several repositories of an
+    organization or a personal namespace.
+  - The module reads the existing notifications of the repositories in
+    parallel, and then only creates or deletes the notifications that differ.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  namespace:
+    description:
+      - Organization or personal namespace that contains the repositories.
+        This namespace must exist.
+    required: true
+    type: str
+  repositories:
+    description:
+      - Names of the repositories, without the namespace part, to process.
+      - If you do not set the O(repositories) and the O(regexp) parameters,
+        then the module processes all the repositories in the namespace.
+      - Mutually exclusive with O(regexp).
+    type: list
+    elements: str
+  regexp:
+    description:
+      - Regular expression to select the repositories to process. The module
+        lists the repositories in the namespace and only processes the
+        repositories with a name that matches. The regular expression does
+        not have to match the entire name.
+      - Uses Python regular expressions. See
+        U(https://docs.python.org/3/library/re.html).
+      - Mutually exclusive with O(repositories).
+    type: str
+    aliases: [regex]
+  notifications:
+    description:
+      - Notifications to apply to each repository.
+      - The module uses the notification title to identify existing
+        notifications. When a notification with the same title already
+        exists but uses a different configuration, the module deletes and
+        then creates the notification again.
+      - When O(state=absent), you only have to provide the O(notifications[].title)
+        parameter.
+    required: true
+    type: list
+    elements: dict
+    suboptions:
+      title:
+        description:
+          - Notification title.
+        required: true
+        type: str
+      event:
+        description:
+          - Event that triggers the notification.
+          - Depending of the activated Quay components, not all events might be
+            available on your system.
+        type: str
+        choices:
+          - repo_push
+          - build_failure
+          - build_queued
+          - build_start
+          - build_success
+          - build_cancelled
+          - vulnerability_found
+          - repo_mirror_sync_started
+          - repo_mirror_sync_success
+          - repo_mirror_sync_failed
+          - repo_image_expiry
+      method:
+        description:
+          - Notification method. See the M(infra.quay_configuration.quay_notification)
+            module for the configuration options that each method requires.
+        type: str
+        choices:
+          - email
+          - flowdock
+          - hipchat
+          - quay_notification
+          - slack
+          - webhook
+      config:
+        description:
+          - Configuration parameters for the notification method. See the
+            M(infra.quay_configuration.quay_notification) module for the
+            details.
+        type: dict
+        suboptions:
+          type:
+            description:
+              - Specifies the type of the account defined in
+                O(notifications[].config.name).
+              - Only applies to the Quay Notification method.
+            type: str
+            choices: [user, team, org]
+            default: user
+          name:
+            description:
+              - Name of the account, team, or organization. Robot accounts are
+                not allowed.
+              - Required by the Quay Notification method.
+            type: str
+          email:
+            description:
+              - Destination email address.
+              - Required by the email notification method.
+            type: str
+          url:
+            description:
+              - Webhook URL for the Slack method or POST URL for the webhook
+                POST method.
+            type: str
+          template:
+            description:
+              - JSON data for the body content of the webhook POST method.
+            type: jsonarg
+          room_id:
+            description:
+              - Chat room ID required for the HipChat notification method.
+            type: str
+          notification_token:
+            description:
+              - Notification token required for the HipChat notification
+                method.
+            type: str
+          flow_api_token:
+            description:
+              - API token required for the Flowdock notification method.
+            type: str
+      vulnerability_level:
+        description:
+          - Only used when O(notifications[].event) is V(vulnerability_found).
+          - The notification is triggered when the vulnerability has a level
+            equal or higher to the level that you define.
+        type: str
+        choices:
+          - critical
+          - high
+          - medium
+          - low
+          - negligible
+          - unknown
+      image_expiry_days:
+        description:
+          - Only used when O(notifications[].event) is V(repo_image_expiry).
+          - The notification is triggered when the image expires in the
+            specified number of days.
+        type: int
+        default: 7
+  append:
+    description:
+      - If V(true), then the module keeps the existing notifications that are
+        not listed in O(notifications).
+      - If V(false), then the module deletes the notifications that are not
+        listed in O(notifications).
+    type: bool
+    default: true
+  state:
+    description:
+      - If V(absent), then the module deletes the notifications that have the
+        titles listed in O(notifications).
+      - If V(present), then the module creates the notifications that do not
+        already exist.
+    type: str
+    default: present
+    choices: [absent, present]
+notes:
+  - The module validates the recipients of the Quay notifications (user
+    accounts, teams, and organizations) only once, before processing the
+    repositories.
+  - The user account associated with the token that you provide in
+    O(quay_token) must have administrator access to the repositories.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Ensure all the repositories of the production organization notify Slack
+  infra.quay_configuration.quay_organization_notification:
+    namespace: production
+    notifications:
+      - title: Notify image push to Slack
+        event: repo_push
+        method: slack
+        config:
+          url: https://hooks.slack.com/services/XXX/YYY/ZZZ
+      - title: Webhook notification on critical image vulnerability
+        event: vulnerability_found
+        vulnerability_level: critical
+        method: webhook
+        config:
+          url: https://webhook.example.com/webhook/12345
+    state: present
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Ensure the front repositories only have the operators notification
+  infra.quay_configuration.quay_organization_notification:
+    namespace: production
+    regexp: "^front-"
+    notifications:
+      - title: Notify operators on push
+        event: repo_push
+        method: quay_notification
+        config:
+          name: operators
+          type: team
+    append: false
+    state: present
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Ensure the Slack notification is removed from two repositories
+  infra.quay_configuration.quay_organization_notification:
+    namespace: production
+    repositories:
+      - smallimage
+      - bigimage
+    notifications:
+      - title: Notify image push to Slack
+    state: absent
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+repositories:
+  description:
+    - Notifications that the module created or deleted for each repository.
+    - The module only returns the repositories that it updates.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Full name of the repository.
+      type: str
+      returned: always
+      sample: production/smallimage
+    created:
+      description: Titles of the notifications that the module created.
+      type: list
+      elements: str
+      returned: always
+      sample: ["Notify image push to Slack"]
+    deleted:
+      description: Titles of the notifications that the module deleted.
+      type: list
+      elements: str
+      returned: always
+      sample: ["Old notification"]
+  sample: [
+    {
+      "repository": "production/smallimage",
+      "created": ["Notify image push to Slack"],
+      "deleted": []
+    }
+  ]
+"""
+
+import re
+
+from ..module_utils.api_module import APIModule, APIModuleError
+
+
+def same_notification(notification, new_fields):
+    """Tell if an existing notification matches the requested parameters.
+
+    :param notification: The notification returned by the API.
+    :type notification: dict
+    :param new_fields: The notification parameters, as returned by the
+                       :py:meth:``APIModule.process_notification_parameters``
+                       method.
+    :type new_fields: dict
+
+    :return: ``True`` if the notification does not need to be created again.
+    :rtype: bool
+    """
+    if notification.get("event") != new_fields["event"]:
+        return False
+    if notification.get("method") != new_fields["method"]:
+        return False
+    current_config = notification.get("config") or {}
+    for k, v in new_fields["config"].items():
+        if k == "target":
+            target = current_config.get("target") or {}
+            if target.get("name") != v["name"] or target.get("kind") != v["kind"]:
+                return False
+        elif current_config.get(k) != v:
+            return False
+    # The API might return the event configuration values as strings
+    current_event_config = dict(
+        (k, str(v)) for k, v in (notification.get("event_config") or {}).items()
+    )
+    new_event_config = dict((k, str(v)) for k, v in new_fields["event_config"].items())
+    return current_event_config == new_event_config
+
+
+def main():
+    argument_spec = dict(
+        namespace=dict(required=True),
+        repositories=dict(type="list", elements="str"),
+        regexp=dict(aliases=["regex"]),
+        notifications=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=dict(
+                title=dict(required=True),
+                event=dict(
+                    choices=[
+                        "repo_push",
+                        "build_failure",
+                        "build_queued",
+                        "build_start",
+                        "build_success",
+                        "build_cancelled",
+                        "vulnerability_found",
+                        "repo_mirror_sync_started",
+                        "repo_mirror_sync_success",
+                        "repo_mirror_sync_failed",
+                        "repo_image_expiry",
+                    ]
+                ),
+                method=dict(
+                    choices=[
+                        "email",
+                        "flowdock",
+                        "hipchat",
+                        "quay_notification",
+                        "slack",
+                        "webhook",
+                    ]
+                ),
+                config=dict(
+                    type="dict",
+                    options=dict(
+                        name=dict(),
+                        type=dict(choices=["user", "team", "org"], default="user"),
+                        email=dict(),
+                        url=dict(),
+                        template=dict(type="jsonarg"),
+                        room_id=dict(),
+                        notification_token=dict(no_log=True),
+                        flow_api_token=dict(no_log=True),
+                    ),
+                ),
+                vulnerability_level=dict(choices=APIModule.VULNERABILITY_LEVELS),
+                image_expiry_days=dict(type="int", default=7),
+            ),
+        ),
+        append=dict(type="bool", default=True),
+        state=dict(choices=["present", "absent"], default="present"),
+        concurrency=dict(type="int", default=8),
+    )
+
+    mutually_exclusive = [("repositories", "regexp")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    namespace = module.params.get("namespace")
+    repositories = module.params.get("repositories")
+    regexp = module.params.get("regexp")
+    notifications = module.params.get("notifications")
+    append = module.params.get("append")
+    state = module.params.get("state")
+    concurrency = module.params.get("concurrency")
+
+    if not module.get_namespace(namespace):
+        if state == "absent":
+            module.exit_json(changed=False, repositories=[])
+        module.fail_json(
+            msg="The {orgname} organization or personal namespace does not exist.".format(
+                orgname=namespace
+            )
+        )
+
+    # Verify the notification parameters and the recipients only once for all
+    # the repositories
+    requested = {}
+    for notification in notifications:
+        title = notification.get("title")
+        if state == "present":
+            requested[title] = module.process_notification_parameters(
+                namespace,
+                title,
+                notification.get("event"),
+                notification.get("method"),
+                notification.get("config"),
+                notification.get("vulnerability_level"),
+                notification.get("image_expiry_days"),
+            )
+        else:
+            requested[title] = None
+
+    # Select the repositories
+    if repositories is None:
+        repositories = [r.get("name") for r in module.get_repositories(namespace)]
+        if regexp is not None:
+            bre_m = re.compile(regexp)
+            repositories = [r for r in repositories if bre_m.search(r)]
+
+    # Get the notifications of all the repositories
+    #
+    # GET /api/v1/repository/{namespace}/{repository}/notification/
+    # {
+    #   "notifications": [
+    #     {
+    #       "uuid": "6c07bb76-3026-45e8-b65c-f68720b27845",
+    #       "title": "Send notification on push to Slack",
+    #       "event": "repo_push",
+    #       "method": "slack",
+    #       "config": {
+    #         "url": "https://hooks.slack.com/services/XXX/YYY/ZZZ"
+    #       },
+    #       "event_config": {},
+    #       "number_of_failures": 0
+    #     }
+    #   ]
+    # }
+    def get_notifications(repository):
+        return module.get_object_path(
+            "repository/{namespace}/{repository}/notification/",
+            exit_on_error=False,
+            namespace=namespace,
+            repository=repository,
+        )
+
+    try:
+        current = module.run_concurrently(get_notifications, repositories, concurrency)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    # Compute the notifications to delete and to create
+    results = []
+    deletions = []
+    creations = []
+    for repository, repo_notifications in zip(repositories, current):
+        full_repo_name = "{namespace}/{repository}".format(
+            namespace=namespace, repository=repository
+        )
+        if repo_notifications is None:
+            if state == "absent":
+                continue
+            module.fail_json(
+                msg="The {repo} repository does not exist.".format(repo=full_repo_name)
+            )
+
+        to_delete = []
+        found = set()
+        for notification in repo_notifications.get("notifications", []):
+            title = notification.get("title", "")
+            if title not in requested:
+                if not append and state == "present":
+                    to_delete.append(notification)
+                continue
+            if state == "absent":
+                to_delete.append(notification)
+            elif title not in found and same_notification(notification, requested[title]):
+                found.add(title)
+            else:
+                # Duplicated titles or different configuration
+                to_delete.append(notification)
+
+        to_create = []
+        if state == "present":
+            to_create = [title for title in requested if title not in found]
+
+        if not to_delete and not to_create:
+            continue
+        results.append(
+            {
+                "repository": full_repo_name,
+                "created": to_create,
+                "deleted": [n.get("title", "") for n in to_delete],
+            }
+        )
+        deletions.extend([(full_repo_name, n) for n in to_delete])
+        creations.extend([(full_repo_name, requested[title]) for title in to_create])
+
+    # Apply the changes
+    def delete_notification(operation):
+        full_repo_name, notification = operation
+        uuid = notification.get("uuid", "")
+        module.delete(
+            True,
+            "notification",
+            uuid,
+            "repository/{full_repo_name}/notification/{uuid}",
+            auto_exit=False,
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+            uuid=uuid,
+        )
+
+    def create_notification(operation):
+        full_repo_name, new_fields = operation
+        module.create(
+            "notification",
+            new_fields["title"],
+            "repository/{full_repo_name}/notification/",
+            new_fields,
+            auto_exit=False,
+            exit_on_error=False,
+            full_repo_name=full_repo_name,
+        )
+
+    try:
+        module.run_concurrently(delete_notification, deletions, concurrency)
+        module.run_concurrently(create_notification, creations, concurrency)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    module.exit_json(changed=len(results) > 0, repositories=results)
+
+
+if __name__ == "__main__":
+    main()
@@ -124,7 +124,8 @@ EXAMPLES = r"""
 
 RETURN = r""" # """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_proxy_cache
 
 
 def main():
@@ -259,45 +260,21 @@ def main():
             orgname=organization,
         )
 
-    if (
-        cache_details
-        and username is None
-        and password is None
-        and registry == cache_details.get("upstream_registry")
-        and (insecure is None or insecure == cache_details.get("insecure"))
-        and (expiration is None or s_expiration == cache_details.get("expiration_s"))
-    ):
-        module.exit_json(changed=False)
-
-    # Always remove the proxy cache configuration, because the configuration
-    # cannot be updated (an error is received if you try to set a configuration
-    # when one already exists)
-    module.delete(
-        cache_details,
-        "proxy cache",
-        organization,
-        "organization/{orgname}/proxycache",
-        auto_exit=False,
-        orgname=organization,
-    )
-
-    # Prepare the data that gets set for create
-    new_fields = {
-        "org_name": organization,
-        "expiration_s": s_expiration,
-        "insecure": insecure if insecure is not None else False,
-        "upstream_registry": registry,
-        "upstream_registry_username": username if username else None,
-        "upstream_registry_password": password if password else None,
-    }
-
-    module.create(
-        "proxy cache",
-        organization,
-        "organization/{orgname}/proxycache",
-        new_fields,
-        orgname=organization,
-    )
+    # Create the proxy cache configuration, or replace the existing one
+    try:
+        actions = apply_proxy_cache(
+            module,
+            organization,
+            cache_details,
+            registry,
+            username,
+            password,
+            insecure,
+            s_expiration if expiration is not None else None,
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_prune_simulation_info
+short_description: Simulate an auto-pruning policy on repositories
+description:
+  - Return the tags that an auto-pruning policy would delete, without
+    creating the policy and without deleting any tag.
+  - Use the module to review the effect of a policy before you create it
+    with the M(infra.quay_configuration.quay_repository_prune) or the
+    M(infra.quay_configuration.quay_organization_prune) module.
+  - The module retrieves the active tags of the repositories and evaluates
+    the policy locally.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  repositories:
+    description:
+      - Names of the repositories on which to simulate the policy. The format
+        for each name is C(namespace)/C(shortname). The namespace can be an
+        organization or a personal namespace.
+      - If you omit the namespace part in the name, then the module looks for
+        the repository in your personal namespace.
+      - Mutually exclusive with O(namespace).
+    type: list
+    elements: str
+  namespace:
+    description:
+      - Name of the organization or personal namespace. The module simulates
+        the policy on all the repositories in that namespace, as an
+        auto-pruning policy for the organization would do.
+      - Mutually exclusive with O(repositories).
+    type: str
+  sample_size:
+    description:
+      - Maximum number of tag names that the module returns for each
+        repository in the RV(repositories[].samples) list.
+    type: int
+    default: 10
+notes:
+  - The module only needs read access to the repositories. It does not
+    require that the auto-pruning capability is enabled.
+  - The module processes the tags by pages of 100 tags. For the V(tags)
+    method, it keeps in memory only the O(value) most recent tags of each
+    repository. For the V(date) method, it keeps no tag in memory. The
+    memory consumption therefore does not depend on the number of tags in
+    the repositories.
+  - As Quay does, the module orders the tags by creation date, and never
+    deletes immutable tags.
+  - The module returns zero counts for the repositories that do not exist.
+  - The module does not take into account the other auto-pruning policies
+    that might already exist for the repositories.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.autoprune
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Check which unstable tags would be pruned when keeping only five
+  infra.quay_configuration.quay_prune_simulation_info:
+    repositories:
+      - production/smallimage
+      - production/bigimage
+    method: tags
+    value: 5
+    tag_pattern: "unstable"
+    tag_pattern_matches: true
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: simulation
+
+- name: Check how many tags a seven-week policy would prune in development
+  infra.quay_configuration.quay_prune_simulation_info:
+    namespace: development
+    method: date
+    value: 7w
+    sample_size: 0
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: simulation
+
+- name: Display the number of tags that the policy would delete
+  ansible.builtin.debug:
+    msg: "The policy would delete {{ simulation['totals']['deleted'] }} tags"
+"""
+
+RETURN = r"""
+policy:
+  description: The auto-pruning policy, as the API would receive it.
+  returned: always
+  type: dict
+  sample: {
+      "method": "number_of_tags",
+      "value": 5,
+      "tagPattern": "unstable",
+      "tagPatternMatches": true
+    }
+repositories:
+  description: Result of the simulation for each repository.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Name of the repository, including its namespace.
+      type: str
+      returned: always
+      sample: production/smallimage
+    tags:
+      description: Number of active tags in the repository.
+      type: int
+      returned: always
+      sample: 42
+    matched:
+      description:
+        - Number of tags that the policy processes, according to the
+          O(tag_pattern) and O(tag_pattern_matches) parameters.
+        - Immutable tags are not included.
+      type: int
+      returned: always
+      sample: 12
+    deleted:
+      description: Number of tags that the policy would delete.
+      type: int
+      returned: always
+      sample: 7
+    samples:
+      description:
+        - Names of tags that the policy would delete.
+        - The O(sample_size) parameter gives the maximum number of names.
+      type: list
+      elements: str
+      returned: always
+      sample: ["unstable-20260101", "unstable-20260102"]
+totals:
+  description: Totals for all the repositories.
+  returned: always
+  type: dict
+  sample: {
+      "repositories": 2,
+      "tags": 84,
+      "matched": 24,
+      "deleted": 14
+    }
+"""
+
+import heapq
+import re
+import time
+
+from ..module_utils.api_module import APIModule, APIModuleError
+
+
+class PruneSimulator(object):
+    """Evaluate an auto-pruning policy on the tags of a repository.
+
+    The object receives the tags one at a time, in any order. For the
+    ``number_of_tags`` method, it keeps a heap of the most recent tags, of
+    the size of the policy value. A tag that leaves the heap would be
+    deleted.
+    """
+
+    def __init__(self, policy, sample_size, now):
+        """Initialize the object.
+
+        :param policy: The policy, as returned by the
+                       :py:meth:``APIModule.process_prune_parameters``
+                       method, with the period already converted into
+                       seconds for the ``creation_date`` method.
+        :type policy: dict
+        :param sample_size: Maximum number of tag names to keep in
+                            :py:attr:``samples``.
+        :type sample_size: int
+        :param now: The reference time, in seconds since the epoch.
+        :type now: int
+        """
+        self.method = policy["method"]
+        self.value = policy["value"]
+        pattern = policy.get("tagPattern")
+        self.pattern = re.compile(pattern) if pattern else None
+        self.pattern_matches = policy.get("tagPatternMatches", True)
+        self.sample_size = sample_size
+        self.cutoff = now - self.value if self.method == "creation_date" else None
+        self.tags = 0
+        self.matched = 0
+        self.deleted = 0
+        self.samples = []
+        self._newest = []
+
+    def _delete(self, name):
+        self.deleted += 1
+        if len(self.samples) < self.sample_size:
+            self.samples.append(name)
+
+    def add(self, tag):
+        """Evaluate the policy on a tag.
+
+        :param tag: The tag, as returned by the API.
+        :type tag: dict
+        """
+        self.tags += 1
+        name = tag.get("name", "")
+        if self.pattern and bool(self.pattern.search(name)) != self.pattern_matches:
+            return
+        # Quay does not delete immutable tags
+        if tag.get("immutable"):
+            return
+        self.matched += 1
+        start_ts = tag.get("start_ts", 0)
+        if self.method == "creation_date":
+            if start_ts < self.cutoff:
+                self._delete(name)
+            return
+        entry = (start_ts, name)
+        if len(self._newest) < self.value:
+            heapq.heappush(self._newest, entry)
+        else:
+            # Push the tag and remove the oldest tag, which the policy would
+            # delete
+            self._delete(heapq.heappushpop(self._newest, entry)[1])
+
+
+def simulate(module, repository, policy, sample_size, now):
+    """Simulate the policy on a repository.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param repository: The name of the repository, including its namespace.
+    :type repository: str
+    :param policy: The policy to simulate (see :py:class:``PruneSimulator``).
+    :type policy: dict
+    :param sample_size: Maximum number of tag names to return.
+    :type sample_size: int
+    :param now: The reference time, in seconds since the epoch.
+    :type now: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The result of the simulation for the repository.
+    :rtype: dict
+    """
+    namespace, repo_shortname = repository.split("/", 1)
+    simulator = PruneSimulator(policy, sample_size, now)
+    for tag in module.iter_tags(namespace, repo_shortname, exit_on_error=False):
+        simulator.add(tag)
+    return {
+        "repository": repository,
+        "tags": simulator.tags,
+        "matched": simulator.matched,
+        "deleted": simulator.deleted,
+        "samples": simulator.samples,
+    }
+
+
+def main():
+    argument_spec = dict(
+        repositories=dict(type="list", elements="str"),
+        namespace=dict(),
+        method=dict(choices=["tags", "date"], required=True),
+        value=dict(required=True),
+        tag_pattern=dict(),
+        tag_pattern_matches=dict(type="bool", default=True),
+        sample_size=dict(type="int", default=10),
+        concurrency=dict(type="int", default=8),
+    )
+
+    mutually_exclusive = [("repositories", "namespace")]
+    required_one_of = [("repositories", "namespace")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    repositories = module.params.get("repositories")
+    namespace = module.params.get("namespace")
+    method = module.params.get("method")
+    value = module.params.get("value")
+    tag_pattern = module.params.get("tag_pattern")
+    tag_pattern_matches = module.params.get("tag_pattern_matches")
+    sample_size = module.params.get("sample_size")
+    concurrency = module.params.get("concurrency")
+
+    # Convert the parameters to the dictionary that the API would receive
+    policy = module.process_prune_parameters(method, value, tag_pattern, tag_pattern_matches)
+
+    if tag_pattern:
+        try:
+            re.compile(tag_pattern)
+        except re.error as e:
+            module.fail_json(
+                msg="Wrong format for the `tag_pattern' parameter: {error}.".format(error=e)
+            )
+
+    rules = dict(policy)
+    if rules["method"] == "creation_date":
+        rules["value"] = module.str_period_to_second("value", rules["value"])
+
+    repo_names = module.get_repository_names(repositories, namespace)
+
+    now = int(time.time())
+    try:
+        results = module.run_concurrently(
+            lambda repository: simulate(module, repository, rules, sample_size, now),
+            repo_names,
+            concurrency,
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    totals = {"repositories": len(results), "tags": 0, "matched": 0, "deleted": 0}
+    for result in results:
+        for key in ("tags", "matched", "deleted"):
+            totals[key] += result[key]
+    module.exit_json(changed=False, policy=policy, repositories=results, totals=totals)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,9 @@ module: quay_pull_stat_info
 short_description: Return image pull statistics for tags and manifests
 description:
   - Return image pull statistics for tags and manifests.
+  - With the O(organization) parameter, return the aggregated pull
+    statistics of all the active tags of all the repositories in the
+    organization.
 version_added: '2.7.0'
 author: Hervé Quatremain (@herve4m)
 options:
@@ -37,25 +40,68 @@ options:
         personal namespace.
       - If you omit the namespace part, then the module looks for the
         repository in your personal namespace.
-    required: true
+      - Mutually exclusive with O(organization).
     type: str
   tag:
     description:
       - Return image pull statistics from the image's tag.
       - If you omit O(tag) and O(digest), then the C(latest) tag is assumed.
-      - Mutually exclusive with O(digest).
+      - Mutually exclusive with O(digest) and O(organization).
     type: str
   digest:
     description:
       - Return image pull statistics from the image's digest.
       - If you omit O(tag) and O(digest), then the C(latest) tag is assumed.
-      - Mutually exclusive with O(tag).
+      - Mutually exclusive with O(tag) and O(organization).
     type: str
+  organization:
+    description:
+      - Name of the organization or personal namespace for which the module
+        aggregates the pull statistics.
+      - The module lists the repositories and their active tags, page by
+        page, and retrieves the pull statistics of the tags in parallel. It
+        returns the totals for the organization, and the repositories and
+        the tags that have the highest pull counts.
+      - Mutually exclusive with O(repository).
+    type: str
+    version_added: '2.9.0'
+  top:
+    description:
+      - Number of repositories and tags that the module returns in the
+        RV(top_repositories) and RV(top_tags) lists.
+      - Only used with the O(organization) parameter.
+    type: int
+    default: 10
+    version_added: '2.9.0'
+  output_format:
+    description:
+      - Format of the O(output_file) file.
+      - With V(jsonl), the module writes one JSON object per line.
+      - With V(csv), the module writes a header line followed by one line per
+        tag.
+      - Only used with the O(organization) parameter.
+    type: str
+    choices: [jsonl, csv]
+    default: jsonl
+    version_added: '2.9.0'
 notes:
   - The module requires Quay version 3.16 or later.
   - The module requires that your Quay administrator enables image statistics
     for your installation (by setting C(FEATURE_IMAGE_PULL_STATS) to C(True) in
     C(config.yaml)).
+  - The O(concurrency), O(output_file), O(compress), and O(output_format)
+    parameters are only used with the O(organization) parameter.
+  - When you set the O(output_file) parameter, the module writes the pull
+    statistics of each tag to the file, with the C(namespace),
+    C(repository), C(tag_name), C(manifest_digest), C(tag_pull_count),
+    C(last_tag_pull_date), C(manifest_pull_count), and
+    C(last_manifest_pull_date) fields.
+  - In aggregation mode, the module keeps in memory the current page of
+    tags, the O(top) repositories and tags, and the digests of the
+    manifests of the current repository, to count the pulls of each
+    manifest once. The memory consumption depends on the number of
+    manifests in the largest repository (about 100 bytes per manifest), but
+    not on the number of repositories in the organization.
 attributes:
   check_mode:
     support: full
@@ -68,6 +114,8 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+  - infra.quay_configuration.output_file
 """
 
 EXAMPLES = r"""
@@ -86,6 +134,23 @@ EXAMPLES = r"""
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
   register: stats
+
+- name: Retrieve the 20 most pulled repositories and tags in production
+  infra.quay_configuration.quay_pull_stat_info:
+    organization: production
+    top: 20
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: stats
+
+- name: Write the pull statistics of all the tags in production to a CSV file
+  infra.quay_configuration.quay_pull_stat_info:
+    organization: production
+    output_file: /var/tmp/production_pulls.csv
+    output_format: csv
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 """
 
 RETURN = r"""
@@ -107,23 +172,257 @@ last_tag_pull_date:
 manifest_digest:
   description: SHA256 digest of the image.
   type: str
-  returned: always
+  returned: Only when getting statistics by tags or by digests.
   sample: sha256:a8f231c07da40107543d74ed1e9a1938a004b498377dbefcf29082c7a9e55ea7
 manifest_pull_count:
   description: Number of times that the image was pulled by its digest.
   type: int
-  returned: always.
+  returned: Only when getting statistics by tags or by digests.
   sample: 42
 last_manifest_pull_date:
   description: Date and time of the last pull operation.
   type: str
-  returned: always.
+  returned: Only when getting statistics by tags or by digests.
   sample: Mon, 29 Dec 2025 15:53:23 -0000
+totals:
+  description: Aggregated pull statistics for the organization.
+  type: dict
+  returned: Only when using the O(organization) parameter.
+  contains:
+    repositories:
+      description: Number of repositories in the organization.
+      type: int
+      sample: 12
+    tags:
+      description: Number of active tags in the organization.
+      type: int
+      sample: 154
+    tag_pull_count:
+      description: Number of times that the images were pulled by their tags.
+      type: int
+      sample: 4210
+    manifest_pull_count:
+      description:
+        - Number of times that the images were pulled by their digests.
+        - Each manifest is counted once per repository, even when several
+          tags reference it.
+      type: int
+      sample: 836
+top_repositories:
+  description:
+    - The repositories with the highest pull counts, most pulled first.
+    - The O(top) parameter gives the maximum number of items.
+    - The module ranks the repositories by their C(pull_count) value.
+  type: list
+  elements: dict
+  returned: Only when using the O(organization) parameter.
+  contains:
+    repository:
+      description: Name of the repository.
+      type: str
+      sample: smallimage
+    tags:
+      description: Number of active tags in the repository.
+      type: int
+      sample: 8
+    tag_pull_count:
+      description: Number of times that the images were pulled by their tags.
+      type: int
+      sample: 1632
+    manifest_pull_count:
+      description: Number of times that the images were pulled by their digests.
+      type: int
+      sample: 240
+    pull_count:
+      description:
+        - Total number of pulls (the sum of C(tag_pull_count) and
+          C(manifest_pull_count)).
+      type: int
+      sample: 1872
+top_tags:
+  description:
+    - The tags with the highest pull counts, most pulled first.
+    - The O(top) parameter gives the maximum number of items.
+    - The module ranks the tags by their C(tag_pull_count) value.
+  type: list
+  elements: dict
+  returned: Only when using the O(organization) parameter.
+  contains:
+    repository:
+      description: Name of the repository.
+      type: str
+      sample: smallimage
+    tag_name:
+      description: Name of the tag.
+      type: str
+      sample: latest
+    manifest_digest:
+      description: SHA256 digest of the image.
+      type: str
+      sample: sha256:a8f231c07da40107543d74ed1e9a1938a004b498377dbefcf29082c7a9e55ea7
+    tag_pull_count:
+      description: Number of times that the image was pulled by its tag.
+      type: int
+      sample: 1024
+    last_tag_pull_date:
+      description: Date and time of the last pull operation.
+      type: str
+      sample: Mon, 29 Dec 2025 15:53:23 -0000
+    manifest_pull_count:
+      description: Number of times that the image was pulled by its digest.
+      type: int
+      sample: 12
+    last_manifest_pull_date:
+      description: Date and time of the last pull operation.
+      type: str
+      sample: Mon, 29 Dec 2025 15:53:23 -0000
+output_file:
+  description: Path to the file that stores the pull statistics of the tags.
+  returned: Only when you set the O(output_file) parameter.
+  type: str
+  sample: /var/tmp/production_pulls.csv
 """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.batches import TopItems, iter_batches
+from ..module_utils.digest_set import DigestSet
+from ..module_utils.output_file import OutputFile
 from ..module_utils.quay_image import QuayImage
 
+# Fields of the records that the module writes in the output file
+OUTPUT_FIELDS = [
+    "namespace",
+    "repository",
+    "tag_name",
+    "manifest_digest",
+    "tag_pull_count",
+    "last_tag_pull_date",
+    "manifest_pull_count",
+    "last_manifest_pull_date",
+]
+
+# Number of tags for which the module retrieves the pull statistics in
+# parallel. That number is also the size of the pages of tags.
+TAG_BATCH_SIZE = 100
+
+
+def get_tag_stats(module, namespace, repository, tag):
+    """Return the pull statistics of a tag.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param namespace: The name of the organization.
+    :type namespace: str
+    :param repository: The name of the repository.
+    :type repository: str
+    :param tag: The tag, as returned by the API.
+    :type tag: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The record for the output file, or ``None`` if the tag has been
+             removed in the meantime.
+    :rtype: dict
+    """
+    stats = module.get_object_path(
+        "repository/{namespace}/{repository}/tag/{tag}/pull_statistics",
+        exit_on_error=False,
+        duplicate_underscore=False,
+        namespace=namespace,
+        repository=repository,
+        tag=tag["name"],
+    )
+    if not stats:
+        return None
+    return {
+        "namespace": namespace,
+        "repository": repository,
+        "tag_name": tag["name"],
+        "manifest_digest": stats.get("current_manifest_digest") or tag.get("manifest_digest"),
+        "tag_pull_count": stats.get("tag_pull_count") or 0,
+        "last_tag_pull_date": stats.get("last_tag_pull_date"),
+        "manifest_pull_count": stats.get("manifest_pull_count") or 0,
+        "last_manifest_pull_date": stats.get("last_manifest_pull_date"),
+    }
+
+
+def aggregate(module, organization, top, concurrency, out=None):
+    """Aggregate the pull statistics of all the tags in the organization.
+
+    The method processes the repositories one after the other, and the tags
+    of each repository by batches of :py:const:``TAG_BATCH_SIZE`` tags. It
+    keeps the current batch, the top items, and the manifest digests of the
+    current repository in memory.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: The name of the organization.
+    :type organization: str
+    :param top: The number of repositories and tags to return.
+    :type top: int
+    :param concurrency: Maximum number of API requests to send in parallel.
+    :type concurrency: int
+    :param out: The object that writes the records to the output file, or
+                ``None``.
+    :type out: :py:class:``OutputFile``
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: A tuple with the totals, the top repositories, and the top tags.
+    :rtype: tuple
+    """
+    totals = {"repositories": 0, "tags": 0, "tag_pull_count": 0, "manifest_pull_count": 0}
+    top_repositories = TopItems(top)
+    top_tags = TopItems(top)
+
+    for repo in module.iter_pages(
+        "repository",
+        "repositories",
+        query_params={"namespace": organization},
+        exit_on_error=False,
+    ):
+        repository = repo["name"]
+        repo_stats = {
+            "repository": repository,
+            "tags": 0,
+            "tag_pull_count": 0,
+            "manifest_pull_count": 0,
+        }
+        # Several tags can reference the same manifest. Count the pulls of
+        # each manifest only once.
+        manifests = DigestSet()
+        tags = module.iter_tags(organization, repository, exit_on_error=False)
+        for batch in iter_batches(tags, TAG_BATCH_SIZE):
+            records = module.run_concurrently(
+                lambda tag: get_tag_stats(module, organization, repository, tag),
+                batch,
+                concurrency,
+            )
+            for record in records:
+                if record is None:
+                    continue
+                if out:
+                    out.write(record)
+                repo_stats["tags"] += 1
+                repo_stats["tag_pull_count"] += record["tag_pull_count"]
+                digest = record["manifest_digest"]
+                if digest and manifests.add(digest):
+                    repo_stats["manifest_pull_count"] += record["manifest_pull_count"]
+                item = dict(record)
+                del item["namespace"]
+                top_tags.add(record["tag_pull_count"], item)
+
+        repo_stats["pull_count"] = (
+            repo_stats["tag_pull_count"] + repo_stats["manifest_pull_count"]
+        )
+        totals["repositories"] += 1
+        totals["tags"] += repo_stats["tags"]
+        totals["tag_pull_count"] += repo_stats["tag_pull_count"]
+        totals["manifest_pull_count"] += repo_stats["manifest_pull_count"]
+        top_repositories.add(repo_stats["pull_count"], repo_stats)
+
+    return totals, top_repositories.items(), top_tags.items()
+
 
 def exit_module(module, data):
     """Exit the module and return data.
@@ -150,23 +449,87 @@ def exit_module(module, data):
     module.exit_json(**result)
 
 
+def aggregate_organization(module, organization):
+    """Aggregate the pull statistics of the organization and exit the module.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param organization: The name of the organization.
+    :type organization: str
+    """
+    top = module.params.get("top")
+    concurrency = module.params.get("concurrency")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+    output_format = module.params.get("output_format")
+
+    if top < 0:
+        module.fail_json(msg="The `top' parameter must be a positive integer.")
+
+    if not module.get_namespace(organization):
+        module.fail_json(
+            msg="The {orgname} organization does not exist.".format(orgname=organization)
+        )
+
+    try:
+        if output_file:
+            fieldnames = OUTPUT_FIELDS if output_format == "csv" else None
+            with OutputFile(module, output_file, compress, fieldnames) as out:
+                totals, top_repositories, top_tags = aggregate(
+                    module, organization, top, concurrency, out
+                )
+        else:
+            totals, top_repositories, top_tags = aggregate(
+                module, organization, top, concurrency
+            )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    result = {
+        "changed": False,
+        "totals": totals,
+        "top_repositories": top_repositories,
+        "top_tags": top_tags,
+    }
+    if output_file:
+        result["output_file"] = output_file
+    module.exit_json(**result)
+
+
 def main():
     argument_spec = dict(
-        repository=dict(required=True),
+        repository=dict(),
         tag=dict(),
         digest=dict(),
+        organization=dict(),
+        top=dict(type="int", default=10),
+        concurrency=dict(type="int", default=8),
+        output_file=dict(type="path"),
+        compress=dict(type="bool", default=False),
+        output_format=dict(choices=["jsonl", "csv"], default="jsonl"),
     )
 
-    mutually_exclusive = [("tag", "digest")]
+    mutually_exclusive = [
+        ("tag", "digest"),
+        ("organization", "repository"),
+        ("organization", "tag"),
+        ("organization", "digest"),
+    ]
+    required_one_of = [("repository", "organization")]
 
     # Create a module for ourselves
     module = APIModule(
         argument_spec=argument_spec,
         mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
         supports_check_mode=True,
     )
 
     # Extract our parameters
+    organization = module.params.get("organization")
+    if organization:
+        aggregate_organization(module, organization)
+
     name = module.params.get("repository").strip("/")
     tag = module.params.get("tag")
     digest = module.params.get("digest")
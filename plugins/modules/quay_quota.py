@@ -120,7 +120,8 @@ EXAMPLES = r"""
 
 RETURN = r""" # """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_quota
 
 
 def main():
@@ -226,190 +227,19 @@ def main():
             qid=qid,
         )
 
-    updated = False
-
-    # User gave `warning_pct' and `reject_pct' but did not set `quota' and no
-    # quota exists yet for the organization.
-    # Set the quota to 8 TB by default
-    if (
-        quota is None
-        and not quota_details
-        and (warning_pct is not None or reject_pct is not None)
-    ):
-        quota = "8000000 TB"
-
-    # Convert the given quota in bytes
-    if quota is not None:
-        mult = 1
-        q = quota.lower()
-        if "tib" in q:
-            q = q.replace("tib", "")
-            mult = 1024 * 1024 * 1024 * 1024
-        elif "tb" in q:
-            q = q.replace("tb", "")
-            mult = 1000 * 1000 * 1000 * 1000
-        elif "gib" in q:
-            q = q.replace("gib", "")
-            mult = 1024 * 1024 * 1024
-        elif "gb" in q:
-            q = q.replace("gb", "")
-            mult = 1000 * 1000 * 1000
-        elif "mib" in q:
-            q = q.replace("mib", "")
-            mult = 1024 * 1024
-        elif "mb" in q:
-            q = q.replace("mb", "")
-            mult = 1000 * 1000
-        elif "kib" in q:
-            q = q.replace("kib", "")
-            mult = 1024
-        elif "kb" in q:
-            q = q.replace("kb", "")
-            mult = 1000
-        try:
-            q = int(float(q.replace(" ", "")) * mult)
-        except ValueError:
-            module.fail_json(
-                msg="Wrong format for the `quota' parameter: {quota} is not a float.".format(
-                    quota=quota
-                )
-            )
-
-        new_fields = {"limit_bytes": q}
-        if quota_details:
-            updated, _not_used = module.update(
-                quota_details,
-                "quota",
-                organization,
-                "organization/{orgname}/quota/{qid}",
-                new_fields,
-                auto_exit=False,
-                orgname=organization,
-                qid=qid,
-            )
-        else:
-            module.create(
-                "quota",
-                organization,
-                "organization/{orgname}/quota",
-                new_fields,
-                auto_exit=False,
-                orgname=organization,
-            )
-            updated = True
-
-            # Retrieve the new quota object
-            obj = module.get_object_path("organization/{orgname}/quota", orgname=organization)
-            try:
-                quota_details = obj[0]
-                qid = str(quota_details["id"])
-            except (TypeError, IndexError):
-                module.fail_json(
-                    msg="Cannot retrieve the new quota for the {org} organization.".format(
-                        org=organization
-                    )
-                )
-
-    # Retrieve the current limits
-    current_warning = None
-    current_warning_id = None
-    current_reject = None
-    current_reject_id = None
-    for limit in quota_details.get("limits", []):
-        if limit.get("type") == "Warning":
-            current_warning_id = str(limit.get("id"))
-            current_warning = limit.get("limit_percent")
-        if limit.get("type") == "Reject":
-            current_reject_id = str(limit.get("id"))
-            current_reject = limit.get("limit_percent")
-
-    #
-    # Warning limit
-    #
-
-    # Remove the limit when the given parameter is 0
-    if warning_pct == 0:
-        upd = module.delete(
-            current_warning_id,
-            "warning limit",
-            organization,
-            "organization/{orgname}/quota/{qid}/limit/{lid}",
-            auto_exit=False,
-            orgname=organization,
-            qid=qid,
-            lid=current_warning_id,
-        )
-        if upd:
-            updated = True
-    elif warning_pct and warning_pct != current_warning:
-        # Create the new limit
-        new_fields = {"type": "Warning", "threshold_percent": warning_pct}
-        if current_warning_id is None:
-            module.create(
-                "warning limit",
-                organization,
-                "organization/{orgname}/quota/{qid}/limit",
-                new_fields,
-                auto_exit=False,
-                orgname=organization,
-                qid=qid,
-            )
-        else:
-            module.unconditional_update(
-                "warning limit",
-                organization,
-                "organization/{orgname}/quota/{qid}/limit/{lid}",
-                new_fields,
-                orgname=organization,
-                qid=qid,
-                lid=current_warning_id,
-            )
-        updated = True
-
-    #
-    # Reject limit
-    #
-
-    # Remove the limit when the given parameter is 0
-    if reject_pct == 0:
-        upd = module.delete(
-            current_reject_id,
-            "reject limit",
+    # Set the quota and its limits. Quay requires a quota for setting limits.
+    try:
+        actions = apply_quota(
+            module,
             organization,
-            "organization/{orgname}/quota/{qid}/limit/{lid}",
-            auto_exit=False,
-            orgname=organization,
-            qid=qid,
-            lid=current_reject_id,
+            quota_details,
+            module.str_size_to_bytes("quota", quota) if quota is not None else None,
+            warning_pct,
+            reject_pct,
         )
-        if upd:
-            updated = True
-    elif reject_pct and reject_pct != current_reject:
-        # Create the new limit
-        new_fields = {"type": "Reject", "threshold_percent": reject_pct}
-        if current_reject_id is None:
-            module.create(
-                "reject limit",
-                organization,
-                "organization/{orgname}/quota/{qid}/limit",
-                new_fields,
-                auto_exit=False,
-                orgname=organization,
-                qid=qid,
-            )
-        else:
-            module.unconditional_update(
-                "reject limit",
-                organization,
-                "organization/{orgname}/quota/{qid}/limit/{lid}",
-                new_fields,
-                orgname=organization,
-                qid=qid,
-                lid=current_reject_id,
-            )
-        updated = True
-
-    module.exit_json(changed=updated)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
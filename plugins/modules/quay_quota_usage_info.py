@@ -0,0 +1,367 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_quota_usage_info
+short_description: Report the storage consumption of all the organizations
+description:
+  - Return the storage consumption of the organizations against their quota,
+    for all the organizations of the Quay installation.
+  - The module returns the organizations that consume the most, and can
+    write the consumption of every organization to a file.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  top:
+    description:
+      - Number of organizations that the module returns in the RV(rows)
+        list.
+    type: int
+    default: 20
+  sort_by:
+    description:
+      - Criteria to select and sort the organizations in the RV(rows) list.
+      - With V(utilization), the module returns the organizations that
+        consume the largest part of their quota. The organizations without
+        quota are not returned.
+      - With V(bytes), the module returns the organizations that consume the
+        most storage, with or without quota.
+    type: str
+    choices: [utilization, bytes]
+    default: utilization
+  min_utilization:
+    description:
+      - Only return and write the organizations that consume at least that
+        percentage of their quota.
+      - The organizations without quota are not returned and not written
+        when you set the parameter.
+    type: int
+  output_format:
+    description:
+      - Format of the O(output_file) file.
+      - With V(jsonl), the module writes one JSON object per line.
+      - With V(csv), the module writes a header line followed by one line per
+        organization.
+    type: str
+    choices: [jsonl, csv]
+    default: jsonl
+notes:
+  - The module requires superuser permissions. The token that you use in the
+    O(quay_token) parameter must have the C(super:user) scope.
+  - The module requires that your Quay administrator enables the quota
+    management (C(FEATURE_QUOTA_MANAGEMENT) in C(config.yaml)).
+  - The module retrieves the organizations by pages. If the API does not
+    return the quota consumption in the list, then the module retrieves the
+    details of the organizations of each page in parallel.
+  - The module keeps in memory only the current page of organizations and
+    the O(top) organizations.
+  - When you set the O(output_file) parameter, the module writes the
+    C(organization), C(used_bytes), C(quota_bytes), C(utilization),
+    C(warning_pct), and C(reject_pct) fields for each organization.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+  - infra.quay_configuration.output_file
+"""
+
+EXAMPLES = r"""
+- name: Retrieve the ten organizations that are the closest to their quota
+  infra.quay_configuration.quay_quota_usage_info:
+    top: 10
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: usage
+
+- name: Write the daily report of the organizations above 80% of their quota
+  infra.quay_configuration.quay_quota_usage_info:
+    min_utilization: 80
+    output_file: /var/tmp/quota_report.csv
+    output_format: csv
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+columns:
+  description: Names of the columns of the RV(rows) table.
+  returned: always
+  type: list
+  elements: str
+  sample: ["organization", "used_bytes", "quota_bytes", "utilization",
+           "warning_pct", "reject_pct"]
+rows:
+  description:
+    - The organizations that consume the most, sorted according to the
+      O(sort_by) parameter. The O(top) parameter gives the maximum number of
+      rows.
+    - Each row is a list of values in the order of the RV(columns) list.
+    - The C(utilization) value is the percentage of the quota that the
+      organization consumes, or V(null) if the organization has no quota.
+  returned: always
+  type: list
+  elements: list
+  sample: [["production", 190000000000, 200000000000, 95.0, 80, 95],
+           ["development", 45000000000, 50000000000, 90.0, 80, null]]
+totals:
+  description: Totals for all the organizations.
+  returned: always
+  type: dict
+  contains:
+    organizations:
+      description: Number of organizations.
+      type: int
+      sample: 1500
+    with_quota:
+      description: Number of organizations that have a quota.
+      type: int
+      sample: 1320
+    used_bytes:
+      description: Storage consumption of all the organizations, in bytes.
+      type: int
+      sample: 81250000000000
+    quota_bytes:
+      description: Sum of the quotas of the organizations, in bytes.
+      type: int
+      sample: 132000000000000
+    over_warning:
+      description:
+        - Number of organizations that reached the warning limit of their
+          quota.
+      type: int
+      sample: 12
+    over_reject:
+      description:
+        - Number of organizations that reached the reject limit of their
+          quota.
+      type: int
+      sample: 2
+output_file:
+  description: Path to the file that stores the report.
+  returned: when you set the O(output_file) parameter
+  type: str
+  sample: /var/tmp/quota_report.csv
+"""
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.batches import TopItems
+from ..module_utils.output_file import OutputFile
+
+COLUMNS = [
+    "organization",
+    "used_bytes",
+    "quota_bytes",
+    "utilization",
+    "warning_pct",
+    "reject_pct",
+]
+
+
+def usage_record(org):
+    """Compute the consumption of an organization.
+
+    :param org: The organization details, with the ``quotas`` and
+                ``quota_report`` attributes.
+    :type org: dict
+
+    :return: The record, with the keys from :py:const:``COLUMNS``.
+    :rtype: dict
+    """
+    report = org.get("quota_report") or {}
+    quota = org["quotas"][0] if org.get("quotas") else {}
+    used = report.get("quota_bytes") or 0
+    limit = quota.get("limit_bytes") or report.get("configured_quota")
+    record = {
+        "organization": org.get("name"),
+        "used_bytes": used,
+        "quota_bytes": limit,
+        "utilization": round(100.0 * used / limit, 2) if limit else None,
+        "warning_pct": None,
+        "reject_pct": None,
+    }
+    for limit_details in quota.get("limits", []):
+        if limit_details.get("type") == "Warning":
+            record["warning_pct"] = limit_details.get("limit_percent")
+        elif limit_details.get("type") == "Reject":
+            record["reject_pct"] = limit_details.get("limit_percent")
+    return record
+
+
+def add_usage(module, org):
+    """Retrieve the quota consumption of an organization if it is missing.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param org: The organization, as returned by the list of organizations.
+    :type org: dict
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The record for the organization (see :py:func:``usage_record``).
+    :rtype: dict
+    """
+    if "quota_report" not in org:
+        details = module.get_object_path(
+            "organization/{orgname}",
+            exit_on_error=False,
+            duplicate_underscore=False,
+            orgname=org.get("name"),
+        )
+        if details:
+            org = details
+    return usage_record(org)
+
+
+def main():
+    argument_spec = dict(
+        top=dict(type="int", default=20),
+        sort_by=dict(choices=["utilization", "bytes"], default="utilization"),
+        min_utilization=dict(type="int"),
+        concurrency=dict(type="int", default=8),
+        output_file=dict(type="path"),
+        compress=dict(type="bool", default=False),
+        output_format=dict(choices=["jsonl", "csv"], default="jsonl"),
+    )
+
+    # Create a module for ourselves
+    module = APIModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    # Extract our parameters
+    top = module.params.get("top")
+    sort_by = module.params.get("sort_by")
+    min_utilization = module.params.get("min_utilization")
+    concurrency = module.params.get("concurrency")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+    output_format = module.params.get("output_format")
+
+    if top < 0:
+        module.fail_json(msg="The `top' parameter must be a positive integer.")
+
+    totals = {
+        "organizations": 0,
+        "with_quota": 0,
+        "used_bytes": 0,
+        "quota_bytes": 0,
+        "over_warning": 0,
+        "over_reject": 0,
+    }
+    top_items = TopItems(top)
+
+    def process(out=None):
+        # Get the organizations
+        #
+        # GET /api/v1/superuser/organizations/
+        # {
+        #   "organizations": [
+        #     {
+        #       "name": "production",
+        #       "email": "prodlist@example.com",
+        #       "avatar": {...},
+        #       "quotas": [
+        #         {
+        #           "id": 2,
+        #           "limit_bytes": 200000000000,
+        #           "limits": [
+        #             {"id": 1, "type": "Warning", "limit_percent": 80},
+        #             {"id": 4, "type": "Reject", "limit_percent": 95}
+        #           ]
+        #         }
+        #       ],
+        #       "quota_report": {
+        #         "quota_bytes": 190000000000,
+        #         "configured_quota": 200000000000
+        #       }
+        #     }
+        #   ],
+        #   "next_page": "gAAAAABh...Wx1a"
+        # }
+        query = {}
+        while True:
+            page = module.get_object_path(
+                "superuser/organizations/",
+                query_params=query,
+                exit_on_error=False,
+                duplicate_underscore=False,
+            )
+            if not page:
+                return
+            records = module.run_concurrently(
+                lambda org: add_usage(module, org), page.get("organizations", []), concurrency
+            )
+            for record in records:
+                totals["organizations"] += 1
+                totals["used_bytes"] += record["used_bytes"]
+                utilization = record["utilization"]
+                if record["quota_bytes"]:
+                    totals["with_quota"] += 1
+                    totals["quota_bytes"] += record["quota_bytes"]
+                    if record["warning_pct"] and utilization >= record["warning_pct"]:
+                        totals["over_warning"] += 1
+                    if record["reject_pct"] and utilization >= record["reject_pct"]:
+                        totals["over_reject"] += 1
+                if min_utilization is not None and (
+                    utilization is None or utilization < min_utilization
+                ):
+                    continue
+                if out:
+                    out.write(record)
+                if sort_by == "bytes":
+                    top_items.add(record["used_bytes"], record)
+                elif utilization is not None:
+                    top_items.add(utilization, record)
+            next_page = page.get("next_page")
+            if not next_page:
+                return
+            query["next_page"] = next_page
+
+    try:
+        if output_file:
+            fieldnames = COLUMNS if output_format == "csv" else None
+            with OutputFile(module, output_file, compress, fieldnames) as out:
+                process(out)
+        else:
+            process()
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    rows = [[record[c] for c in COLUMNS] for record in top_items.items()]
+    result = {"changed": False, "columns": COLUMNS, "rows": rows, "totals": totals}
+    if output_file:
+        result["output_file"] = output_file
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -226,7 +226,8 @@ RETURN = r""" # """
 
 import re
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_repository, apply_repository_perms
 
 
 def main():
@@ -351,68 +352,20 @@ def main():
             full_repo_name=full_repo_name,
         )
 
-    changed = False
-    if not repo_details:
-        # Create the repository
-        new_fields = {
-            "namespace": namespace,
-            "repository": repo_shortname,
-            "repo_kind": "image",
-        }
-        new_fields["description"] = description if description else ""
-        new_fields["visibility"] = visibility if visibility else "private"
-        module.create("repository", full_repo_name, "repository", new_fields, auto_exit=False)
-        changed = True
-    else:
-        # Update description
-        if description is not None:
-            updated, _not_used = module.update(
-                repo_details,
-                "repository",
-                full_repo_name,
-                "repository/{full_repo_name}",
-                {"description": description},
-                auto_exit=False,
-                full_repo_name=full_repo_name,
-            )
-            if updated:
-                changed = True
-        # Update visibility
-        if (
-            visibility
-            and "is_public" in repo_details
-            and (
-                repo_details["is_public"]
-                and visibility == "private"
-                or not repo_details["is_public"]
-                and visibility == "public"
-            )
-        ):
-            module.create(
-                "repository",
-                full_repo_name,
-                "repository/{full_repo_name}/changevisibility",
-                {"visibility": visibility},
-                auto_exit=False,
-                full_repo_name=full_repo_name,
-            )
-            changed = True
-
-    if repo_state is not None and (
-        not repo_details
-        and repo_state != "NORMAL"
-        or repo_details
-        and repo_details.get("state") != repo_state
-    ):
-        # Update repo_state
-        module.unconditional_update(
-            "repository",
-            full_repo_name,
-            "repository/{full_repo_name}/changestate",
-            {"state": repo_state},
-            full_repo_name=full_repo_name,
+    # Create or update the repository
+    try:
+        actions = apply_repository(
+            module,
+            namespace,
+            repo_shortname,
+            repo_details,
+            description,
+            visibility,
+            repo_state,
         )
-        changed = True
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    changed = bool(actions)
 
     if star is not None and module.authenticated:
         if star and (not repo_details or not repo_details.get("is_starred")):
@@ -525,159 +478,19 @@ def main():
     if perms is None:
         module.exit_json(changed=changed)
 
-    # Get the team permissions
-    #
-    # GET /api/v1/repository/{namespace}/{repository}/permissions/team/
-    # {
-    #   "permissions": {
-    #     "developers": {
-    #       "role": "write",
-    #       "name": "developers",
-    #       "avatar": {
-    #         "name": "developers",
-    #         "hash": "5760...397e",
-    #         "color": "#9c9ede",
-    #         "kind": "team"
-    #       }
-    #     }
-    #   }
-    # }
-    team_perms = module.get_object_path(
-        "repository/{full_repo_name}/permissions/team/", full_repo_name=full_repo_name
-    )
-
-    # Set of (<team>, <perm>) tuples
-    current_team_perms = set(
-        [(p["name"], p["role"]) for _not_used, p in team_perms.get("permissions", {}).items()]
-    )
-    new_team_perms = set(
-        [(p["name"], p["role"]) for p in perms if p.get("type", "user") == "team"]
-    )
-
-    to_add = new_team_perms - current_team_perms
-    if append:
-        to_delete = set()
-    else:
-        to_delete = current_team_perms - new_team_perms
-
-    # Checking that all the teams to add exist
-    teams_not_found = []
-    for team in to_add:
-        if module.get_team(namespace, team[0]) is None:
-            teams_not_found.append(team[0])
-    if teams_not_found:
-        module.fail_json(
-            msg=(
-                "At least one team to associate to the repository does not exist: {teams}."
-            ).format(teams=", ".join(teams_not_found))
-        )
-
-    for perm in to_delete:
-        module.delete(
-            True,
-            "team repository permission",
-            perm[0],
-            "repository/{full_repo_name}/permissions/team/{team}",
-            auto_exit=False,
-            full_repo_name=full_repo_name,
-            team=perm[0],
-        )
-        changed = True
-
-    for perm in to_add:
-        module.unconditional_update(
-            "team repository permission",
-            perm[0],
-            "repository/{full_repo_name}/permissions/team/{team}",
-            {"role": perm[1]},
-            full_repo_name=full_repo_name,
-            team=perm[0],
-        )
-        changed = True
-
-    # Get the user permissions
-    #
-    # GET /api/v1/repository/{namespace}/{repository}/permissions/user/
-    # {
-    #   "permissions": {
-    #     "admin": {
-    #       "role": "admin",
-    #       "name": "admin",
-    #       "is_robot": false,
-    #       "avatar": {
-    #         "name": "admin",
-    #         "hash": "258d...da4f",
-    #         "color": "#98df8a",
-    #         "kind": "user"
-    #       },
-    #       "is_org_member": true
-    #     },
-    #     "operator2": {
-    #       "role": "write",
-    #       "name": "operator2",
-    #       "is_robot": false,
-    #       "avatar": {
-    #         "name": "operator2",
-    #         "hash": "4eaf...94b0",
-    #         "color": "#7f7f7f",
-    #         "kind": "user"
-    #       },
-    #       "is_org_member": false
-    #     }
-    #   }
-    # }
-    user_perms = module.get_object_path(
-        "repository/{full_repo_name}/permissions/user/", full_repo_name=full_repo_name
-    )
-
-    # Set of (<user>, <perm>) tuples
-    current_user_perms = set(
-        [(p["name"], p["role"]) for _not_used, p in user_perms.get("permissions", {}).items()]
-    )
-    new_user_perms = set(
-        [(p["name"], p["role"]) for p in perms if p.get("type", "user") == "user"]
-    )
-
-    to_add = new_user_perms - current_user_perms
-    if append:
-        to_delete = set()
-    else:
-        to_delete = current_user_perms - new_user_perms
-
-    # Checking that all the user account to add exist
-    accounts_not_found = []
-    for member in to_add:
-        if module.get_account(member[0]) is None:
-            accounts_not_found.append(member[0])
-    if accounts_not_found:
-        module.fail_json(
-            msg="At least one user to add as team member does not exist: {users}.".format(
-                users=", ".join(accounts_not_found)
-            )
-        )
-
-    for perm in to_delete:
-        module.delete(
-            True,
-            "user repository permission",
-            perm[0],
-            "repository/{full_repo_name}/permissions/user/{user}",
-            auto_exit=False,
-            full_repo_name=full_repo_name,
-            user=perm[0],
-        )
-        changed = True
-
-    for perm in to_add:
-        module.unconditional_update(
-            "user repository permission",
-            perm[0],
-            "repository/{full_repo_name}/permissions/user/{user}",
-            {"role": perm[1]},
-            full_repo_name=full_repo_name,
-            user=perm[0],
-        )
-        changed = True
+    # Set the team permissions, and then the user permissions
+    try:
+        for kind in ("team", "user"):
+            if apply_repository_perms(
+                module,
+                full_repo_name,
+                kind,
+                set([(p["name"], p["role"]) for p in perms if p.get("type", "user") == kind]),
+                append,
+            ):
+                changed = True
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
 
     module.exit_json(changed=changed)
 
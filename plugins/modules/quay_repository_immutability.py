@@ -131,7 +131,8 @@ EXAMPLES = r"""
 
 RETURN = r""" # """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_immutability_policy
 
 
 def main():
@@ -221,75 +222,21 @@ def main():
             msg="The {repo} repository does not exist.".format(repo=full_repo_name)
         )
 
-    # Prepare the data that gets set for update or create
-    new_fields = {}
-
-    # Changing the tag pattern of an existing policy
-    if new_tag_pattern:
-        new_fields["tagPattern"] = new_tag_pattern
-        # The original policy does not exists...
-        if not policy_details:
-            # and neither the policy for the new tag pattern.
-            # Create that policy.
-            if not new_policy_details:
-                new_fields["tagPatternMatches"] = (
-                    False if behavior == "not_matching_immutable" else True
-                )
-                module.create(
-                    "immutability policy",
-                    new_tag_pattern,
-                    "repository/{full_repo_name}/immutabilitypolicy/",
-                    new_fields,
-                    full_repo_name=full_repo_name,
-                )
-
-            # The original policy does not exists but the new one does.
-            # Update that new policy.
-            if behavior is not None:
-                new_fields["tagPatternMatches"] = (
-                    True if behavior == "matching_immutable" else False
-                )
-            else:
-                new_fields["tagPatternMatches"] = new_policy_details.get(
-                    "tagPatternMatches", True
-                )
-            module.update(
-                new_policy_details,
-                "immutability policy",
-                new_tag_pattern,
-                "repository/{full_repo_name}/immutabilitypolicy/{id}",
-                new_fields,
-                full_repo_name=full_repo_name,
-                id=new_policy_details.get("uuid", ""),
-            )
-    else:
-        new_fields["tagPattern"] = tag_pattern
-
-    if policy_details:
-        if behavior is not None:
-            new_fields["tagPatternMatches"] = (
-                True if behavior == "matching_immutable" else False
-            )
-        else:
-            new_fields["tagPatternMatches"] = policy_details.get("tagPatternMatches", True)
-        module.update(
-            policy_details,
-            "immutability policy",
-            tag_pattern,
-            "repository/{full_repo_name}/immutabilitypolicy/{id}",
-            new_fields,
+    # Create or update the policy. When changing the tag pattern, update the
+    # original policy, or the policy for the new tag pattern if the original
+    # policy does not exist.
+    try:
+        actions = apply_immutability_policy(
+            module,
+            "repository/{full_repo_name}/immutabilitypolicy/",
+            policy_details or new_policy_details,
+            new_tag_pattern or tag_pattern,
+            behavior,
             full_repo_name=full_repo_name,
-            id=policy_details.get("uuid", ""),
         )
-
-    new_fields["tagPatternMatches"] = False if behavior == "not_matching_immutable" else True
-    module.create(
-        "immutability policy",
-        tag_pattern,
-        "repository/{full_repo_name}/immutabilitypolicy/",
-        new_fields,
-        full_repo_name=full_repo_name,
-    )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
@@ -135,6 +135,25 @@ options:
       - Triggers an immediate image synchronization.
     type: bool
     default: false
+  wait:
+    description:
+      - Whether to wait for the synchronization to complete before returning.
+      - The module waits while the synchronization status is C(SYNC_NOW) or
+        C(SYNCING). Use the parameter with the O(force_sync) parameter to
+        trigger a synchronization and wait for its result.
+      - The module does not fail when the synchronization fails. Use the
+        RV(sync_status) return value to verify the result.
+    type: bool
+    default: false
+    version_added: '2.9.0'
+  wait_timeout:
+    description:
+      - Maximum number of seconds to wait for the synchronization to
+        complete. The module fails when the timeout expires.
+      - Only used when O(wait=true).
+    type: int
+    default: 1800
+    version_added: '2.9.0'
 notes:
   - Your Quay administrator must enable the mirroring capability of your Quay
     installation (C(FEATURE_REPO_MIRROR) in C(config.yaml)) to use this module.
@@ -150,6 +169,11 @@ notes:
     O(quay_token) must have administrator access to the repository.
   - See the M(infra.quay_configuration.quay_organization_mirror) module
     to mirror repositories in a dedicated organization.
+  - When O(wait=true), the module retrieves the mirror status in the same
+    process, first every second and then less and less often, up to every
+    30 seconds, while the status does not change. Quay can then answer with
+    short C(Not Modified) responses.
+  - In check mode, the module does not wait.
 attributes:
   check_mode:
     support: full
@@ -191,15 +215,99 @@ EXAMPLES = r"""
     force_sync: true
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+
+- name: Synchronize the repository and wait for at most 15 minutes
+  infra.quay_configuration.quay_repository_mirror:
+    name: production/smallimage
+    force_sync: true
+    wait: true
+    wait_timeout: 900
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: mirror
+
+- name: Ensure that the synchronization succeeded
+  ansible.builtin.assert:
+    that: mirror['sync_status'] == 'SUCCESS'
 """
 
-RETURN = r""" # """
+RETURN = r"""
+sync_status:
+  description:
+    - Status of the synchronization when the module returns, such as
+      C(SUCCESS), C(FAIL), or C(CANCEL).
+  returned: when O(wait=true), except in check mode
+  type: str
+  sample: SUCCESS
+timeline:
+  description:
+    - The successive statuses of the synchronization while the module was
+      waiting, oldest first.
+  returned: when O(wait=true), except in check mode
+  type: list
+  elements: dict
+  contains:
+    sync_status:
+      description: Status of the synchronization.
+      type: str
+      sample: SYNCING
+    elapsed:
+      description:
+        - Number of seconds between the beginning of the wait and the
+          moment the module observed the status.
+      type: float
+      sample: 4.5
+  sample: [
+      {"sync_status": "SYNC_NOW", "elapsed": 0.0},
+      {"sync_status": "SYNCING", "elapsed": 4.5},
+      {"sync_status": "SUCCESS", "elapsed": 92.1}
+    ]
+"""
 
 import copy
 from datetime import datetime
 
 from ..module_utils.api_module import APIModule, APIModuleError
 
+# Synchronization statuses for which the module keeps waiting
+PENDING_STATUSES = ("SYNC_NOW", "SYNCING")
+
+
+def exit_module(module, changed, full_repo_name):
+    """Wait for the synchronization to complete if requested, and exit.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param changed: Whether the module changed the configuration.
+    :type changed: bool
+    :param full_repo_name: The name of the repository, including its
+                           namespace.
+    :type full_repo_name: str
+    """
+    if not module.params.get("wait") or module.check_mode:
+        module.exit_json(changed=changed)
+
+    timeout = module.params.get("wait_timeout")
+    mirror_details, timeline, timed_out = module.poll_object_path(
+        "repository/{full_repo_name}/mirror",
+        lambda mirror: {"sync_status": mirror.get("sync_status")},
+        lambda mirror: mirror.get("sync_status") in PENDING_STATUSES,
+        timeout,
+        full_repo_name=full_repo_name,
+    )
+    sync_status = mirror_details.get("sync_status") if mirror_details else None
+    if timed_out:
+        module.fail_json(
+            msg=(
+                "The synchronization of the {repo} repository did not complete"
+                " within {timeout} seconds."
+            ).format(repo=full_repo_name, timeout=timeout),
+            changed=changed,
+            sync_status=sync_status,
+            timeline=timeline,
+        )
+    module.exit_json(changed=changed, sync_status=sync_status, timeline=timeline)
+
 
 def main():
     argument_spec = dict(
@@ -219,6 +327,8 @@ def main():
         https_proxy=dict(),
         no_proxy=dict(),
         unsigned_images=dict(type="bool"),
+        wait=dict(type="bool", default=False),
+        wait_timeout=dict(type="int", default=1800),
     )
 
     # Create a module for ourselves
@@ -388,7 +498,7 @@ def main():
                 full_repo_name=full_repo_name,
             )
 
-        module.exit_json(changed=True)
+        exit_module(module, True, full_repo_name)
 
     # Update the repository mirror configuration
     new_fields = {}
@@ -468,7 +578,7 @@ def main():
         )
         changed = True
 
-    module.exit_json(changed=changed)
+    exit_module(module, changed, full_repo_name)
 
 
 if __name__ == "__main__":
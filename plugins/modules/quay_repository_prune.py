@@ -141,7 +141,8 @@ id:
   sample: 45b4cc8b-178b-4ad4-bd33-75e3cce5e889
 """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_prune_policies, find_prune_policy
 
 
 def main():
@@ -209,17 +210,9 @@ def main():
     )
 
     # Finding a matching auto-pruning policy
-    policy_details = None
-    if policies:
-        for policy in policies.get("policies", []):
-            if (
-                policy.get("method") == data.get("method")
-                and policy.get("value") == data.get("value")
-                and policy.get("tagPattern") == data.get("tagPattern")
-                and policy.get("tagPatternMatches") == data.get("tagPatternMatches", True)
-            ):
-                policy_details = policy
-                break
+    policy_details = (
+        find_prune_policy(policies.get("policies", []), data) if policies else None
+    )
 
     # Remove the auto-pruning policy
     if state == "absent":
@@ -240,34 +233,20 @@ def main():
             msg="The {repo} repository does not exist.".format(repo=full_repo_name)
         )
 
-    # Remove all the auto-pruning policies, except the one that the user
-    # specifies
-    if not append:
-        deletions = False
-        for policy in policies.get("policies", []):
-            if not policy_details or (policy_details.get("uuid") != policy.get("uuid")):
-                module.delete(
-                    policy,
-                    "auto-pruning policy",
-                    policy.get("method"),
-                    "repository/{full_repo_name}/autoprunepolicy/{uuid}",
-                    auto_exit=False,
-                    full_repo_name=full_repo_name,
-                    uuid=policy.get("uuid"),
-                )
-                deletions = True
-        if policy_details:
-            module.exit_json(changed=deletions, id=policy_details.get("uuid"))
-
-    resp = module.create(
-        "auto-pruning policy",
-        method,
-        "repository/{full_repo_name}/autoprunepolicy/",
-        data,
-        auto_exit=False,
-        full_repo_name=full_repo_name,
-    )
-    module.exit_json(changed=True, id=resp.get("uuid"))
+    # Create the auto-pruning policy. Without append, also remove all the
+    # other auto-pruning policies
+    try:
+        actions, ids = apply_prune_policies(
+            module,
+            "repository/{full_repo_name}/autoprunepolicy/",
+            policies.get("policies", []) if policies else [],
+            [data],
+            append,
+            full_repo_name=full_repo_name,
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions), id=ids[0])
 
 
 if __name__ == "__main__":
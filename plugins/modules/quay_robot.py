@@ -174,9 +174,9 @@ token:
   sample: IWG3K5EW92KZLPP42PMOKM5CJ2DEAQMSCU33A35NR7MNL21004NKVP3BECOWSQP2
 """
 
-import json
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_robot
 
 
 def exit_module(module, changed, data):
@@ -234,13 +234,6 @@ def main():
     else:
         path_url = "user/robots/{robot_shortname}".format(robot_shortname=robot_shortname)
 
-    fed_url = "{url}/federation".format(url=path_url)
-    fed_req_set = (
-        set([(f.get("issuer"), f.get("subject")) for f in federations])
-        if federations
-        else set()
-    )
-
     # Get the robot account details.
     #
     # For robot accounts in organizations:
@@ -272,55 +265,14 @@ def main():
     if state == "absent":
         module.delete(robot_details, "robot account", name, path_url)
 
-    if robot_details:
-        if federations is None:
-            exit_module(module, False, robot_details)
-
-        # GET /api/v1/organization/{orgname}/robots/{robot_shortname}/federation
-        # [
-        #   {
-        #     "issuer": "https://keycloak-realm.quayadmin.org/realms/quayrealm",
-        #     "subject": "449e14f8-9eb5-4d59-a63e-b7a77c75f770"
-        #   }
-        # ]
-        fed_details = module.get_object_path(fed_url)
-        fed_curr_set = (
-            set([(f.get("issuer"), f.get("subject")) for f in fed_details])
-            if fed_details
-            else set()
+    # Create the robot account and set its federations
+    try:
+        actions, robot_data = apply_robot(
+            module, name, path_url, robot_details, description, federations, append
         )
-        fed_to_add = fed_req_set - fed_curr_set
-
-        if fed_req_set == fed_curr_set or (append and not fed_to_add):
-            exit_module(module, False, robot_details)
-
-        if append:
-            new_fields = [
-                {"issuer": f[0], "subject": f[1], "isExpanded": False}
-                for f in fed_req_set | fed_curr_set
-            ]
-        else:
-            new_fields = [
-                {"issuer": f[0], "subject": f[1], "isExpanded": False} for f in fed_req_set
-            ]
-        data = json.dumps(new_fields).encode()
-        module.create("robot account federation", name, fed_url, data, auto_exit=False)
-        exit_module(module, True, robot_details)
-
-    # Prepare the data that gets set for create
-    new_fields = {}
-    if description:
-        new_fields["description"] = description
-
-    robot_data = module.unconditional_update("robot account", name, path_url, new_fields)
-    if federations:
-        new_fields = [
-            {"issuer": f.get("issuer"), "subject": f.get("subject"), "isExpanded": False}
-            for f in federations
-        ]
-        data = json.dumps(new_fields).encode()
-        module.create("robot account federation", name, fed_url, data, auto_exit=False)
-    exit_module(module, True, robot_data)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    exit_module(module, bool(actions), robot_data)
 
 
 if __name__ == "__main__":
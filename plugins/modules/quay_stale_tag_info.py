@@ -0,0 +1,512 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_stale_tag_info
+short_description: Find the tags that nobody has pulled for a period
+description:
+  - Return the active tags of an organization that nobody has pulled, by
+    tag or by digest, for a given period.
+  - The module processes the repositories of the organization in parallel.
+    For each repository, it lists the tags, and only retrieves the pull
+    statistics of the tags that are older than the O(min_age) period.
+  - With the O(checkpoint_file) parameter, an interrupted run can resume
+    where it stopped instead of processing all the repositories again.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  organization:
+    description:
+      - Name of the organization or personal namespace to process.
+    type: str
+    required: true
+  idle_period:
+    description:
+      - A tag is stale when nobody has pulled it, by its tag or by its
+        digest, during that period.
+      - Accepts an integer for seconds, or an integer followed by the C(s),
+        C(m), C(h), C(d), or C(w) suffix for seconds, minutes, hours, days,
+        or weeks. For example, V(12w) for twelve weeks.
+    type: str
+    default: 90d
+  min_age:
+    description:
+      - Only consider the tags that were created before that period. The
+        module does not retrieve the pull statistics of the more recent tags.
+      - Uses the same format as the O(idle_period) parameter.
+      - By default, the module uses the O(idle_period) value.
+    type: str
+  output_format:
+    description:
+      - Format of the O(output_file) file.
+      - With V(jsonl), the module writes one JSON object per line.
+      - With V(csv), the module writes a header line followed by one line per
+        tag.
+    type: str
+    choices: [jsonl, csv]
+    default: jsonl
+  checkpoint_file:
+    description:
+      - Path to the file on the managed node where the module records the
+        repositories that it has processed, in the JSON format.
+      - The module updates the file, and appends the stale tags to the
+        O(output_file) file, after each repository. If the run fails, then
+        the next run only processes the remaining repositories, and appends
+        their stale tags to the O(output_file) file.
+      - The module deletes the file at the end of a successful run, so that
+        the next run processes the whole organization again.
+      - The module fails if the file was created for another organization or
+        with other O(idle_period) and O(min_age) values.
+      - Requires the O(output_file) parameter.
+    type: path
+notes:
+  - The module requires Quay version 3.16 or later.
+  - The module requires that your Quay administrator enables image statistics
+    for your installation (by setting C(FEATURE_IMAGE_PULL_STATS) to C(True) in
+    C(config.yaml)).
+  - When you set the O(output_file) parameter, the module writes the stale
+    tags to the file, with the C(namespace), C(repository), C(tag_name),
+    C(manifest_digest), C(start_ts), C(tag_pull_count),
+    C(last_tag_pull_date), C(manifest_pull_count), and
+    C(last_manifest_pull_date) fields. The module does not return the
+    RV(tags) list, and only keeps in memory the stale tags of the
+    repositories that it is processing.
+  - For large organizations, set the O(output_file) parameter instead of
+    returning the RV(tags) list.
+  - In check mode, the module retrieves the stale tags and returns their
+    number, but does not write the O(output_file) and O(checkpoint_file)
+    files.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+  - infra.quay_configuration.output_file
+"""
+
+EXAMPLES = r"""
+- name: Retrieve the tags of the development organization not pulled for 90 days
+  infra.quay_configuration.quay_stale_tag_info:
+    organization: development
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: stale
+
+- name: Write the tags of the production organization not pulled for 12 weeks
+  infra.quay_configuration.quay_stale_tag_info:
+    organization: production
+    idle_period: 12w
+    min_age: 26w
+    output_file: /var/tmp/production_stale.csv
+    output_format: csv
+    checkpoint_file: /var/tmp/production_stale.json
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+"""
+
+RETURN = r"""
+count:
+  description: Number of stale tags.
+  returned: always
+  type: int
+  sample: 312
+totals:
+  description:
+    - Totals for the organization.
+    - When the run resumes a preceding run, the totals include the
+      repositories that the preceding run processed.
+  returned: always
+  type: dict
+  contains:
+    repositories:
+      description: Number of repositories processed.
+      type: int
+      sample: 1250
+    tags:
+      description: Number of active tags.
+      type: int
+      sample: 86210
+    candidates:
+      description:
+        - Number of tags older than the O(min_age) period, for which the
+          module retrieved the pull statistics.
+      type: int
+      sample: 41022
+    stale:
+      description: Number of stale tags.
+      type: int
+      sample: 312
+tags:
+  description: The stale tags.
+  returned: when you do not set the O(output_file) parameter
+  type: list
+  elements: dict
+  contains:
+    namespace:
+      description: Name of the organization.
+      type: str
+      sample: production
+    repository:
+      description: Name of the repository.
+      type: str
+      sample: smallimage
+    tag_name:
+      description: Name of the tag.
+      type: str
+      sample: "1.2.0"
+    manifest_digest:
+      description: SHA256 digest of the image.
+      type: str
+      sample: sha256:a8f231c07da40107543d74ed1e9a1938a004b498377dbefcf29082c7a9e55ea7
+    start_ts:
+      description: Tag creation date, in seconds since the epoch.
+      type: int
+      sample: 1761826140
+    tag_pull_count:
+      description: Number of times that the image was pulled by its tag.
+      type: int
+      sample: 4
+    last_tag_pull_date:
+      description:
+        - Date and time of the last pull operation by tag.
+        - V(null) if nobody has pulled the image by its tag.
+      type: str
+      sample: Mon, 29 Dec 2025 15:53:23 -0000
+    manifest_pull_count:
+      description: Number of times that the image was pulled by its digest.
+      type: int
+      sample: 0
+    last_manifest_pull_date:
+      description:
+        - Date and time of the last pull operation by digest.
+        - V(null) if nobody has pulled the image by its digest.
+      type: str
+      sample: null
+output_file:
+  description: Path to the file that stores the stale tags.
+  returned: when you set the O(output_file) parameter
+  type: str
+  sample: /var/tmp/production_stale.csv
+"""
+
+import os
+import threading
+import time
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.checkpoint import read_checkpoint, save_checkpoint
+from ..module_utils.log_windows import parse_log_datetime
+from ..module_utils.output_file import OutputFile
+
+# Version of the format of the checkpoint file
+CHECKPOINT_VERSION = 1
+
+# Fields of the records that the module writes in the output file
+OUTPUT_FIELDS = [
+    "namespace",
+    "repository",
+    "tag_name",
+    "manifest_digest",
+    "start_ts",
+    "tag_pull_count",
+    "last_tag_pull_date",
+    "manifest_pull_count",
+    "last_manifest_pull_date",
+]
+
+
+def get_stale_record(module, namespace, repository, tag, cutoff):
+    """Return the record of a tag if nobody has pulled it since a date.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param namespace: The name of the organization.
+    :type namespace: str
+    :param repository: The name of the repository.
+    :type repository: str
+    :param tag: The tag, as returned by the API.
+    :type tag: dict
+    :param cutoff: The date, in seconds since the epoch.
+    :type cutoff: int
+
+    :raises APIModuleError: An API error occurred.
+
+    :return: The record for the output file, or ``None`` if the tag is not
+             stale or has been removed in the meantime.
+    :rtype: dict
+    """
+    # Get the pull statistics of the tag
+    #
+    # GET /api/v1/repository/{ns}/{repo}/tag/{tag}/pull_statistics
+    # {
+    #   "tag_name": "1.2.0",
+    #   "tag_pull_count": 4,
+    #   "last_tag_pull_date": "Mon, 29 Dec 2025 15:53:23 -0000",
+    #   "current_manifest_digest": "sha256:a8f2...5ea7",
+    #   "manifest_pull_count": 0,
+    #   "last_manifest_pull_date": null
+    # }
+    stats = module.get_object_path(
+        "repository/{namespace}/{repository}/tag/{tag}/pull_statistics",
+        exit_on_error=False,
+        duplicate_underscore=False,
+        namespace=namespace,
+        repository=repository,
+        tag=tag["name"],
+    )
+    if not stats:
+        return None
+    for key in ("last_tag_pull_date", "last_manifest_pull_date"):
+        if stats.get(key) and parse_log_datetime(stats[key]) >= cutoff:
+            return None
+    return {
+        "namespace": namespace,
+        "repository": repository,
+        "tag_name": tag["name"],
+        "manifest_digest": stats.get("current_manifest_digest") or tag.get("manifest_digest"),
+        "start_ts": tag.get("start_ts"),
+        "tag_pull_count": stats.get("tag_pull_count") or 0,
+        "last_tag_pull_date": stats.get("last_tag_pull_date"),
+        "manifest_pull_count": stats.get("manifest_pull_count") or 0,
+        "last_manifest_pull_date": stats.get("last_manifest_pull_date"),
+    }
+
+
+class StaleTagFinder(object):
+    """Find the stale tags of repositories and record the progress.
+
+    Several threads can process repositories at the same time. The object
+    serializes the writes to the output file and to the checkpoint file.
+    The stale tags of a repository are written, and the repository is
+    recorded in the checkpoint file, only when the whole repository is
+    processed. Therefore, a resumed run does not write the same tag twice.
+    """
+
+    def __init__(self, module, organization, out, checkpoint_file, state):
+        """Initialize the object.
+
+        :param module: The module object.
+        :type module: :py:class:``APIModule``
+        :param organization: The name of the organization.
+        :type organization: str
+        :param out: The object that writes the stale tags, or ``None``. When
+                    ``None``, the object collects the stale tags in the
+                    :py:attr:``tags`` list.
+        :type out: :py:class:``OutputFile``
+        :param checkpoint_file: Path to the checkpoint file, or ``None``.
+        :type checkpoint_file: str
+        :param state: The checkpoint data, with the ``now``, ``idle_period``,
+                      and ``min_age`` reference values, the ``done`` list of
+                      repositories, and the ``totals`` dictionary.
+        :type state: dict
+        """
+        self.module = module
+        self.organization = organization
+        self.out = out
+        self.checkpoint_file = checkpoint_file
+        self.state = state
+        self.cutoff = state["now"] - state["idle_period"]
+        self.created_before = state["now"] - state["min_age"]
+        self.tags = []
+        self.lock = threading.Lock()
+
+    def save(self):
+        """Write the checkpoint file, if any."""
+        if self.checkpoint_file and not self.module.check_mode:
+            save_checkpoint(self.module, self.checkpoint_file, self.state)
+
+    def repository(self, repository):
+        """Find the stale tags of a repository.
+
+        :param repository: The name of the repository.
+        :type repository: str
+
+        :raises APIModuleError: An API error occurred. The repository is not
+                                recorded in the checkpoint file.
+        """
+        tags = 0
+        candidates = 0
+        stale = []
+        for tag in self.module.iter_tags(self.organization, repository, exit_on_error=False):
+            tags += 1
+            if tag.get("start_ts", 0) > self.created_before:
+                continue
+            candidates += 1
+            record = get_stale_record(
+                self.module, self.organization, repository, tag, self.cutoff
+            )
+            if record:
+                stale.append(record)
+
+        with self.lock:
+            if self.out:
+                for record in stale:
+                    self.out.write(record)
+                self.out.flush()
+            else:
+                self.tags.extend(stale)
+            totals = self.state["totals"]
+            totals["repositories"] += 1
+            totals["tags"] += tags
+            totals["candidates"] += candidates
+            totals["stale"] += len(stale)
+            self.state["done"].append(repository)
+            self.save()
+
+
+def find_stale_tags(module, finder, repositories, concurrency):
+    """Process the repositories in parallel.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param finder: The object that processes the repositories.
+    :type finder: :py:class:``StaleTagFinder``
+    :param repositories: The names of the repositories to process.
+    :type repositories: list
+    :param concurrency: Maximum number of API requests to send in parallel.
+    :type concurrency: int
+    """
+    try:
+        module.run_concurrently(finder.repository, repositories, concurrency)
+    except APIModuleError as e:
+        msg = str(e)
+        if finder.checkpoint_file and not module.check_mode:
+            msg += " The next run resumes from the checkpoint file."
+        module.fail_json(msg=msg)
+
+
+def main():
+    argument_spec = dict(
+        organization=dict(required=True),
+        idle_period=dict(default="90d"),
+        min_age=dict(),
+        concurrency=dict(type="int", default=8),
+        output_file=dict(type="path"),
+        compress=dict(type="bool", default=False),
+        output_format=dict(choices=["jsonl", "csv"], default="jsonl"),
+        checkpoint_file=dict(type="path"),
+    )
+
+    required_by = {"checkpoint_file": "output_file"}
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec, required_by=required_by, supports_check_mode=True
+    )
+
+    # Extract our parameters
+    organization = module.params.get("organization")
+    idle_period = module.params.get("idle_period")
+    min_age = module.params.get("min_age")
+    concurrency = module.params.get("concurrency")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+    output_format = module.params.get("output_format")
+    checkpoint_file = module.params.get("checkpoint_file")
+
+    idle_period_s = module.str_period_to_second("idle_period", idle_period)
+    min_age_s = module.str_period_to_second("min_age", min_age) if min_age else idle_period_s
+
+    if not module.get_namespace(organization):
+        module.fail_json(
+            msg="The {orgname} organization does not exist.".format(orgname=organization)
+        )
+
+    scope = "organization/{orgname}".format(orgname=organization)
+    state = read_checkpoint(module, checkpoint_file, scope, CHECKPOINT_VERSION)
+    if state:
+        if state.get("idle_period") != idle_period_s or state.get("min_age") != min_age_s:
+            module.fail_json(
+                msg=(
+                    "The checkpoint file {path} was created with other values for the"
+                    " `idle_period' and `min_age' parameters. Remove the file to start"
+                    " a new run."
+                ).format(path=checkpoint_file)
+            )
+    else:
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "scope": scope,
+            "now": int(time.time()),
+            "idle_period": idle_period_s,
+            "min_age": min_age_s,
+            "done": [],
+            "totals": {"repositories": 0, "tags": 0, "candidates": 0, "stale": 0},
+        }
+        # A new run replaces the stale tags of the preceding run
+        if checkpoint_file and not module.check_mode and os.path.exists(output_file):
+            try:
+                os.remove(output_file)
+            except OSError as e:
+                module.fail_json(
+                    msg="Cannot remove {path}: {error}".format(path=output_file, error=e)
+                )
+
+    done = set(state["done"])
+    repositories = [
+        r["name"]
+        for r in module.iter_pages(
+            "repository", "repositories", query_params={"namespace": organization}
+        )
+        if r["name"] not in done
+    ]
+
+    if output_file and not module.check_mode:
+        fieldnames = OUTPUT_FIELDS if output_format == "csv" else None
+        with OutputFile(
+            module, output_file, compress, fieldnames, append=bool(checkpoint_file)
+        ) as out:
+            finder = StaleTagFinder(module, organization, out, checkpoint_file, state)
+            finder.save()
+            find_stale_tags(module, finder, repositories, concurrency)
+    else:
+        finder = StaleTagFinder(module, organization, None, checkpoint_file, state)
+        find_stale_tags(module, finder, repositories, concurrency)
+
+    # The run is complete
+    if checkpoint_file and not module.check_mode:
+        try:
+            os.remove(checkpoint_file)
+        except OSError:
+            pass
+
+    result = {"changed": False, "count": state["totals"]["stale"], "totals": state["totals"]}
+    if output_file:
+        result["output_file"] = output_file
+    else:
+        result["tags"] = finder.tags
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
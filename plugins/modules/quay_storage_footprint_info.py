@@ -0,0 +1,348 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# For accessing the API documentation from a running system, use the swagger-ui
+# container image:
+#
+#  $ podman run -p 8888:8080 --name=swag -d --rm \
+#      -e API_URL=http://your.quay.installation:8080/api/v1/discovery \
+#      docker.io/swaggerapi/swagger-ui
+#
+#  (replace the hostname and port in API_URL with your own installation)
+#
+# And then navigate to http://localhost:8888
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+---
+module: quay_storage_footprint_info
+short_description: Compute the deduplicated storage footprint of repositories
+description:
+  - Return the storage that the images of repositories consume, without
+    counting several times the manifests and the layers that several tags
+    share.
+  - The module also returns the sum of the tag sizes, which counts the
+    shared manifests and layers several times, so that you can compare the
+    two values.
+version_added: '2.9.0'
+author: Hervé Quatremain (@herve4m)
+options:
+  repositories:
+    description:
+      - Names of the repositories to process. The format for each name is
+        C(namespace)/C(shortname). The namespace can be an organization or a
+        personal namespace.
+      - If you omit the namespace part in the name, then the module looks for
+        the repository in your personal namespace.
+      - Mutually exclusive with O(namespace).
+    type: list
+    elements: str
+  namespace:
+    description:
+      - Name of the organization or personal namespace. The module processes
+        all the repositories in that namespace.
+      - Mutually exclusive with O(repositories).
+    type: str
+  layers:
+    description:
+      - Whether to retrieve the layers of the manifests to also deduplicate
+        the layers that several manifests share.
+      - The module sends an additional API request for each distinct
+        manifest in each repository, which is slower.
+    type: bool
+    default: false
+notes:
+  - The module only processes the active tags.
+  - The module deduplicates the manifests and the layers by digest, in each
+    repository and across all the processed repositories. For the RV(totals)
+    dictionary, a manifest or a layer that several repositories share is
+    counted once.
+  - The module keeps in memory only one page of tags and the digests of the
+    manifests and the layers that it has already counted.
+  - The module does not retrieve the layers of the manifest lists. The
+    manifests that a manifest list references are only counted if tags also
+    reference them.
+  - The module returns zero counts for the repositories that do not exist.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: none
+  platform:
+    support: full
+    platforms: all
+extends_documentation_fragment:
+  - ansible.builtin.action_common_attributes
+  - infra.quay_configuration.auth
+  - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+"""
+
+EXAMPLES = r"""
+- name: Compute the storage footprint of two repositories
+  infra.quay_configuration.quay_storage_footprint_info:
+    repositories:
+      - production/smallimage
+      - production/bigimage
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: footprint
+
+- name: Compute the storage footprint of the organization, layers included
+  infra.quay_configuration.quay_storage_footprint_info:
+    namespace: production
+    layers: true
+    concurrency: 16
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: footprint
+
+- name: Display the storage that the organization consumes
+  ansible.builtin.debug:
+    msg: "{{ footprint['totals']['unique_bytes'] | human_readable }}"
+"""
+
+RETURN = r"""
+repositories:
+  description: Storage footprint of each repository.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    repository:
+      description: Name of the repository, including its namespace.
+      type: str
+      returned: always
+      sample: production/smallimage
+    tags:
+      description: Number of active tags in the repository.
+      type: int
+      returned: always
+      sample: 42
+    naive_bytes:
+      description: Sum of the sizes of the tags, in bytes.
+      type: int
+      returned: always
+      sample: 3215667200
+    manifests:
+      description: Number of distinct manifests that the tags reference.
+      type: int
+      returned: always
+      sample: 12
+    manifest_bytes:
+      description: Sum of the sizes of the distinct manifests, in bytes.
+      type: int
+      returned: always
+      sample: 917333000
+    blobs:
+      description: Number of distinct layers in the distinct manifests.
+      type: int
+      returned: when O(layers=true)
+      sample: 31
+    blob_bytes:
+      description: Sum of the sizes of the distinct layers, in bytes.
+      type: int
+      returned: when O(layers=true)
+      sample: 402653184
+    unique_bytes:
+      description:
+        - Deduplicated storage footprint of the repository, in bytes.
+        - The value is RV(repositories[].blob_bytes) if O(layers=true), and
+          RV(repositories[].manifest_bytes) otherwise.
+      type: int
+      returned: always
+      sample: 402653184
+totals:
+  description:
+    - Totals for all the repositories.
+    - The dictionary has the same keys as the items of the RV(repositories)
+      list, except C(repository), and a C(repositories) key that gives the
+      number of repositories.
+    - The manifests and the layers that several repositories share are
+      counted once.
+  returned: always
+  type: dict
+  sample: {
+      "repositories": 2,
+      "tags": 84,
+      "naive_bytes": 6431334400,
+      "manifests": 20,
+      "manifest_bytes": 1589762000,
+      "blobs": 47,
+      "blob_bytes": 603979776,
+      "unique_bytes": 603979776
+    }
+"""
+
+import threading
+
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.digest_set import DigestSet
+
+
+class Footprint(object):
+    """Compute the storage footprint of repositories.
+
+    The object deduplicates the manifests and the layers in each repository,
+    and across all the repositories it processes. Several threads can call
+    the :py:meth:``repository`` method at the same time.
+    """
+
+    def __init__(self, module, layers):
+        """Initialize the object.
+
+        :param module: The module object.
+        :type module: :py:class:``APIModule``
+        :param layers: Whether to retrieve and deduplicate the layers.
+        :type layers: bool
+        """
+        self.module = module
+        self.layers = layers
+        self.manifests = DigestSet()
+        self.blobs = DigestSet()
+        self.totals = {"manifests": 0, "manifest_bytes": 0}
+        if layers:
+            self.totals.update({"blobs": 0, "blob_bytes": 0})
+        self._lock = threading.Lock()
+
+    def _count_shared(self, digests, digest, size, count_key, bytes_key):
+        """Count the digest in the totals if no repository has counted it."""
+        with self._lock:
+            if digests.add(digest):
+                self.totals[count_key] += 1
+                self.totals[bytes_key] += size
+
+    def get_layers(self, namespace, repository, digest):
+        """Return the layers of a manifest.
+
+        :param namespace: The name of the repository's namespace.
+        :type namespace: str
+        :param repository: The name of the repository.
+        :type repository: str
+        :param digest: The digest of the manifest.
+        :type digest: str
+
+        :raises APIModuleError: An API error occurred.
+
+        :return: The layers, as returned by the API.
+        :rtype: list
+        """
+        # Get the manifest (see the quay_layer_info module)
+        #
+        # GET /api/v1/repository/{namespace}/{repository}/manifest/{digest}
+        # {
+        #   "digest": "sha256:53b2...a7c8",
+        #   "is_manifest_list": false,
+        #   "layers": [
+        #     {
+        #       "index": 0,
+        #       "compressed_size": 2206931,
+        #       "blob_digest": "sha256:6d98...d913",
+        #       ...
+        #     },
+        #     ...
+        #   ],
+        #   ...
+        # }
+        manifest = self.module.get_object_path(
+            "repository/{namespace}/{repository}/manifest/{manifest_digest}",
+            exit_on_error=False,
+            duplicate_underscore=False,
+            namespace=namespace,
+            repository=repository,
+            manifest_digest=digest,
+        )
+        return (manifest.get("layers") or []) if manifest else []
+
+    def repository(self, name):
+        """Compute the storage footprint of a repository.
+
+        :param name: The name of the repository, including its namespace.
+        :type name: str
+
+        :raises APIModuleError: An API error occurred.
+
+        :return: The footprint of the repository.
+        :rtype: dict
+        """
+        namespace, repo_shortname = name.split("/", 1)
+        result = {"repository": name, "tags": 0, "naive_bytes": 0}
+        result.update({k: 0 for k in self.totals})
+        manifests = DigestSet()
+        blobs = DigestSet()
+        for tag in self.module.iter_tags(namespace, repo_shortname, exit_on_error=False):
+            size = tag.get("size") or 0
+            result["tags"] += 1
+            result["naive_bytes"] += size
+            digest = tag.get("manifest_digest")
+            if not digest or not manifests.add(digest):
+                continue
+            result["manifests"] += 1
+            result["manifest_bytes"] += size
+            self._count_shared(self.manifests, digest, size, "manifests", "manifest_bytes")
+            if not self.layers or tag.get("is_manifest_list"):
+                continue
+            for layer in self.get_layers(namespace, repo_shortname, digest):
+                blob = layer.get("blob_digest")
+                if not blob or not blobs.add(blob):
+                    continue
+                blob_size = layer.get("compressed_size") or 0
+                result["blobs"] += 1
+                result["blob_bytes"] += blob_size
+                self._count_shared(self.blobs, blob, blob_size, "blobs", "blob_bytes")
+        result["unique_bytes"] = result["blob_bytes" if self.layers else "manifest_bytes"]
+        return result
+
+
+def main():
+    argument_spec = dict(
+        repositories=dict(type="list", elements="str"),
+        namespace=dict(),
+        layers=dict(type="bool", default=False),
+        concurrency=dict(type="int", default=8),
+    )
+
+    mutually_exclusive = [("repositories", "namespace")]
+    required_one_of = [("repositories", "namespace")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    repositories = module.params.get("repositories")
+    namespace = module.params.get("namespace")
+    layers = module.params.get("layers")
+    concurrency = module.params.get("concurrency")
+
+    repo_names = module.get_repository_names(repositories, namespace)
+
+    footprint = Footprint(module, layers)
+    try:
+        results = module.run_concurrently(footprint.repository, repo_names, concurrency)
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    totals = {"repositories": len(results), "tags": 0, "naive_bytes": 0}
+    for result in results:
+        totals["tags"] += result["tags"]
+        totals["naive_bytes"] += result["naive_bytes"]
+    totals.update(footprint.totals)
+    totals["unique_bytes"] = totals["blob_bytes" if layers else "manifest_bytes"]
+    module.exit_json(changed=False, repositories=results, totals=totals)
+
+
+if __name__ == "__main__":
+    main()
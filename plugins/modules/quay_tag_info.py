@@ -62,6 +62,75 @@ options:
         expiration or deletion date.
     type: bool
     default: false
+  name_regex:
+    description:
+      - Only return the tags which names match that Python regular
+        expression.
+      - The module uses the C(re.search()) function. Use the C(^) and C($)
+        anchors to match the whole name.
+    type: str
+    version_added: '2.9.0'
+  min_age:
+    description:
+      - Only return the tags that were created or updated at least that
+        time ago.
+      - Accepts an integer for seconds, or an integer followed by the C(s),
+        C(m), C(h), C(d), or C(w) suffix for seconds, minutes, hours, days,
+        or weeks. For example, V(2w) for two weeks.
+    type: str
+    version_added: '2.9.0'
+  max_age:
+    description:
+      - Only return the tags that were created or updated at most that time
+        ago.
+      - Accepts the same formats as the O(min_age) parameter.
+    type: str
+    version_added: '2.9.0'
+  min_size:
+    description:
+      - Only return the tags which image size is greater than or equal to
+        that value.
+      - Accepts a number of bytes, or a number followed by the C(KB), C(KiB),
+        C(MB), C(MiB), C(GB), C(GiB), C(TB), or C(TiB) suffix. For example,
+        V(1.5 GiB).
+    type: str
+    version_added: '2.9.0'
+  max_size:
+    description:
+      - Only return the tags which image size is less than or equal to that
+        value.
+      - Accepts the same formats as the O(min_size) parameter.
+    type: str
+    version_added: '2.9.0'
+  manifest_lists_only:
+    description:
+      - Only return the tags that reference a manifest list (multi-architecture
+        images).
+    type: bool
+    default: false
+    version_added: '2.9.0'
+  fields:
+    description:
+      - Only return those attributes for each tag, such as V(name) and
+        V(manifest_digest).
+      - By default, the module returns all the attributes.
+    type: list
+    elements: str
+    version_added: '2.9.0'
+  max_results:
+    description:
+      - Maximum number of tags to return.
+      - The module stops retrieving the tags as soon as it reaches that
+        number.
+      - By default, the module returns all the matching tags.
+    type: int
+    version_added: '2.9.0'
+notes:
+  - The module retrieves the tags by pages of 100 tags, and applies the
+    filters to each page. When you set the O(output_file) parameter, the
+    module writes the matching tags to the file as it retrieves them, and
+    the memory consumption does not depend on the number of tags in the
+    repository.
 attributes:
   check_mode:
     support: full
@@ -74,6 +143,7 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.output_file
 """
 
 EXAMPLES = r"""
@@ -101,12 +171,38 @@ EXAMPLES = r"""
     quay_host: https://quay.example.com
     quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
   register: tags
+
+- name: Retrieve the name and digest of the release tags older than 90 days
+  infra.quay_configuration.quay_tag_info:
+    repository: production/smallimage
+    only_active_tags: true
+    name_regex: "^v[0-9]+\\."
+    min_age: 90d
+    fields:
+      - name
+      - manifest_digest
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: tags
+
+- name: Write the multi-architecture tags larger than 1 GiB to a file
+  infra.quay_configuration.quay_tag_info:
+    repository: production/bigimage
+    only_active_tags: true
+    manifest_lists_only: true
+    min_size: 1 GiB
+    output_file: /var/tmp/bigimage_tags.jsonl
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
 """
 
 RETURN = r"""
 tags:
-  description: List of the tags in the repository.
-  returned: always
+  description:
+    - List of the tags in the repository.
+    - When you set the O(fields) parameter, each item only includes the
+      requested attributes.
+  returned: when you do not set the O(output_file) parameter
   type: list
   elements: dict
   contains:
@@ -129,6 +225,11 @@ tags:
       type: str
       returned: always
       sample: sha256:a8f231c07da40107543d74ed1e9a1938a004b498377dbefcf29082c7a9e55ea7
+    is_manifest_list:
+      description: Whether the tag references a manifest list.
+      type: bool
+      returned: always
+      sample: false
     start_ts:
       description: Time in seconds since the epoch of the last tag modification.
       type: int
@@ -192,18 +293,98 @@ tags:
               "expiration": "Fri, 24 Dec 2021 08:54:00 -0000"
             }
           ]
+count:
+  description: Number of tags written to the O(output_file) file.
+  returned: when you set the O(output_file) parameter
+  type: int
+  sample: 1542
+output_file:
+  description: Path to the file that stores the tags.
+  returned: when you set the O(output_file) parameter
+  type: str
+  sample: /var/tmp/bigimage_tags.jsonl
 """
 
+import itertools
+import re
+import time
+
 from ..module_utils.api_module import APIModule
+from ..module_utils.output_file import OutputFile
 from ..module_utils.quay_image import QuayImage
 
 
+def build_filter(module, digest):
+    """Return a function that tells whether a tag matches the filters.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param digest: The image digest to search for, or ``None``.
+    :type digest: str
+
+    :return: A function that receives a tag, as returned by the API, and
+             returns ``True`` if the tag matches all the filters.
+    :rtype: callable
+    """
+    name_regex = module.params.get("name_regex")
+    min_age = module.params.get("min_age")
+    max_age = module.params.get("max_age")
+    min_size = module.params.get("min_size")
+    max_size = module.params.get("max_size")
+    manifest_lists_only = module.params.get("manifest_lists_only")
+
+    if name_regex:
+        try:
+            name_re = re.compile(name_regex)
+        except re.error as e:
+            module.fail_json(
+                msg="Wrong format for the `name_regex' parameter: {error}.".format(error=e)
+            )
+    now = int(time.time())
+    # Convert the age window into a start_ts window
+    min_start_ts = now - module.str_period_to_second("max_age", max_age) if max_age else None
+    max_start_ts = now - module.str_period_to_second("min_age", min_age) if min_age else None
+    min_bytes = module.str_size_to_bytes("min_size", min_size) if min_size else None
+    max_bytes = module.str_size_to_bytes("max_size", max_size) if max_size else None
+
+    def match(tag):
+        if digest and tag.get("manifest_digest") != digest:
+            return False
+        if manifest_lists_only and not tag.get("is_manifest_list"):
+            return False
+        if name_regex and not name_re.search(tag.get("name", "")):
+            return False
+        start_ts = tag.get("start_ts", 0)
+        if min_start_ts is not None and start_ts < min_start_ts:
+            return False
+        if max_start_ts is not None and start_ts > max_start_ts:
+            return False
+        size = tag.get("size") or 0
+        if min_bytes is not None and size < min_bytes:
+            return False
+        if max_bytes is not None and size > max_bytes:
+            return False
+        return True
+
+    return match
+
+
 def main():
     argument_spec = dict(
         repository=dict(required=True),
         tag=dict(),
         digest=dict(),
         only_active_tags=dict(type="bool", default=False),
+        name_regex=dict(),
+        min_age=dict(),
+        max_age=dict(),
+        min_size=dict(),
+        max_size=dict(),
+        manifest_lists_only=dict(type="bool", default=False),
+        fields=dict(type="list", elements="str"),
+        max_results=dict(type="int"),
+        output_file=dict(type="path"),
+        compress=dict(type="bool", default=False),
     )
 
     mutually_exclusive = [("tag", "digest")]
@@ -220,6 +401,13 @@ def main():
     tag = module.params.get("tag")
     digest = module.params.get("digest")
     only_active_tags = module.params.get("only_active_tags")
+    fields = module.params.get("fields")
+    max_results = module.params.get("max_results")
+    output_file = module.params.get("output_file")
+    compress = module.params.get("compress")
+
+    if max_results is not None and max_results < 1:
+        module.fail_json(msg="The `max_results' parameter must be a positive integer.")
 
     # Get the components of the given image (namespace, repository)
     img = QuayImage(module, name)
@@ -232,10 +420,10 @@ def main():
             ).format(name=name)
         )
 
+    match = build_filter(module, digest)
+
     # Check whether the namespace exists (organization or user account)
     namespace_details = module.get_namespace(namespace)
-    if not namespace_details:
-        module.exit_json(changed=False, tags=[])
 
     # Get the tags
     #   [
@@ -280,8 +468,26 @@ def main():
     #       "expiration": "Thu, 30 Sep 2021 06:10:22 -0000"
     #     }
     #   ]
-    tag_list = module.get_tags(namespace, img.repository, tag, digest, only_active_tags)
-    module.exit_json(changed=False, tags=tag_list)
+    #
+    # The tags are filtered one page at a time, and the module stops
+    # retrieving the pages when it reaches the maximum number of results.
+    if namespace_details:
+        tags = module.iter_tags(namespace, img.repository, tag, only_active_tags)
+    else:
+        tags = iter([])
+    tags = (t for t in tags if match(t))
+    if fields:
+        tags = (dict((k, v) for k, v in t.items() if k in fields) for t in tags)
+    if max_results:
+        tags = itertools.islice(tags, max_results)
+
+    if output_file:
+        with OutputFile(module, output_file, compress) as out:
+            for t in tags:
+                out.write(t)
+        module.exit_json(changed=False, count=out.count, output_file=output_file)
+
+    module.exit_json(changed=False, tags=list(tags))
 
 
 if __name__ == "__main__":
@@ -151,7 +151,8 @@ EXAMPLES = r"""
 
 RETURN = r""" # """
 
-from ..module_utils.api_module import APIModule
+from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_team
 
 
 def main():
@@ -283,131 +284,14 @@ def main():
             teamname=name,
         )
 
-    # Prepare the data that gets set for create or update
-    new_fields = {"name": name}
-    if description is not None:
-        new_fields["description"] = description
-    # The role attribute is mandatory
-    if role:
-        new_fields["role"] = role
-    elif team_details:
-        new_fields["role"] = team_details.get("role", "member")
-    else:
-        new_fields["role"] = "member"
-
-    # Same PUT request for creating or updating the object
-    updated, _not_used = module.update(
-        team_details,
-        "team",
-        name,
-        "organization/{orgname}/team/{teamname}",
-        new_fields,
-        auto_exit=False,
-        orgname=organization,
-        teamname=name,
-    )
-
-    # Get the team members.
-    #
-    # GET /api/v1/organization/{orgname}/team/{teamname}/members
-    # {
-    #   "name": "teamxyz",
-    #   "members": [
-    #     {
-    #       "name": "operator1",
-    #       "kind": "user",
-    #       "is_robot": false,
-    #       "avatar": {
-    #         "name": "operator1",
-    #         "hash": "b2eb...336b",
-    #         "color": "#17becf",
-    #         "kind": "user"
-    #       },
-    #       "invited": false
-    #     },
-    #     {
-    #       "name": "developer1",
-    #       "kind": "user",
-    #       "is_robot": false,
-    #       "avatar": {
-    #         "name": "developer1",
-    #         "hash": "d7bc...9b34",
-    #         "color": "#9c9ede",
-    #         "kind": "user"
-    #       },
-    #       "invited": false
-    #     },
-    #     {
-    #       "name": "production+automation",
-    #       "kind": "user",
-    #       "is_robot": true,
-    #       "avatar": {
-    #         "name": "production+automation",
-    #         "hash": "1543...a801",
-    #         "color": "#5254a3",
-    #         "kind": "robot"
-    #       },
-    #       "invited": false
-    #     }
-    #   ],
-    #   "can_edit": true
-    # }
-    team_members = module.get_object_path(
-        "organization/{orgname}/team/{teamname}/members",
-        query_params={"includePending": True},
-        orgname=organization,
-        teamname=name,
-    )
-    if team_members:
-        current_members = set(
-            [user["name"] for user in team_members.get("members", []) if "name" in user]
-        )
-    else:
-        current_members = set()
-
-    new_members = set(members if members else [])
-
-    to_add = new_members - current_members
-    if append:
-        to_delete = set()
-    else:
-        to_delete = current_members - new_members
-
-    # Checking that all the user account to add exist
-    accounts_not_found = []
-    for member in to_add:
-        if module.get_account(member) is None:
-            accounts_not_found.append(member)
-    if accounts_not_found:
-        module.fail_json(
-            msg="At least one user to add as team member does not exist: {users}.".format(
-                users=", ".join(accounts_not_found)
-            )
-        )
-
-    for member in to_add:
-        module.unconditional_update(
-            "team member",
-            member,
-            "organization/{orgname}/team/{teamname}/members/{member}",
-            {},
-            orgname=organization,
-            teamname=name,
-            member=member,
-        )
-    for member in to_delete:
-        module.delete(
-            True,
-            "team member",
-            member,
-            "organization/{orgname}/team/{teamname}/members/{member}",
-            auto_exit=False,
-            orgname=organization,
-            teamname=name,
-            member=member,
+    # Create or update the team and set its members
+    try:
+        actions = apply_team(
+            module, organization, name, team_details, role, description, members, append
         )
-
-    module.exit_json(changed=updated or len(to_add) or len(to_delete))
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
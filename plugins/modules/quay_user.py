@@ -145,6 +145,7 @@ EXAMPLES = r"""
 RETURN = r""" # """
 
 from ..module_utils.api_module import APIModule, APIModuleError
+from ..module_utils.reconcile import apply_user
 
 
 def main():
@@ -226,38 +227,14 @@ def main():
             username=username,
         )
 
-    # Create the user
-    if user_details is None:
-        new_fields = {"username": username}
-        if email:
-            new_fields["email"] = email
-        module.create("user", username, "superuser/users/", new_fields, auto_exit=False)
-        user_details = new_fields
-        user_details["enabled"] = True
-        created = True
-    else:
-        created = False
-
-    # Create the data that gets sent for update
-    new_fields = {"superuser": superuser} if superuser is not None else {}
-    if enabled is not None:
-        new_fields["enabled"] = enabled
-    if email:
-        new_fields["email"] = email
-    if password:
-        new_fields["password"] = password
-
-    updated, _not_used = module.update(
-        user_details,
-        "user",
-        username,
-        "superuser/users/{username}",
-        new_fields,
-        auto_exit=False,
-        username=username,
-    )
-
-    module.exit_json(changed=created or updated)
+    # Create or update the user
+    try:
+        actions = apply_user(
+            module, username, user_details, email, password, enabled, superuser
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+    module.exit_json(changed=bool(actions))
 
 
 if __name__ == "__main__":
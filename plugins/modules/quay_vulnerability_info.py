@@ -26,7 +26,8 @@ DOCUMENTATION = r"""
 module: quay_vulnerability_info
 short_description: Gather information about image vulnerabilities in Quay Container Registry
 description:
-  - Gather information about the vulnerabilities of an image in a repository.
+  - Gather information about the vulnerabilities of images in repositories.
+  - Optionally wait for Quay to complete the scan of the images.
 version_added: '0.0.1'
 author: Hervé Quatremain (@herve4m)
 options:
@@ -38,11 +39,55 @@ options:
       - If you omit the namespace part, then the module looks for the
         repository in your personal namespace.
       - If you omit the tag and the digest part, then V(latest) is assumed.
-    required: true
+      - Mutually exclusive with O(images).
     type: str
+  images:
+    description:
+      - Names of the images. The format for each name is the same as for the
+        O(image) parameter.
+      - The module returns the results in the RV(images) list instead of the
+        RV(status) and RV(vulnerabilities) return values.
+      - Mutually exclusive with O(image).
+    type: list
+    elements: str
+    version_added: '2.9.0'
+  wait_for_scan:
+    description:
+      - Whether to wait for Quay to complete the scan of the images that are
+        queued for scanning, which is usually the case right after a push.
+      - The module polls the images that are still pending, with a delay
+        between two polls that grows while no scan completes.
+      - The module fails if some scans are not complete after
+        O(wait_timeout) seconds.
+    type: bool
+    default: false
+    version_added: '2.9.0'
+  wait_timeout:
+    description:
+      - Maximum number of seconds to wait for the scans to complete.
+      - Only used when O(wait_for_scan=true).
+    type: int
+    default: 600
+    version_added: '2.9.0'
+  cache_ttl:
+    description:
+      - Number of seconds during which the module uses the vulnerability
+        reports in the O(cache_dir) cache. After that period, the module
+        retrieves the reports again, because Quay updates them when the
+        vulnerability database of the scanner changes.
+      - The module does not keep the reports of the images that are not
+        scanned yet.
+      - You can also use C(s), C(m), C(h), C(d), and C(w) suffixes, such as
+        V(12h).
+    type: str
+    default: 1d
+    version_added: '2.9.0'
 notes:
   - If a vulnerability scanner such as Clair is not installed, then the
     returned vulnerability list is always empty.
+  - When you provide several images, the module retrieves their scan results
+    in parallel. See the O(concurrency) parameter. When O(wait_for_scan=true),
+    each polling round only requests the images that are still pending.
 attributes:
   check_mode:
     support: full
@@ -55,6 +100,8 @@ extends_documentation_fragment:
   - ansible.builtin.action_common_attributes
   - infra.quay_configuration.auth
   - infra.quay_configuration.auth.login
+  - infra.quay_configuration.concurrency
+  - infra.quay_configuration.manifest_cache
 """
 
 EXAMPLES = r"""
@@ -63,6 +110,25 @@ EXAMPLES = r"""
     image: coreos/dpp-aws-toolkit:latest
     quay_host: quay.io
   register: vuln
+
+- name: Wait for the scan of the images of the release
+  infra.quay_configuration.quay_vulnerability_info:
+    images:
+      - production/frontend:2.1.0
+      - production/backend:2.1.0
+      - production/worker@sha256:5a9e...d8fd
+    wait_for_scan: true
+    wait_timeout: 900
+    quay_host: https://quay.example.com
+    quay_token: vgfH9zH5q6eV16Con7SvDQYSr0KPYQimMHVehZv7
+  register: release_vulns
+
+- name: Ensure that no image has critical vulnerabilities
+  ansible.builtin.assert:
+    that: >
+      release_vulns['images'] | map(attribute='vulnerabilities') | flatten
+      | map(attribute='Vulnerabilities') | flatten
+      | selectattr('Severity', 'equalto', 'Critical') | length == 0
 """
 
 RETURN = r"""
@@ -72,17 +138,18 @@ status:
     - V(scanned) indicates that Quay scanned the image. The result is available
       in the RV(vulnerabilities) array.
     - V(queued) indicates that Quay has not yet scanned the image.
+    - V(failed) indicates that the scan failed.
     - V(unsupported) indicates that Quay does not support the operating system
       or the package manager of the image. Vulnerabilities are not available
       for such images.
     - V(unknown) indicates that Quay did not return any data about the
       requested image.
   type: str
-  returned: always
+  returned: when O(image) is set
   sample: scanned
 vulnerabilities:
   description: List of vulnerabilities.
-  returned: always
+  returned: when O(image) is set
   type: list
   elements: dict
   contains:
@@ -194,52 +261,110 @@ vulnerabilities:
       ]
     }
   ]
+images:
+  description: Scan results for each image.
+  returned: when O(images) is set
+  type: list
+  elements: dict
+  version_added: '2.9.0'
+  contains:
+    image:
+      description: Name of the image, as given in the O(images) parameter.
+      type: str
+      returned: always
+      sample: production/frontend:2.1.0
+    manifest_digest:
+      description:
+        - Digest of the image manifest.
+        - V(null) if the image does not exist.
+      type: str
+      returned: always
+      sample: sha256:f2e6...3bb1
+    status:
+      description:
+        - Scan status reported by Quay. See RV(status) for the possible
+          values.
+      type: str
+      returned: always
+      sample: scanned
+    vulnerabilities:
+      description:
+        - List of vulnerabilities. See RV(vulnerabilities) for the format.
+      type: list
+      elements: dict
+      returned: always
+      sample: []
 """
 
+import time
+
 from ..module_utils.api_module import APIModule, APIModuleError
-from ..module_utils.quay_image import QuayImage
+from ..module_utils.manifest_cache import ManifestCache
+from ..module_utils.quay_image import parse_image_names
 
+# Scan statuses of the images that Quay has not scanned yet
+PENDING_STATUSES = ("queued", "unscanned")
 
-def main():
-    argument_spec = dict(image=dict(required=True))
+# Initial and maximum delays between two polls, in seconds
+MIN_DELAY = 2
+MAX_DELAY = 30
 
-    # Create a module for ourselves
-    module = APIModule(argument_spec=argument_spec, supports_check_mode=True)
 
-    # Extract our parameters
-    name = module.params.get("image").strip("/:")
+def resolve_image(module, record, namespaces):
+    """Retrieve the manifest digest of an image.
 
-    # Get the components of the given image (namespace, repository, tag, digest)
-    img = QuayImage(module, name)
-    namespace = img.namespace
-    if namespace is None:
-        module.fail_json(
-            msg=(
-                "The `image' parameter must include the"
-                " organization: <organization>/{name}."
-            ).format(name=name)
-        )
+    The method sets the ``manifest_digest`` key of the given record. The key
+    is ``None`` if the namespace or the image does not exist. The module
+    caches the tag resolutions (see :py:meth:``APIModule.get_tag_digest``).
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param record: The image. The dictionary must provide the ``img`` key,
+                   which is a :py:class:``QuayImage`` object.
+    :type record: dict
+    :param namespaces: The names of the namespaces that exist.
+    :type namespaces: set
 
-    # Check whether the namespace exists (organization or user account)
-    namespace_details = module.get_namespace(namespace)
-    if not namespace_details:
-        module.exit_json(changed=False, vulnerabilities=[])
+    :raises APIModuleError: An API error occurred.
+    """
+    img = record["img"]
+    record["manifest_digest"] = None
+    if img.namespace not in namespaces:
+        return
 
-    # Get the digest
     if img.digest:
-        manifest_digest = img.digest
-    else:
-        tags = module.get_tags(namespace, img.repository, img.tag, only_active_tags=False)
-        if not tags:
-            module.exit_json(changed=False, vulnerabilities=[])
-        try:
-            manifest_digest = tags[0]["manifest_digest"]
-        except KeyError:
-            module.fail_json(
-                msg="Cannot retrieve the manifest digest for the {image} image.".format(
-                    image=name
-                )
-            )
+        record["manifest_digest"] = img.digest
+        return
+    record["manifest_digest"] = module.get_tag_digest(
+        img.namespace, img.repository, img.tag, exit_on_error=False
+    )
+
+
+def get_report(module, record, cache, max_age):
+    """Retrieve the vulnerabilities of an image.
+
+    The method sets the ``status`` and the ``vulnerabilities`` keys of the
+    given record. The reports of the completed scans are kept in the cache.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param record: The image, as updated by :py:func:``resolve_image``.
+    :type record: dict
+    :param cache: The cache for the reports.
+    :type cache: :py:class:``ManifestCache``
+    :param max_age: Number of seconds during which the cached reports are
+                    valid.
+    :type max_age: int
+    """
+    record["status"] = "unknown"
+    record["vulnerabilities"] = []
+    if not record["manifest_digest"]:
+        return
+
+    report = cache.get("security", record["manifest_digest"], max_age=max_age)
+    if report:
+        record.update(report)
+        return
 
     # Get the vulnerabilities
     #
@@ -306,29 +431,191 @@ def main():
     #   }
     # }
     query_params = {"vulnerabilities": True}
+    img = record["img"]
     try:
         vulns = module.get_object_path(
             "repository/{namespace}/{repository}/manifest/{manifest_digest}/security",
             query_params=query_params,
             exit_on_error=False,
-            namespace=namespace,
+            namespace=img.namespace,
             repository=img.repository,
-            manifest_digest=manifest_digest,
+            manifest_digest=record["manifest_digest"],
         )
     except APIModuleError:
         # The Quay installation does not have Clair installed
-        module.exit_json(changed=False, vulnerabilities=[])
+        return
 
-    status = vulns.get("status") if vulns else "unknown"
+    if vulns:
+        record["status"] = vulns.get("status")
     try:
-        vulnerabilities = [
+        record["vulnerabilities"] = [
             i
             for i in vulns["data"]["Layer"].get("Features", [])
             if len(i.get("Vulnerabilities", [])) > 0
         ]
-    except TypeError:
-        module.exit_json(changed=False, status=status, vulnerabilities=[])
-    module.exit_json(changed=False, status=status, vulnerabilities=vulnerabilities)
+    except (TypeError, KeyError, AttributeError):
+        pass
+    if record["status"] not in PENDING_STATUSES + ("unknown", None):
+        cache.set(
+            "security",
+            record["manifest_digest"],
+            {"status": record["status"], "vulnerabilities": record["vulnerabilities"]},
+        )
+
+
+def wait_for_scans(module, records, get_report, timeout, concurrency):
+    """Poll the images until Quay completes their scan.
+
+    Each polling round only requests the images that are still pending. The
+    delay between two rounds grows by half after each round during which no
+    scan completes, up to :py:const:``MAX_DELAY``, and returns to
+    :py:const:``MIN_DELAY`` when some scans complete.
+
+    :param module: The module object.
+    :type module: :py:class:``APIModule``
+    :param records: The images, as updated by :py:func:``get_report``.
+    :type records: list
+    :param get_report: Function that receives an image and updates its
+                       status (see :py:func:``get_report``).
+    :type get_report: callable
+    :param timeout: Maximum number of seconds to wait.
+    :type timeout: int
+    :param concurrency: Maximum number of parallel requests.
+    :type concurrency: int
+
+    :return: The images that are still pending when the timeout expires.
+    :rtype: list
+    """
+    start = time.time()
+    delay = MIN_DELAY
+    pending = [r for r in records if r["status"] in PENDING_STATUSES]
+    while pending:
+        elapsed = time.time() - start
+        if elapsed >= timeout:
+            break
+        time.sleep(min(delay, timeout - elapsed))
+        module.run_concurrently(get_report, pending, concurrency)
+        still_pending = [r for r in pending if r["status"] in PENDING_STATUSES]
+        if len(still_pending) < len(pending):
+            delay = MIN_DELAY
+        else:
+            delay = min(delay * 1.5, MAX_DELAY)
+        pending = still_pending
+    return pending
+
+
+def main():
+    argument_spec = dict(
+        image=dict(),
+        images=dict(type="list", elements="str"),
+        wait_for_scan=dict(type="bool", default=False),
+        wait_timeout=dict(type="int", default=600),
+        concurrency=dict(type="int", default=8),
+        cache_dir=dict(type="path"),
+        cache_ttl=dict(default="1d"),
+    )
+
+    mutually_exclusive = [("image", "images")]
+    required_one_of = [("image", "images")]
+
+    # Create a module for ourselves
+    module = APIModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=mutually_exclusive,
+        required_one_of=required_one_of,
+        supports_check_mode=True,
+    )
+
+    # Extract our parameters
+    image = module.params.get("image")
+    images = module.params.get("images")
+    wait_for_scan = module.params.get("wait_for_scan")
+    wait_timeout = module.params.get("wait_timeout")
+    concurrency = module.params.get("concurrency")
+    cache_ttl = module.str_period_to_second("cache_ttl", module.params.get("cache_ttl"))
+    cache = ManifestCache(module, module.params.get("cache_dir"))
+
+    def report(record):
+        get_report(module, record, cache, cache_ttl)
+
+    names = [name.strip("/:") for name in ([image] if image else images)]
+    records = []
+
+    # Get the components of the given images (namespace, repository, tag,
+    # digest)
+    for name, img in zip(names, parse_image_names(module, names)):
+        if img.namespace is None:
+            module.fail_json(
+                msg=(
+                    "The `{param}' parameter must include the"
+                    " organization: <organization>/{name}."
+                ).format(param="image" if image else "images", name=name)
+            )
+        records.append({"image": name, "img": img})
+
+    # Check whether the namespaces exist (organization or user account)
+    namespaces = sorted(set(r["img"].namespace for r in records))
+    try:
+        details = module.run_concurrently(
+            lambda ns: module.get_namespace(ns, exit_on_error=False), namespaces, concurrency
+        )
+        namespaces = set(ns for ns, d in zip(namespaces, details) if d)
+
+        # Resolve each tag once, even if several images reference it
+        tag_refs = sorted(
+            set(
+                (r["img"].namespace, r["img"].repository, r["img"].tag)
+                for r in records
+                if not r["img"].digest and r["img"].namespace in namespaces
+            )
+        )
+        module.run_concurrently(
+            lambda ref: module.get_tag_digest(*ref, exit_on_error=False),
+            tag_refs,
+            concurrency,
+        )
+        manifests = {}
+        for record in records:
+            resolve_image(module, record, namespaces)
+            img = record["img"]
+            manifests.setdefault(
+                (img.namespace, img.repository, record["manifest_digest"]), []
+            ).append(record)
+
+        # Retrieve the report of each manifest once
+        heads = [m[0] for m in manifests.values()]
+        module.run_concurrently(report, heads, concurrency)
+        pending = (
+            wait_for_scans(module, heads, report, wait_timeout, concurrency)
+            if wait_for_scan
+            else []
+        )
+    except APIModuleError as e:
+        module.fail_json(msg=str(e))
+
+    for same_manifest in manifests.values():
+        for record in same_manifest[1:]:
+            record["status"] = same_manifest[0]["status"]
+            record["vulnerabilities"] = same_manifest[0]["vulnerabilities"]
+
+    for record in records:
+        del record["img"]
+
+    if image:
+        result = dict(
+            status=records[0]["status"], vulnerabilities=records[0]["vulnerabilities"]
+        )
+    else:
+        result = dict(images=records)
+
+    if pending:
+        module.fail_json(
+            msg="Timeout waiting for the scan of the images: {images}".format(
+                images=", ".join(r["image"] for r in pending)
+            ),
+            **result
+        )
+    module.exit_json(changed=False, **result)
 
 
 if __name__ == "__main__":
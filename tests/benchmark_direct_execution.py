@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright: (c) 2026 Hervé Quatremain <herve.quatremain@redhat.com>
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measure the per-task overhead of the modules of the collection.
+
+The script runs each module with the standard execution (AnsiballZ) and with
+the direct execution in the worker process (see ``plugins/action/quay.py``),
+and then reports the average duration of a task for both modes.
+
+The tasks call the modules with an unsupported parameter. The modules fail
+during the argument validation, before sending any API request. The
+measure therefore only includes the execution overhead: building the
+AnsiballZ payload, writing the temporary files, starting the Python
+interpreter, and importing the module and its dependencies. You do not need
+a Quay installation to run the script.
+
+Install the collection before running the script:
+
+    $ ansible-galaxy collection install --force .
+    $ python tests/benchmark_direct_execution.py --runs 20
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+CALLBACK = """
+import json
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "benchmark"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.timings = {}
+        self.current = None
+
+    def stop(self):
+        if self.current:
+            name, start = self.current
+            self.timings[name] = time.time() - start
+            self.current = None
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self.stop()
+        self.current = (task.get_name(), time.time())
+
+    def v2_playbook_on_stats(self, stats):
+        self.stop()
+        with open("{output}", "w") as f:
+            json.dump(self.timings, f)
+"""
+
+
+def module_names():
+    """Return the names of the modules of the collection."""
+    path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "plugins", "modules"
+    )
+    return sorted(
+        f[:-3] for f in os.listdir(path) if f.endswith(".py") and not f.startswith("_")
+    )
+
+
+def build_playbook(modules, runs):
+    """Return the benchmark play, as a JSON document (which is valid YAML)."""
+    tasks = []
+    for module in modules:
+        for mode in ("standard", "direct"):
+            tasks.append(
+                {
+                    "name": "{module} {mode}".format(module=module, mode=mode),
+                    "infra.quay_configuration." + module: {"benchmark_unsupported": 1},
+                    "vars": {"quay_direct_execution": mode == "direct"},
+                    "failed_when": False,
+                    "loop": list(range(runs)),
+                }
+            )
+    return [
+        {
+            "name": "Measuring the per-task overhead of the modules",
+            "hosts": "localhost",
+            "connection": "local",
+            "become": False,
+            "gather_facts": False,
+            "tasks": tasks,
+        }
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--runs", type=int, default=10, help="number of tasks per module and mode"
+    )
+    parser.add_argument(
+        "modules", nargs="*", help="modules to measure (default: all the modules)"
+    )
+    args = parser.parse_args()
+    modules = args.modules or module_names()
+
+    workdir = tempfile.mkdtemp(prefix="quay_benchmark_")
+    try:
+        output = os.path.join(workdir, "timings.json")
+        os.mkdir(os.path.join(workdir, "callback_plugins"))
+        with open(os.path.join(workdir, "callback_plugins", "benchmark.py"), "w") as f:
+            f.write(CALLBACK.replace("{output}", output))
+        playbook = os.path.join(workdir, "benchmark.yml")
+        with open(playbook, "w") as f:
+            json.dump(build_playbook(modules, args.runs), f, indent=2)
+
+        env = dict(os.environ)
+        env["ANSIBLE_CALLBACK_PLUGINS"] = os.path.join(workdir, "callback_plugins")
+        env["ANSIBLE_CALLBACKS_ENABLED"] = "benchmark"
+        env["ANSIBLE_LOCALHOST_WARNING"] = "false"
+        env["ANSIBLE_INVENTORY_UNPARSED_WARNING"] = "false"
+        with open(os.devnull, "w") as devnull:
+            subprocess.check_call(
+                ["ansible-playbook", "-i", "localhost,", playbook], env=env, stdout=devnull
+            )
+
+        with open(output) as f:
+            timings = json.load(f)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    line = "{0:<34} {1:>13} {2:>13} {3:>13}"
+    print(line.format("Module", "standard (ms)", "direct (ms)", "saved (ms)"))
+    total_standard = total_direct = 0.0
+    for module in modules:
+        standard = timings[module + " standard"] / args.runs * 1000
+        direct = timings[module + " direct"] / args.runs * 1000
+        total_standard += standard
+        total_direct += direct
+        print(
+            line.format(
+                module,
+                "{0:.1f}".format(standard),
+                "{0:.1f}".format(direct),
+                "{0:.1f}".format(standard - direct),
+            )
+        )
+    count = len(modules)
+    print(
+        line.format(
+            "Average",
+            "{0:.1f}".format(total_standard / count),
+            "{0:.1f}".format(total_direct / count),
+            "{0:.1f}".format((total_standard - total_direct) / count),
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())